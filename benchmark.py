@@ -0,0 +1,122 @@
+import time
+import uproot
+import argparse
+import tempfile
+import resource
+import tracemalloc
+import pandas as pd
+from pathlib import Path
+import preselection
+from reader import root_files, branches_mc, apply_cuts, read_files
+from hist_registry import histograms
+from mass_histograms import data_true, data_reco
+from rendering import Renderer
+from simulation import Simulation
+from synthetic import generate_dataset
+
+# Katalogi wyników potrzebne do zapisania histogramów (jak w README.md)
+RESULTS_DIRS = ['combined_histograms', 'count_histograms', 'count_histograms_true_data', 'efficiency',
+                'mass_histograms', 'mass_histograms_true_data', 'statistics']
+RESULTS_DIRS += sorted({spec["dir"] for spec in histograms})
+
+
+class Timer:
+    """
+    Obiekt mierzący czas i szczytowe zużycie pamięci kolejnych etapów obliczeń
+    """
+
+    def __init__(self, size: int):
+        """
+        :param size: Liczba zdarzeń w zbiorze danych (zapisywana w wynikach)
+        """
+        self.size = size
+        self.rows = []
+
+    def stage(self, name: str, function, tracks: int):
+        """
+        Funkcja wykonująca etap obliczeń i zapisująca jego czas, liczbę cząstek na sekundę oraz szczytowe
+        zużycie pamięci (pamięć zaalokowana w czasie etapu i maksymalne zużycie pamięci procesu)
+
+        :param function: Funkcja bez argumentów wykonująca etap
+        :param tracks: Liczba cząstek przetwarzanych w etapie
+        :return: Wynik funkcji
+        """
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.rows.append({
+            'events': self.size,
+            'stage': name,
+            'tracks': tracks,
+            'seconds': elapsed,
+            'tracks/s': tracks / elapsed if elapsed > 0 else float('inf'),
+            'peak_MB': peak / 1024 ** 2,
+            'peak_rss_MB': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        })
+        return result
+
+
+def run(size: int, workdir: str, files: int = 1, render: bool = True) -> list[dict]:
+    """
+    Funkcja mierząca czas wszystkich etapów dla syntetycznego zbioru danych o podanej liczbie zdarzeń
+
+    :param size: Liczba zdarzeń
+    :param workdir: Katalog roboczy (dane i wyniki)
+    :param files: Liczba plików, na które dzielone są zdarzenia
+    :param render: Jeśli False, etap rysowania jest pomijany
+    """
+    data_path = Path(workdir) / f'data_{size}'
+    results_path = Path(workdir) / f'results_{size}'
+    for directory in RESULTS_DIRS:
+        (results_path / directory).mkdir(parents=True, exist_ok=True)
+    generate_dataset(str(data_path), files, size // files)
+    trees = root_files(str(data_path))
+    timer = Timer(size)
+
+    # Wczytywanie danych (bez preselekcji) i preselekcja
+    tracks = sum(uproot.open(tree).num_entries for tree in trees)
+    frame = timer.stage('ingest', lambda: read_files(trees, branches_mc), tracks)
+    arrays = {column: frame[column].values for column in frame.columns}
+    cuts = preselection.cuts_mc + preselection.cuts
+    selected = timer.stage('preselection', lambda: pd.DataFrame(apply_cuts(arrays, cuts)), tracks)
+    del frame, arrays
+
+    # Kolejne etapy wykonywane na danych po preselekcji
+    sim = Simulation(None, str(results_path), renderer=Renderer('now' if render else 'skip'))
+    sim.data = selected
+    tracks = len(selected)
+    timer.stage('event index', sim._index_events, tracks)
+    timer.stage('statistics', sim._accumulate_statistics, tracks)
+    timer.stage('efficiencies', sim._accumulate_efficiency, tracks)
+    timer.stage('count histograms', lambda: (
+        sim.create_count_histogram(data_true, [sim.count_pi_true, sim.count_p_true, sim.count_K_true]),
+        sim.create_count_histogram(data_reco, [sim.count_pi, sim.count_p, sim.count_K])), tracks)
+    timer.stage('mass histograms', lambda: (
+        sim.create_mass_histogram(data_true, sim._mass_histograms('_true')),
+        sim.create_mass_histogram(data_reco, sim._mass_histograms())), tracks)
+    timer.stage('1D/2D fills', sim._fill_registered_histograms, tracks)
+    if render:
+        timer.stage('rendering', sim.save_all_histograms, tracks)
+    return timer.rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Pomiar czasu etapów obliczeń na syntetycznych danych')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help='Liczby zdarzeń w kolejnych zbiorach danych')
+    parser.add_argument('--files', type=int, default=1, help='Liczba plików w każdym zbiorze danych')
+    parser.add_argument('--workdir', default=None, help='Katalog roboczy (domyślnie katalog tymczasowy)')
+    parser.add_argument('--output', default=None, help='Plik .csv z wynikami')
+    parser.add_argument('--no-render', action='store_true', help='Pominięcie etapu rysowania')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp:
+        workdir = args.workdir or temp
+        rows = [row for size in args.sizes for row in run(size, workdir, args.files, not args.no_render)]
+    results = pd.DataFrame(rows)
+    print(results.to_string(index=False, float_format=lambda value: f'{value:.4g}'))
+    if args.output:
+        results.to_csv(args.output, index=False)
@@ -0,0 +1,108 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import uproot
+import numpy as np
+from pathlib import Path
+
+
+class BranchCache:
+    """
+    Lokalna pamięć podręczna wybranych zmiennych z plików .root. Każdy wpis to katalog z plikami .npy
+    (po jednym na zmienną) wczytywanymi przez mmap, bez kopiowania i dekompresji
+    """
+
+    def __init__(self, directory: str, max_size: int = 20 * 1024 ** 3):
+        """
+        :param directory: Katalog pamięci podręcznej
+        :param max_size: Maksymalny rozmiar pamięci podręcznej w bajtach. Po jego przekroczeniu usuwane są
+            najdawniej używane wpisy
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+
+    @staticmethod
+    def _split(file: str) -> str:
+        """
+        Funkcja zwracająca ścieżkę do pliku bez ścieżki do drzewa (':minbias;1/DecayTree;1')
+        """
+        return file.split(':')[0]
+
+    def key(self, file: str, branches: list[str]) -> str:
+        """
+        Funkcja zwracająca klucz wpisu zależny od ścieżki, rozmiaru i czasu modyfikacji pliku oraz listy zmiennych
+        """
+        path = Path(self._split(file)).resolve()
+        stat = path.stat()
+        text = f'{path}|{stat.st_size}|{stat.st_mtime_ns}|{",".join(sorted(branches))}'
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def read(self, file: str, branches: list[str], options: dict = None) -> dict:
+        """
+        Funkcja zwracająca zmienne z pliku: z pamięci podręcznej, a jeśli ich tam nie ma - z pliku .root
+        (i zapisująca je w pamięci podręcznej)
+
+        :param file: Ścieżka do drzewa (np. z funkcji reader.root_files)
+        :param branches: Zmienne do wczytania
+        :param options: Dodatkowe argumenty uproot.open przy wczytywaniu z pliku .root (np. reader.executors)
+        """
+        key = self.key(file, branches)
+        arrays = self.load(key)
+        if arrays is None:
+            arrays = uproot.open(file, **(options or {})).arrays(filter_name=branches, library='np')
+            self.store(key, file, arrays)
+        return arrays
+
+    def load(self, key: str):
+        """
+        Funkcja wczytująca wpis (przez mmap). Zwraca None, jeśli wpisu nie ma
+        """
+        entry = self.directory / key
+        if not (entry / 'meta.json').exists():
+            return None
+        # Aktualizacja czasu ostatniego użycia (potrzebne do usuwania najdawniej używanych wpisów)
+        os.utime(entry)
+        meta = json.loads((entry / 'meta.json').read_text())
+        return {branch: np.load(entry / f'{branch}.npy', mmap_mode='r') for branch in meta['branches']}
+
+    def store(self, key: str, file: str, arrays: dict):
+        """
+        Funkcja zapisująca wpis. Starsze wpisy dla tego samego pliku (np. przed jego zmianą) są usuwane
+        """
+        path = str(Path(self._split(file)).resolve())
+        for meta_file in self.directory.glob('*/meta.json'):
+            # Katalogi tymczasowe (zaczynające się od '.') mogą być właśnie zapisywane przez inny proces
+            if meta_file.parent.name.startswith('.'):
+                continue
+            if json.loads(meta_file.read_text())['path'] == path and meta_file.parent.name != key:
+                shutil.rmtree(meta_file.parent, ignore_errors=True)
+
+        # Wpis jest zapisywany do katalogu tymczasowego i przenoszony, żeby inne procesy nie wczytały
+        # niekompletnego wpisu
+        temp = self.directory / f'.{key}.{os.getpid()}'
+        temp.mkdir(parents=True, exist_ok=True)
+        for branch, values in arrays.items():
+            np.save(temp / f'{branch}.npy', np.ascontiguousarray(values))
+        (temp / 'meta.json').write_text(json.dumps({'path': path, 'branches': list(arrays), 'created': time.time()}))
+        try:
+            temp.rename(self.directory / key)
+        except OSError:
+            # Wpis został już zapisany przez inny proces
+            shutil.rmtree(temp, ignore_errors=True)
+        self._evict()
+
+    def _evict(self):
+        """
+        Funkcja usuwająca najdawniej używane wpisy, dopóki rozmiar pamięci podręcznej przekracza max_size
+        """
+        entries = [entry for entry in self.directory.iterdir() if entry.is_dir() and not entry.name.startswith('.')]
+        sizes = {entry: sum(file.stat().st_size for file in entry.iterdir()) for entry in entries}
+        total = sum(sizes.values())
+        for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= sizes[entry]
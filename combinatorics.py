@@ -0,0 +1,99 @@
+import numpy as np
+
+# Maksymalna liczba kombinacji obliczanych naraz (kolejne zdarzenia są dzielone na takie porcje)
+BATCH_SIZE = 5_000_000
+
+
+def combination_indices(counts: list[np.ndarray], starts: list[np.ndarray], identical: list[tuple[int, int]] = ()):
+    """
+    Funkcja tworząca indeksy wszystkich kombinacji cząstek (po jednej cząstce z każdej listy) z tych samych zdarzeń
+    bez pętli po zdarzeniach
+
+    :param counts: Liczba cząstek każdego rodzaju w każdym zdarzeniu
+    :param starts: Indeks pierwszej cząstki każdego rodzaju w każdym zdarzeniu
+    :param identical: Pary pozycji w kombinacji zajmowane przez ten sam rodzaj cząstek. Dla takich pozycji
+        zostawiane są tylko kombinacje o rosnących indeksach (bez powtórzeń cząstek i permutacji)
+    :return: Lista indeksów cząstek dla każdej pozycji w kombinacji
+    """
+    # Liczba kombinacji w każdym zdarzeniu
+    combinations = np.prod(counts, axis=0)
+    # Indeks zdarzenia dla każdej kombinacji
+    combination_event = np.repeat(np.arange(combinations.size), combinations)
+    # Numer kombinacji wewnątrz zdarzenia, rozkładany na numery cząstek (ostatnia pozycja zmienia się najszybciej)
+    local = np.arange(combination_event.size) - np.repeat(np.cumsum(combinations) - combinations, combinations)
+    indices = [None] * len(counts)
+    for position in reversed(range(len(counts))):
+        count = counts[position][combination_event]
+        indices[position] = starts[position][combination_event] + local % count
+        local = local // count
+
+    if identical:
+        keep = np.ones(combination_event.size, dtype=bool)
+        for first, second in identical:
+            keep &= indices[first] < indices[second]
+        indices = [index[keep] for index in indices]
+    return indices
+
+
+def combination_counts(counts: np.ndarray, names: list[str]) -> np.ndarray:
+    """
+    Funkcja zwracająca liczbę kombinacji w każdym zdarzeniu tworzonych przez combination_indices: dla k pozycji
+    zajmowanych przez ten sam rodzaj cząstek (n cząstek w zdarzeniu) liczba kombinacji bez powtórzeń i permutacji
+    to n po k, a liczby dla różnych rodzajów cząstek są mnożone
+
+    :param counts: Liczba cząstek na każdej pozycji kombinacji w każdym zdarzeniu (tablica (pozycje, zdarzenia))
+    :param names: Nazwy rodzajów cząstek na kolejnych pozycjach
+    """
+    result = np.ones(counts.shape[1], dtype=np.int64)
+    for name in dict.fromkeys(names):
+        n = counts[names.index(name)]
+        group = np.ones_like(result)
+        # Symbol Newtona obliczany iteracyjnie (każdy iloraz jest liczbą całkowitą)
+        for i in range(names.count(name)):
+            group = group * (n - i) // (i + 1)
+        result *= group
+    return result
+
+
+def invariant_masses(daughters: list[dict], max_combinations: int, batch_size: int = BATCH_SIZE,
+                     skipped: dict = None, key: str = None):
+    """
+    Generator zwracający masy niezmiennicze wszystkich kombinacji cząstek z tych samych zdarzeń, w porcjach
+    o ograniczonej liczbie kombinacji
+
+    :param daughters: Cząstki na kolejnych pozycjach kombinacji. Każdy element to słownik z tablicami 'E', 'PX',
+        'PY', 'PZ', liczbą cząstek w każdym zdarzeniu 'count' oraz nazwą rodzaju cząstek 'name'. Opcjonalnie
+        'start' - indeks pierwszej cząstki w każdym zdarzeniu (domyślnie tablice są ciągłe i uporządkowane wg
+        zdarzeń)
+    :param max_combinations: Maksymalna liczba kombinacji w jednym zdarzeniu. Zdarzenia z większą liczbą kombinacji
+        są pomijane, żeby zdarzenia o dużej krotności nie zajmowały całej pamięci
+    :param batch_size: Maksymalna liczba kombinacji w jednej porcji (zdarzenie z większą liczbą kombinacji tworzy
+        osobną porcję)
+    :param skipped: Słownik, do którego pod kluczem key dodawana jest liczba zdarzeń pominiętych z powodu
+        max_combinations (tak jak cutflow w reader.apply_cuts)
+    """
+    counts = np.array([daughter['count'] for daughter in daughters], dtype=np.int64)
+    starts = np.array([daughter['start'] if 'start' in daughter else np.cumsum(count) - count
+                       for daughter, count in zip(daughters, counts)], dtype=np.int64)
+    identical = [(first, second) for first in range(len(daughters)) for second in range(first + 1, len(daughters))
+                 if daughters[first]['name'] == daughters[second]['name']]
+
+    # Zdarzenia z liczbą kombinacji większą niż max_combinations są pomijane (liczone są kombinacje bez powtórzeń
+    # cząstek, tak jak w combination_indices)
+    combinations = combination_counts(counts, [daughter['name'] for daughter in daughters])
+    over = combinations > max_combinations
+    if skipped is not None:
+        skipped[key] = skipped.get(key, 0) + int(np.count_nonzero(over))
+    counts[:, over] = 0
+    combinations[over] = 0
+
+    cumulative = np.cumsum(combinations)
+    start = 0
+    while start < combinations.size:
+        done = cumulative[start - 1] if start else 0
+        end = max(int(np.searchsorted(cumulative, done + batch_size, side='right')), start + 1)
+        indices = combination_indices(list(counts[:, start:end]), list(starts[:, start:end]), identical)
+        total = {key: sum(daughter[key][index] for daughter, index in zip(daughters, indices))
+                 for key in ['E', 'PX', 'PY', 'PZ']}
+        yield np.sqrt(total['E'] ** 2 - total['PX'] ** 2 - total['PY'] ** 2 - total['PZ'] ** 2)
+        start = end
@@ -0,0 +1,35 @@
+import numpy as np
+
+
+def bin_index(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Funkcja zwracająca numer binu (od 0) dla każdej wartości. Biny są domknięte z prawej strony (lo, hi],
+    wartości spoza zakresu dostają numer -1
+    """
+    bins = np.digitize(values, edges, right=True) - 1
+    bins[bins >= edges.size - 1] = -1
+    return bins
+
+
+def binned_counts(bins: np.ndarray, nBins: int, numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """
+    Funkcja zliczająca w każdym binie cząstki spełniające warunki licznika i mianownika (bez sortowania i pętli)
+
+    :param bins: Numery binów z funkcji bin_index
+    :param nBins: Liczba binów
+    :param numerator: Maska cząstek licznika
+    :param denominator: Maska cząstek mianownika
+    :return: Tablica o wymiarach (2, nBins): licznik i mianownik w każdym binie. Tablice z kolejnych kawałków
+        danych można sumować
+    """
+    valid = bins >= 0
+    return np.stack([np.bincount(bins[valid & numerator], minlength=nBins),
+                     np.bincount(bins[valid & denominator], minlength=nBins)]).astype(np.float64)
+
+
+def ratio(counts: np.ndarray) -> np.ndarray:
+    """
+    Funkcja obliczająca iloraz licznika i mianownika w każdym binie (0 jeśli mianownik wynosi 0)
+    """
+    numerator, denominator = counts
+    return np.divide(numerator, denominator, out=np.zeros(numerator.size), where=denominator > 0)
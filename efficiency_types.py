@@ -0,0 +1,39 @@
+# Nazwy cząstek na wykresach
+labels = {"pi": "#pi", "p": "p", "K": "K"}
+
+# Wykresy "identification purity": licznik - cząstki danego rodzaju (TRUEID) spełniające kryterium ProbNN,
+# mianownik - wszystkie cząstki danego rodzaju
+identification = {
+    "pi": {"numerator": ["true_pi", "ProbNNpi"], "denominator": ["true_pi"]},
+    "p": {"numerator": ["true_p", "ProbNNp"], "denominator": ["true_p"]},
+    "K": {"numerator": ["true_K", "ProbNNK"], "denominator": ["true_K"]}
+}
+
+# Wykresy "cut efficiency": licznik - cząstki wybrane kryterium ProbNN, które są danym rodzajem cząstek (TRUEID),
+# mianownik - wszystkie cząstki wybrane kryterium ProbNN. Kryteria sprawdzane są po kolei (pi, K, p), więc cząstka
+# wybrana jako pi nie jest już wybierana jako K lub p
+cut = {
+    "pi": {"numerator": ["selected_pi", "true_pi"], "denominator": ["selected_pi"]},
+    "p": {"numerator": ["selected_p", "true_p"], "denominator": ["selected_p"]},
+    "K": {"numerator": ["selected_K", "true_K"], "denominator": ["selected_K"]}
+}
+
+# Wykresy wydajności. Każdy wpis zawiera:
+#   name - nazwa liczników
+#   key - zmienna wzdłuż której liczona jest wydajność
+#   nBins, xmin, xmax - binowanie zmiennej
+#   scale - czynnik przez który mnożona jest oś wykresu
+#   axis - nazwa osi
+#   title - nazwa wykresu
+#   selections - licznik i mianownik dla każdej cząstki
+#   file - nazwa pliku w katalogu efficiency ({} zastępowane jest nazwą cząstki)
+efficiencies = [
+    {"name": "pt_1", "key": "piplus_PT", "nBins": 50, "xmin": 0, "xmax": 2000, "scale": 0.001, "axis": "P_{t} [GeV]",
+     "title": "identification purity", "selections": identification, "file": "efficiency_pt_{}_1.png"},
+    {"name": "eta_1", "key": "piplus_ETA", "nBins": 25, "xmin": 2, "xmax": 5, "scale": 1, "axis": "#eta",
+     "title": "identification purity", "selections": identification, "file": "efficiency_eta_{}_1.png"},
+    {"name": "pt_2", "key": "piplus_PT", "nBins": 50, "xmin": 0, "xmax": 2000, "scale": 0.001, "axis": "P_{t} [GeV]",
+     "title": "cut efficiency", "selections": cut, "file": "efficiency_pt_{}_2.png"},
+    {"name": "eta_2", "key": "piplus_ETA", "nBins": 25, "xmin": 2, "xmax": 5, "scale": 1, "axis": "#eta",
+     "title": "cut efficiency", "selections": cut, "file": "efficiency_eta_{}_2.png"}
+]
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+# Zmienne, które razem jednoznacznie określają zdarzenie: numer pliku (nadawany przy wczytywaniu), numer runu
+# i numer zdarzenia
+EVENT_KEYS = ['fileNumber', 'runNumber', 'eventNumber']
+
+
+class EventIndex:
+    """
+    Indeks zdarzeń w formacie CSR: cząstki każdego zdarzenia zajmują ciągły przedział wierszy danych
+    offsets[i]:offsets[i + 1]. Indeks jest tworzony raz po wczytaniu danych i używany przez wszystkie etapy
+    obliczeń wykonywane dla zdarzeń
+    """
+
+    def __init__(self, offsets: np.ndarray, order: np.ndarray = None):
+        """
+        :param offsets: Indeksy na których zaczynają się kolejne zdarzenia (ostatni element to liczba cząstek)
+        :param order: Permutacja wierszy, po której cząstki każdego zdarzenia są obok siebie (None, jeśli dane
+            są już uporządkowane)
+        """
+        self.offsets = offsets
+        self.order = order
+        # Liczba cząstek w każdym zdarzeniu
+        self.lengths = np.diff(offsets)
+        # Indeks zdarzenia (0, 1, 2, ...) dla każdej cząstki
+        self.event_of_track = np.repeat(np.arange(self.lengths.size), self.lengths)
+
+    @property
+    def n_events(self) -> int:
+        return self.lengths.size
+
+    def multiplicity(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Funkcja zwracająca liczbę cząstek spełniających warunek w każdym zdarzeniu
+
+        :param mask: Warunek dla każdej cząstki (tablica bool)
+        """
+        return np.bincount(self.event_of_track[mask], minlength=self.n_events)
+
+    @classmethod
+    def build(cls, keys: list[np.ndarray]) -> 'EventIndex':
+        """
+        Funkcja tworząca indeks z kluczy zdarzeń (np. numer pliku, numer runu, numer zdarzenia). Jeśli cząstki
+        każdego zdarzenia są już obok siebie (zwykle dane z plików, także gdy zdarzenia nie są uporządkowane wg
+        numeru), dane nie są sortowane, a zdarzenia zachowują kolejność z danych. W przeciwnym razie kolejność
+        wierszy wyznaczana jest stabilnym sortowaniem po wszystkich kluczach
+
+        :param keys: Tablice kluczy, od najważniejszego
+        """
+        if not keys or keys[0].size == 0:
+            return cls(np.zeros(1, dtype=np.int64))
+        order = None
+        offsets = _offsets(keys)
+        if not _is_contiguous([key[offsets[:-1]] for key in keys]):
+            # np.lexsort sortuje stabilnie, a najważniejszy klucz podawany jest jako ostatni
+            order = np.lexsort(keys[::-1])
+            offsets = _offsets([key[order] for key in keys])
+        return cls(offsets, order)
+
+    @classmethod
+    def from_data(cls, data: pd.DataFrame) -> 'EventIndex':
+        """
+        Funkcja tworząca indeks z kolumn EVENT_KEYS obecnych w danych
+        """
+        return cls.build([data[key].values for key in EVENT_KEYS if key in data])
+
+
+def _offsets(keys: list[np.ndarray]) -> np.ndarray:
+    """
+    Funkcja zwracająca indeksy początków kolejnych ciągów wierszy o takich samych kluczach (ostatni element to
+    liczba wierszy)
+    """
+    change = np.zeros(keys[0].size - 1, dtype=bool)
+    for key in keys:
+        change |= key[1:] != key[:-1]
+    return np.concatenate(([0], np.flatnonzero(change) + 1, [keys[0].size]))
+
+
+def _is_sorted(keys: list[np.ndarray]) -> bool:
+    """
+    Funkcja sprawdzająca, czy klucze są uporządkowane niemalejąco (porównanie leksykograficzne sąsiednich wierszy)
+    """
+    less = np.zeros(keys[0].size - 1, dtype=bool)
+    equal = np.ones(keys[0].size - 1, dtype=bool)
+    for key in keys:
+        less |= equal & (key[1:] < key[:-1])
+        equal &= key[1:] == key[:-1]
+    return not less.any()
+
+
+def _is_contiguous(starts: list[np.ndarray]) -> bool:
+    """
+    Funkcja sprawdzająca, czy każde zdarzenie zajmuje jeden ciąg wierszy, czyli czy klucze początków ciągów
+    (po jednym wierszu na ciąg) się nie powtarzają. Sortowane są tylko początki ciągów i tylko wtedy, gdy nie są
+    już uporządkowane
+    """
+    if _is_sorted(starts):
+        return True
+    order = np.lexsort(starts[::-1])
+    repeated = np.ones(order.size - 1, dtype=bool)
+    for key in starts:
+        key = key[order]
+        repeated &= key[1:] == key[:-1]
+    return not repeated.any()
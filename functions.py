@@ -1,23 +1,21 @@
-import ROOT
 from simulation import Simulation
+from rendering import canvas, root
 
 
 def draw_combined_histograms(sim: Simulation, sim_true: Simulation):
     """
-    Funkcja łączaca histogramy rekonstrukcji mas z danych symulacyjnych i histogramów mas z danych doświadczalnych
+    Funkcja łączaca histogramy rekonstrukcji mas z danych symulacyjnych i histogramów mas z danych doświadczalnych.
+    Obiekty Simulation mogą być wczytane z zapisanych wyników (Simulation.load). ROOT jest importowany dopiero
+    tutaj, więc procesy robocze importujące moduł główny (main.py) nie wczytują ROOT
     """
+    ROOT = root()
 
-    # Obiekt Simulation zwraca histogramy rekonstrukcji mas z danych symulacyjnych
-    mass_pipi, mass_ppi, mass_KK = sim()
+    # Obiekt Simulation zwraca histogramy rekonstrukcji mas z danych symulacyjnych (konwertowane do histogramów ROOT)
+    mass_pipi, mass_ppi, mass_KK = (hist.to_root() for hist in sim())
     # Obiekt Simulation zwraca histogramy mas z danych doświadczalnych
-    mass_pipi_true, mass_ppi_true, mass_KK_true = sim_true()
-    # Tworzenie obiekty TCanvas
-    c = ROOT.TCanvas('c', 'c', 375, 350)
-    # Modyfikacje wizualne
-    c.SetLeftMargin(0.15)
-    c.SetRightMargin(0.15)
-    c.SetBottomMargin(0.125)
-    c.SetTopMargin(0.125)
+    mass_pipi_true, mass_ppi_true, mass_KK_true = (hist.to_root() for hist in sim_true())
+    # Płótno współdzielone z pozostałymi rysowanymi histogramami (tryb wsadowy, marginesy ze stylu 'default')
+    c = canvas()
     # Czynnik do jakiego normalizowane będą histogramy
     norm = 1
 
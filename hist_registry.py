@@ -0,0 +1,120 @@
+from hist_types import *
+
+# Rejestr histogramów PID/ProbNN wypełnianych dla danych z symulacji Monte Carlo. Każdy wpis zawiera:
+#   name - nazwa histogramu (i pliku .png)
+#   type - typ histogramu z pliku hist_types.py (binowanie i kryteria selekcji)
+#   title - tytuł histogramu i nazwy osi
+#   keys - zmienne na które nałożone są kryteria selekcji (1 zmienna - histogram 1D, 2 zmienne - histogram 2D)
+#   true_id - warunek na TRUEID (opcjonalny, domyślnie 0):
+#       1. Jeśli większe od 0, to cząstki na histogramie muszą być cząstką określoną przez podany numer
+#       2. Jeśli równe 0, to brak warunku na TRUEID
+#       3. Jeśli mniejsze od 0, to cząstki na histogramie mogą być dowolną cząstką, oprócz tej określonej przez
+#           moduł podanego numeru
+#   to_save - zmienne którymi zostanie wypełniony histogram (opcjonalne, domyślnie keys)
+#   dir - podkatalog katalogu results do którego zapisywany jest histogram
+histograms = [
+    # Histogramy PID z kryteriami PID > 0.1
+    {"name": "pid_K", "type": PID, "title": "PIDK;PIDK;events", "keys": ["piplus_PIDK"], "dir": "PID"},
+    {"name": "pid_p", "type": PID, "title": "PIDp;PIDp;events", "keys": ["piplus_PIDp"], "dir": "PID"},
+    {"name": "pid_K_true", "type": PID, "title": "PIDK if particle is K;PIDK;events", "keys": ["piplus_PIDK"],
+     "true_id": 321, "dir": "PID"},
+    {"name": "pid_p_true", "type": PID, "title": "PIDp if particle is p;PIDp;events", "keys": ["piplus_PIDp"],
+     "true_id": 2212, "dir": "PID"},
+    {"name": "pid_K_pi", "type": PID, "title": "PIDK if particle is pi;PIDK;events", "keys": ["piplus_PIDK"],
+     "true_id": 211, "dir": "PID"},
+    {"name": "pid_p_pi", "type": PID, "title": "PIDp if particle is pi;PIDp;events", "keys": ["piplus_PIDp"],
+     "true_id": 211, "dir": "PID"},
+
+    # Histogramy ProbNN z kryteriami ProbNN > 0.9
+    {"name": "probnn_K", "type": ProbNN, "title": "ProbNNK;ProbNNK;events", "keys": ["piplus_ProbNNk"],
+     "dir": "ProbNN"},
+    {"name": "probnn_p", "type": ProbNN, "title": "ProbNNp;ProbNNp;events", "keys": ["piplus_ProbNNp"],
+     "dir": "ProbNN"},
+    {"name": "probnn_K_true", "type": ProbNN, "title": "ProbNNK if particle is K;ProbNNK;events",
+     "keys": ["piplus_ProbNNk"], "true_id": 321, "dir": "ProbNN"},
+    {"name": "probnn_p_true", "type": ProbNN, "title": "ProbNNp if particle is p;ProbNNp;events",
+     "keys": ["piplus_ProbNNp"], "true_id": 2212, "dir": "ProbNN"},
+    {"name": "probnn_K_pi", "type": ProbNN, "title": "ProbNNK if particle is pi;ProbNNK;events",
+     "keys": ["piplus_ProbNNk"], "true_id": 211, "dir": "ProbNN"},
+    {"name": "probnn_p_pi", "type": ProbNN, "title": "ProbNNp if particle is pi;ProbNNp;events",
+     "keys": ["piplus_ProbNNp"], "true_id": 211, "dir": "ProbNN"},
+    {"name": "probnn_pi", "type": ProbNN, "title": "ProbNNpi;ProbNNpi;events", "keys": ["piplus_ProbNNpi"],
+     "dir": "ProbNN"},
+    {"name": "probnn_pi_true", "type": ProbNN, "title": "ProbNNpi if particle is pi;ProbNNpi;events",
+     "keys": ["piplus_ProbNNpi"], "true_id": 211, "dir": "ProbNN"},
+    {"name": "probnn_pi_not", "type": ProbNN, "title": "ProbNNpi if particle is not pi;ProbNNpi;events",
+     "keys": ["piplus_ProbNNpi"], "true_id": -211, "dir": "ProbNN"},
+
+    # Histogramy 2D PID/ProbNN z kryteriami: PID > 0.1, ProbNN > 0.9
+    {"name": "hist_K", "type": PID_ProbNN, "title": "PIDK/ProbNNK;PIDK;ProbNNK",
+     "keys": ["piplus_PIDK", "piplus_ProbNNk"], "dir": "PID_ProbNN"},
+    {"name": "hist_p", "type": PID_ProbNN, "title": "PIDp/ProbNNp;PIDp;ProbNNp",
+     "keys": ["piplus_PIDp", "piplus_ProbNNp"], "dir": "PID_ProbNN"},
+    {"name": "hist_K_true", "type": PID_ProbNN, "title": "PIDK/ProbNNK if particle is K;PIDK;ProbNNK",
+     "keys": ["piplus_PIDK", "piplus_ProbNNk"], "true_id": 321, "dir": "PID_ProbNN"},
+    {"name": "hist_p_true", "type": PID_ProbNN, "title": "PIDp/ProbNNp if particle is p;PIDp;ProbNNp",
+     "keys": ["piplus_PIDp", "piplus_ProbNNp"], "true_id": 2212, "dir": "PID_ProbNN"},
+    {"name": "hist_K_pi", "type": PID_ProbNN, "title": "PIDK/ProbNNK if particle is pi;PIDK;ProbNNK",
+     "keys": ["piplus_PIDK", "piplus_ProbNNk"], "true_id": 211, "dir": "PID_ProbNN"},
+    {"name": "hist_p_pi", "type": PID_ProbNN, "title": "PIDp/ProbNNp if particle is pi;PIDp;ProbNNp",
+     "keys": ["piplus_PIDp", "piplus_ProbNNp"], "true_id": 211, "dir": "PID_ProbNN"},
+
+    # Histogramy 2D PID/ProbNNpi z kryteriami: PID > 0.1, ProbNN > 0.9
+    {"name": "hist_Kpi", "type": PID_ProbNNpi, "title": "PIDK/ProbNNpi;PIDK;ProbNNpi",
+     "keys": ["piplus_PIDK", "piplus_ProbNNk"], "to_save": ["piplus_PIDK", "piplus_ProbNNpi"], "dir": "PID_ProbNNpi"},
+    {"name": "hist_ppi", "type": PID_ProbNNpi, "title": "PIDp/ProbNNpi;PIDp;ProbNNpi",
+     "keys": ["piplus_PIDp", "piplus_ProbNNp"], "to_save": ["piplus_PIDp", "piplus_ProbNNpi"], "dir": "PID_ProbNNpi"},
+    {"name": "hist_Kpi_true", "type": PID_ProbNNpi, "title": "PIDK/ProbNNpi if particle is K;PIDK;ProbNNpi",
+     "keys": ["piplus_PIDK", "piplus_ProbNNk"], "true_id": 321, "to_save": ["piplus_PIDK", "piplus_ProbNNpi"],
+     "dir": "PID_ProbNNpi"},
+    {"name": "hist_ppi_true", "type": PID_ProbNNpi, "title": "PIDp/ProbNNpi if particle is p;PIDp;ProbNNpi",
+     "keys": ["piplus_PIDp", "piplus_ProbNNp"], "true_id": 2212, "to_save": ["piplus_PIDp", "piplus_ProbNNpi"],
+     "dir": "PID_ProbNNpi"},
+    {"name": "hist_Kpi_pi", "type": PID_ProbNNpi, "title": "PIDK/ProbNNpi if particle is pi;PIDK;ProbNNpi",
+     "keys": ["piplus_PIDK", "piplus_ProbNNk"], "true_id": 211, "to_save": ["piplus_PIDK", "piplus_ProbNNpi"],
+     "dir": "PID_ProbNNpi"},
+    {"name": "hist_ppi_pi", "type": PID_ProbNNpi, "title": "PIDp/ProbNNpi if particle is pi;PIDp;ProbNNpi",
+     "keys": ["piplus_PIDp", "piplus_ProbNNp"], "true_id": 211, "to_save": ["piplus_PIDp", "piplus_ProbNNpi"],
+     "dir": "PID_ProbNNpi"},
+
+    # Histogramy 2D ProbNN/pęd poprzeczny z kryteriami: ProbNN > 0.9
+    {"name": "probnnm_K", "type": ProbNN_m, "title": "ProbNNK/P_{t};P_{t} [MeV];ProbNNK",
+     "keys": ["piplus_TRUEPT", "piplus_ProbNNk"], "dir": "ProbNN_m"},
+    {"name": "probnnm_p", "type": ProbNN_m, "title": "ProbNNp/P_{t};P_{t} [MeV];ProbNNp",
+     "keys": ["piplus_TRUEPT", "piplus_ProbNNp"], "dir": "ProbNN_m"},
+    {"name": "probnnm_K_true", "type": ProbNN_m, "title": "ProbNNK/P_{t} if particle is K;P_{t} [MeV];ProbNNK",
+     "keys": ["piplus_TRUEPT", "piplus_ProbNNk"], "true_id": 321, "dir": "ProbNN_m"},
+    {"name": "probnnm_p_true", "type": ProbNN_m, "title": "ProbNNp/P_{t} if particle is p;P_{t} [MeV];ProbNNp",
+     "keys": ["piplus_TRUEPT", "piplus_ProbNNp"], "true_id": 2212, "dir": "ProbNN_m"},
+    {"name": "probnnm_K_pi", "type": ProbNN_m, "title": "ProbNNK/P_{t} if particle is pi;P_{t} [MeV];ProbNNK",
+     "keys": ["piplus_TRUEPT", "piplus_ProbNNk"], "true_id": 211, "dir": "ProbNN_m"},
+    {"name": "probnnm_p_pi", "type": ProbNN_m, "title": "ProbNNp/P_{t} if particle is pi;P_{t} [MeV];ProbNNp",
+     "keys": ["piplus_TRUEPT", "piplus_ProbNNp"], "true_id": 211, "dir": "ProbNN_m"},
+    {"name": "probnnm_pi", "type": ProbNN_m, "title": "ProbNNpi/P_{t};P_{t} [MeV];ProbNNpi",
+     "keys": ["piplus_TRUEPT", "piplus_ProbNNpi"], "dir": "ProbNN_m"},
+    {"name": "probnnm_pi_true", "type": ProbNN_m, "title": "ProbNNpi/P_{t} if particle is pi;P_{t} [MeV];ProbNNpi",
+     "keys": ["piplus_TRUEPT", "piplus_ProbNNpi"], "true_id": 211, "dir": "ProbNN_m"},
+    {"name": "probnnm_pi_not", "type": ProbNN_m,
+     "title": "ProbNNpi/P_{t} if particle is not pi;P_{t} [MeV];ProbNNpi",
+     "keys": ["piplus_TRUEPT", "piplus_ProbNNpi"], "true_id": -211, "dir": "ProbNN_m"},
+
+    # Histogramy 2D ProbNN/pseudopośpieszność z kryteriami: ProbNN > 0.9
+    {"name": "probnneta_K", "type": ProbNN_eta, "title": "ProbNNK/#eta;#eta;ProbNNK",
+     "keys": ["piplus_ETA", "piplus_ProbNNk"], "dir": "ProbNN_eta"},
+    {"name": "probnneta_p", "type": ProbNN_eta, "title": "ProbNNp/#eta;#eta;ProbNNp",
+     "keys": ["piplus_ETA", "piplus_ProbNNp"], "dir": "ProbNN_eta"},
+    {"name": "probnneta_K_true", "type": ProbNN_eta, "title": "ProbNNK/#eta if particle is K;#eta;ProbNNK",
+     "keys": ["piplus_ETA", "piplus_ProbNNk"], "true_id": 321, "dir": "ProbNN_eta"},
+    {"name": "probnneta_p_true", "type": ProbNN_eta, "title": "ProbNNp/#eta if particle is p;#eta;ProbNNp",
+     "keys": ["piplus_ETA", "piplus_ProbNNp"], "true_id": 2212, "dir": "ProbNN_eta"},
+    {"name": "probnneta_K_pi", "type": ProbNN_eta, "title": "ProbNNK/#eta if particle is pi;#eta;ProbNNK",
+     "keys": ["piplus_ETA", "piplus_ProbNNk"], "true_id": 211, "dir": "ProbNN_eta"},
+    {"name": "probnneta_p_pi", "type": ProbNN_eta, "title": "ProbNNp/#eta if particle is pi;#eta;ProbNNp",
+     "keys": ["piplus_ETA", "piplus_ProbNNp"], "true_id": 211, "dir": "ProbNN_eta"},
+    {"name": "probnneta_pi", "type": ProbNN_eta, "title": "ProbNNpi/#eta;#eta;ProbNNpi",
+     "keys": ["piplus_ETA", "piplus_ProbNNpi"], "dir": "ProbNN_eta"},
+    {"name": "probnneta_pi_true", "type": ProbNN_eta, "title": "ProbNNpi/#eta if particle is pi;#eta;ProbNNpi",
+     "keys": ["piplus_ETA", "piplus_ProbNNpi"], "true_id": 211, "dir": "ProbNN_eta"},
+    {"name": "probnneta_pi_not", "type": ProbNN_eta, "title": "ProbNNpi/#eta if particle is not pi;#eta;ProbNNpi",
+     "keys": ["piplus_ETA", "piplus_ProbNNpi"], "true_id": -211, "dir": "ProbNN_eta"},
+]
@@ -73,18 +73,3 @@ ProbNN_eta = {
     "xmin_2": 0.9,
     "xmax_2": 1
 }
-
-# ID czstkek pi
-pipi = {
-    "id": [211]
-}
-
-# ID cząstek pi i p
-ppi = {
-    "id": [211, 2212]
-}
-
-# ID cząstek K
-KK = {
-    "id": [321]
-}
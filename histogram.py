@@ -0,0 +1,171 @@
+import numpy as np
+
+
+class Histogram:
+    """
+    Histogram 1D lub 2D o stałej szerokości binów przechowywany w tablicach numpy (bez ROOT). Biny są numerowane
+    tak jak w ROOT: 0 - niedomiar, 1..nBins - zwykłe biny, nBins + 1 - nadmiar, a dla histogramów 2D numer binu
+    wynosi binx + (nBins_x + 2) * biny. Konwersja do TH1F/TH1I/TH2F następuje dopiero w to_root
+    """
+
+    def __init__(self, name: str, title: str, axes: list[tuple], kind: str = 'F'):
+        """
+        :param name: Nazwa histogramu
+        :param title: Tytuł histogramu i osi (jak w ROOT, np. 'tytuł;oś x;oś y')
+        :param axes: Osie histogramu: lista (nBins, xmin, xmax), jedna dla histogramu 1D i dwie dla 2D
+        :param kind: Typ histogramu ROOT tworzonego w to_root: 'F' (TH1F/TH2F) lub 'I' (TH1I)
+        """
+        self.name = name
+        self.title = title
+        self.axes = [(int(n_bins), float(xmin), float(xmax)) for n_bins, xmin, xmax in axes]
+        self.kind = kind
+        n_cells = int(np.prod([n_bins + 2 for n_bins, _, _ in self.axes]))
+        # Suma wag i suma kwadratów wag w każdym binie (razem z niedomiarem i nadmiarem)
+        self.counts = np.zeros(n_cells)
+        self.sumw2 = np.zeros(n_cells)
+        self.entries = 0
+
+    @property
+    def dimension(self) -> int:
+        return len(self.axes)
+
+    def edges(self, axis: int = 0) -> np.ndarray:
+        """
+        Funkcja zwracająca granice binów osi
+        """
+        n_bins, xmin, xmax = self.axes[axis]
+        return np.linspace(xmin, xmax, n_bins + 1)
+
+    def find_bin(self, values, axis: int = 0) -> np.ndarray:
+        """
+        Funkcja zwracająca numery binów osi dla podanych wartości (jak TAxis::FindFixBin, wartości NaN trafiają
+        do nadmiaru)
+        """
+        n_bins, xmin, xmax = self.axes[axis]
+        values = np.asarray(values, dtype=np.float64)
+        inside = (values >= xmin) & (values < xmax)
+        bins = np.where(values < xmin, 0, n_bins + 1)
+        # Numer binu obliczany tylko dla wartości w zakresie osi (zaokrąglenie na krawędzi ograniczone do nBins)
+        bins[inside] = np.minimum(1 + (n_bins * (values[inside] - xmin) / (xmax - xmin)).astype(np.int64), n_bins)
+        return bins
+
+    def fill(self, *values, weights: np.ndarray = None):
+        """
+        Funkcja wypełniająca histogram wszystkimi wartościami naraz (jedna tablica dla histogramu 1D, dwie dla 2D)
+        """
+        bins = self.find_bin(values[0], 0)
+        if self.dimension == 2:
+            bins = bins + (self.axes[0][0] + 2) * self.find_bin(values[1], 1)
+        if weights is None:
+            occurrences = np.bincount(bins, minlength=self.counts.size)
+            self.counts += occurrences
+            self.sumw2 += occurrences
+        else:
+            weights = np.asarray(weights, dtype=np.float64)
+            self.counts += np.bincount(bins, weights, minlength=self.counts.size)
+            self.sumw2 += np.bincount(bins, weights ** 2, minlength=self.counts.size)
+        self.entries += bins.size
+
+    def add(self, other: 'Histogram', sign: int = 1):
+        """
+        Funkcja dodająca zawartość innego histogramu o takich samych osiach
+
+        :param sign: -1 - odjęcie histogramu dodanego wcześniej (także sumy kwadratów wag i liczby wpisów)
+        """
+        if other.axes != self.axes:
+            raise ValueError(f"Cannot add histograms with different axes: {self.name}, {other.name}")
+        self.counts += sign * other.counts
+        self.sumw2 += sign * other.sumw2
+        self.entries += sign * other.entries
+
+    def scale(self, factor: float):
+        """
+        Funkcja mnożąca zawartość histogramu przez czynnik
+        """
+        self.counts *= factor
+        self.sumw2 *= factor ** 2
+
+    def integral(self, first: int = 1, last: int = None) -> float:
+        """
+        Funkcja zwracająca sumę binów od first do last włącznie (histogram 1D, domyślnie bez niedomiaru
+        i nadmiaru)
+        """
+        if last is None:
+            last = self.axes[0][0]
+        return float(self.counts[first:last + 1].sum())
+
+    def values(self) -> np.ndarray:
+        """
+        Funkcja zwracająca zawartość zwykłych binów (bez niedomiaru i nadmiaru), dla histogramu 2D w kształcie
+        (nBins_y, nBins_x)
+        """
+        shape = [n_bins + 2 for n_bins, _, _ in reversed(self.axes)]
+        inner = tuple(slice(1, -1) for _ in self.axes)
+        return self.counts.reshape(shape)[inner]
+
+    def clone(self, name: str) -> 'Histogram':
+        """
+        Funkcja zwracająca kopię histogramu o nowej nazwie
+        """
+        copy = Histogram(name, self.title, self.axes, self.kind)
+        copy.counts = self.counts.copy()
+        copy.sumw2 = self.sumw2.copy()
+        copy.entries = self.entries
+        return copy
+
+    def to_root(self):
+        """
+        Funkcja tworząca histogram ROOT (TH1F, TH1I lub TH2F) o takiej samej zawartości. ROOT jest importowany
+        dopiero tutaj. Histogram nie należy do żadnego katalogu ROOT (właścicielem jest zwrócony obiekt)
+        """
+        from rendering import root
+        ROOT = root()
+        axes = [value for axis in self.axes for value in axis]
+        hist = getattr(ROOT, f'TH{self.dimension}{self.kind}')(self.name, self.title, *axes)
+        hist.SetDirectory(ROOT.nullptr)
+        hist.Sumw2()
+        for cell in np.flatnonzero(self.counts):
+            hist.SetBinContent(int(cell), self.counts[cell])
+            hist.SetBinError(int(cell), np.sqrt(self.sumw2[cell]))
+        hist.ResetStats()
+        hist.SetEntries(self.entries)
+        return hist
+
+    @classmethod
+    def from_root(cls, hist) -> 'Histogram':
+        """
+        Funkcja tworząca histogram z histogramu ROOT (np. wczytanego z pliku z wynikami)
+        """
+        axes = [(axis.GetNbins(), axis.GetXmin(), axis.GetXmax())
+                for axis in [hist.GetXaxis(), hist.GetYaxis()][:hist.GetDimension()]]
+        kind = 'I' if hist.ClassName() == 'TH1I' else 'F'
+        result = cls(hist.GetName(), hist.GetTitle(), axes, kind)
+        cells = range(result.counts.size)
+        result.counts = np.array([hist.GetBinContent(cell) for cell in cells], dtype=np.float64)
+        result.sumw2 = np.array([hist.GetBinError(cell) ** 2 for cell in cells], dtype=np.float64)
+        result.entries = int(hist.GetEntries())
+        return result
+
+
+class Graph:
+    """
+    Wykres punktów (x, y) przechowywany w tablicach numpy. Konwersja do TGraph następuje dopiero w to_root
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, title: str):
+        """
+        :param title: Tytuł wykresu i osi (jak w ROOT, np. 'tytuł;oś x;oś y')
+        """
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.title = title
+
+    def to_root(self):
+        """
+        Funkcja tworząca obiekt TGraph. ROOT jest importowany dopiero tutaj
+        """
+        from rendering import root
+        ROOT = root()
+        graph = ROOT.TGraph(self.x.size, self.x, self.y)
+        graph.SetTitle(self.title)
+        return graph
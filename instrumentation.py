@@ -0,0 +1,134 @@
+import io
+import time
+import json
+import resource
+import functools
+import contextlib
+import pandas as pd
+
+
+def peak_rss() -> int:
+    """
+    Funkcja zwracająca maksymalne dotychczasowe zużycie pamięci procesu w bajtach (na Linuksie ru_maxrss
+    podawane jest w kB)
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Instrumentation:
+    """
+    Pomiar czasu (rzeczywistego i procesora), liczby wierszy danych przed i po etapie oraz maksymalnego zużycia
+    pamięci dla etapów obliczeń i grup histogramów. Wyniki tego samego etapu (np. z kolejnych kawałków danych) są
+    sumowane
+    """
+
+    def __init__(self, line_profile: bool = False):
+        """
+        :param line_profile: Jeśli True, dla funkcji dodanych przez add_line_profile mierzony jest czas każdej linii
+            (wymaga pakietu line_profiler)
+        """
+        self.records = {}
+        self.line_profiler = None
+        if line_profile:
+            # Zależność opcjonalna, importowana tylko gdy potrzebna
+            from line_profiler import LineProfiler
+            self.line_profiler = LineProfiler()
+
+    def add(self, name: str, wall: float, cpu: float, rows_in: int, rows_out: int, calls: int = 1):
+        """
+        Funkcja dodająca pomiar do wyników etapu
+        """
+        record = self.records.setdefault(name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'rows_in': 0, 'rows_out': 0,
+                                                'peak_rss': 0})
+        record['calls'] += calls
+        record['wall'] += wall
+        record['cpu'] += cpu
+        record['rows_in'] += rows_in
+        record['rows_out'] += rows_out
+        record['peak_rss'] = max(record['peak_rss'], peak_rss())
+
+    @contextlib.contextmanager
+    def stage(self, name: str, rows=lambda: 0):
+        """
+        Menedżer kontekstu mierzący etap obliczeń
+
+        :param rows: Funkcja zwracająca aktualną liczbę wierszy danych (wywoływana przed i po etapie)
+        """
+        rows_in = rows()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall, time.process_time() - cpu, rows_in, rows())
+
+    def iterate(self, name: str, iterable):
+        """
+        Generator zwracający elementy iterable (np. kawałki danych) i mierzący czas ich tworzenia jako etap name
+        """
+        iterator = iter(iterable)
+        while True:
+            wall, cpu = time.perf_counter(), time.process_time()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.add(name, time.perf_counter() - wall, time.process_time() - cpu, 0, len(item))
+            yield item
+
+    def merge(self, records: dict):
+        """
+        Funkcja dodająca wyniki z innego procesu
+        """
+        for name, record in records.items():
+            current = self.records.setdefault(name, {**record, 'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'rows_in': 0,
+                                                     'rows_out': 0})
+            for key in ['calls', 'wall', 'cpu', 'rows_in', 'rows_out']:
+                current[key] += record[key]
+            current['peak_rss'] = max(current['peak_rss'], record['peak_rss'])
+
+    def add_line_profile(self, *functions):
+        """
+        Funkcja dodająca funkcje do pomiaru czasu każdej linii i włączająca pomiar (tylko gdy line_profile=True)
+        """
+        if self.line_profiler is None:
+            return
+        for function in functions:
+            self.line_profiler.add_function(getattr(function, '__wrapped__', function))
+        self.line_profiler.enable_by_count()
+
+    def report(self) -> pd.DataFrame:
+        """
+        Funkcja zwracająca wyniki jako tabelę (etap: wyniki)
+        """
+        return pd.DataFrame.from_dict(self.records, orient='index')
+
+    def write(self, path: str):
+        """
+        Funkcja zapisująca wyniki do plików <path>.json i <path>.csv oraz (jeśli włączony) wynik pomiaru czasu
+        każdej linii do pliku <path>_lines.txt
+        """
+        with open(f'{path}.json', 'w') as file:
+            json.dump(self.records, file, indent=1)
+        self.report().to_csv(f'{path}.csv', index_label='stage')
+        if self.line_profiler is not None:
+            self.line_profiler.disable_by_count()
+            stream = io.StringIO()
+            self.line_profiler.print_stats(stream)
+            with open(f'{path}_lines.txt', 'w') as file:
+                file.write(stream.getvalue())
+
+
+def timed(name: str):
+    """
+    Dekorator metod obiektu Simulation mierzący ich wywołania jako etap name. Jeśli pomiar jest wyłączony
+    (self.instrumentation is None), metoda jest wywoływana bez żadnych dodatkowych obliczeń
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            if self.instrumentation is None:
+                return function(self, *args, **kwargs)
+            with self.instrumentation.stage(name, lambda: len(self.data)):
+                return function(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,94 @@
+import numpy as np
+from event_index import EventIndex, EVENT_KEYS
+
+
+class JaggedEvents:
+    """
+    Dane w formacie zdarzeń: tablice zmiennych cząstek ułożone zdarzenie po zdarzeniu oraz indeks zdarzeń
+    (event_index.EventIndex, przedziały offsets[i]:offsets[i + 1]). Alternatywa dla pd.DataFrame bez tworzenia
+    ramki danych i bez globalnego sortowania - indeks zdarzeń tworzony jest osobno dla każdego pliku lub kawałka
+    danych. Obiekt udostępnia operacje na danych używane przez Simulation (zmienna jako tablica numpy, len, columns,
+    drop, memory_usage)
+    """
+
+    def __init__(self, arrays: dict, index: EventIndex):
+        """
+        :param arrays: Słownik tablic zmiennych (cząstki jednego zdarzenia obok siebie)
+        :param index: Indeks zdarzeń (bez permutacji wierszy)
+        """
+        self.arrays = arrays
+        self.index = index
+
+    @classmethod
+    def from_arrays(cls, arrays: dict) -> 'JaggedEvents':
+        """
+        Funkcja tworząca dane w formacie zdarzeń ze słownika tablic (np. jednego pliku po preselekcji). Jeśli cząstki
+        zdarzeń nie są ułożone obok siebie, tablice są raz przestawiane (stabilne sortowanie po EVENT_KEYS)
+        """
+        index = EventIndex.build([arrays[key] for key in EVENT_KEYS if key in arrays])
+        if index.order is not None:
+            arrays = {key: values[index.order] for key, values in arrays.items()}
+            index.order = None
+        return cls(arrays, index)
+
+    @classmethod
+    def concatenate(cls, parts: list['JaggedEvents']) -> 'JaggedEvents':
+        """
+        Funkcja łącząca dane z kilku plików (zdarzenia różnych części muszą być różne, np. przez fileNumber)
+        """
+        filled = [part for part in parts if len(part)]
+        if not filled:
+            # Bez cząstek zostają zmienne (puste tablice tych samych typów), tak jak w pd.concat pustych ramek
+            arrays = {key: values[:0] for key, values in parts[0].arrays.items()} if parts else {}
+            return cls(arrays, EventIndex.build([]))
+        parts = filled
+        arrays = {key: np.concatenate([part.arrays[key] for part in parts]) for key in parts[0].arrays}
+        # Indeksy początków zdarzeń kolejnych części są przesuwane o liczbę cząstek poprzednich części
+        shifts = np.cumsum([0] + [len(part) for part in parts[:-1]])
+        offsets = np.concatenate([part.index.offsets[:-1] + shift for part, shift in zip(parts, shifts)] +
+                                 [[shifts[-1] + len(parts[-1])]])
+        return cls(arrays, EventIndex(offsets.astype(np.int64)))
+
+    def __len__(self) -> int:
+        return int(self.index.offsets[-1])
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.arrays[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.arrays
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.arrays)
+
+    @property
+    def n_events(self) -> int:
+        return self.index.n_events
+
+    def drop(self, columns: list[str]) -> 'JaggedEvents':
+        """
+        Funkcja zwracająca dane bez podanych zmiennych (indeks zdarzeń jest wspólny)
+        """
+        return JaggedEvents({key: values for key, values in self.arrays.items() if key not in columns}, self.index)
+
+    def memory_usage(self, deep: bool = True) -> np.ndarray:
+        """
+        Funkcja zwracająca rozmiar każdej zmiennej w bajtach (jak pd.DataFrame.memory_usage)
+        """
+        return np.array([values.nbytes for values in self.arrays.values()], dtype=np.int64)
+
+    def event(self, number: int) -> dict:
+        """
+        Funkcja zwracająca zmienne cząstek jednego zdarzenia (wycinki tablic, bez kopiowania)
+        """
+        start, stop = self.index.offsets[number], self.index.offsets[number + 1]
+        return {key: values[start:stop] for key, values in self.arrays.items()}
+
+    def to_awkward(self):
+        """
+        Funkcja zwracająca dane jako tablicę awkward (zdarzenia - listy cząstek z polami zmiennych), np. do
+        ak.combinations. Pakiet awkward jest importowany dopiero tutaj
+        """
+        import awkward as ak
+        return ak.unflatten(ak.zip(self.arrays, depth_limit=1), self.index.lengths)
@@ -0,0 +1,58 @@
+import numpy as np
+from particle_masses import masses
+
+
+class Kinematics:
+    """
+    Kinematyka cząstek jednego kawałka danych obliczana raz i używana przez wszystkie kombinacje cząstek: ciągłe
+    tablice float64 składowych pędu i energii dla hipotez mas z particle_masses.masses (pi, K, p). Wartości dla
+    wybranego rodzaju cząstek pobierane są z tych tablic po indeksach (np.take), bez ponownego odczytu zmiennych
+    z danych
+    """
+
+    def __init__(self, px: np.ndarray, py: np.ndarray, pz: np.ndarray, p: np.ndarray = None,
+                 energy: np.ndarray = None):
+        """
+        :param px: Składowe pędu (tablice są kopiowane tylko wtedy, gdy nie są ciągłymi tablicami float64)
+        :param p: Całkowity pęd - energia obliczana jest z masy hipotezy (dane z rekonstrukcji)
+        :param energy: Energia niezależna od hipotezy (np. TRUEP_E), używana zamiast p
+        """
+        if (p is None) == (energy is None):
+            raise ValueError("Exactly one of p and energy must be given")
+        self.px = np.ascontiguousarray(px, dtype=np.float64)
+        self.py = np.ascontiguousarray(py, dtype=np.float64)
+        self.pz = np.ascontiguousarray(pz, dtype=np.float64)
+        self.p = None if p is None else np.ascontiguousarray(p, dtype=np.float64)
+        self.energy = None if energy is None else np.ascontiguousarray(energy, dtype=np.float64)
+        # Energie dla hipotez mas (hipoteza: tablica), obliczane przy pierwszym użyciu hipotezy
+        self.energies = {}
+
+    def __len__(self) -> int:
+        return self.px.size
+
+    def E(self, hypothesis: str) -> np.ndarray:
+        """
+        Funkcja zwracająca energię wszystkich cząstek dla hipotezy masy ('pi', 'K' lub 'p')
+        """
+        if self.energy is not None:
+            return self.energy
+        if hypothesis not in self.energies:
+            self.energies[hypothesis] = np.sqrt(self.p ** 2 + masses[hypothesis] ** 2)
+        return self.energies[hypothesis]
+
+    def particles(self, name: str, condition: np.ndarray) -> dict:
+        """
+        Funkcja zwracająca energie i pędy cząstek spełniających warunek (w kolejności danych), w formacie
+        combinatorics.invariant_masses (bez 'count' i 'start')
+
+        :param name: Nazwa rodzaju cząstek, np. 'pi_plus' (hipoteza masy to część przed '_')
+        :param condition: Maska wyboru cząstek
+        """
+        index = np.flatnonzero(condition)
+        return {
+            'name': name,
+            'E': self.E(name.split('_')[0]).take(index),
+            'PX': self.px.take(index),
+            'PY': self.py.take(index),
+            'PZ': self.pz.take(index),
+        }
@@ -1,23 +1,20 @@
-from simulation import Simulation
+from simulation import Simulation, run_samples
 from functions import *
 
 if __name__ == "__main__":
-    # Stworzenie obiektu Simulation dla danych z Monte Carlo (w domysle true_data=False)
+    # Próbki przetwarzane jednocześnie, każda w osobnym procesie (nazwa: argumenty konstruktora Simulation).
     # Przekazywana jest ścieżka do danych i ścieżka do katalogu w którym zostaną umieszczone wyniki (katalog results)
-    sim = Simulation('/home/jakub/Desktop/data/', "/home/jakub/PycharmProjects/Root/results")
-    # Wywołanie funkcji wypełniającej histogramy
-    sim.fill_all_histograms()
-    # Wywołanie funkcji zapisującej histogramy do plików
-    sim.save_all_histograms()
-
-    # Stworzenie obiektu Simulation dla danych doświadczalnych
-    # Przekazywana jest ścieżka do danych i ścieżka do katalogu w którym zostaną umieszczone wyniki (katalog results)
-    sim_true_data = Simulation('/home/jakub/Desktop/data_true/', f"/home/jakub/PycharmProjects/Root/results",
-                               true_data=True)
-    # Wywołanie funkcji wypełniającej histogramy
-    sim_true_data.fill_all_histograms()
-    # Wywołanie funkcji zapisującej histogramy do plików
-    sim_true_data.save_all_histograms()
+    samples = {
+        # Dane z Monte Carlo (w domysle true_data=False)
+        'mc': {'data_path': '/home/jakub/Desktop/data/',
+               'results_path': "/home/jakub/PycharmProjects/Root/results"},
+        # Dane doświadczalne
+        'true_data': {'data_path': '/home/jakub/Desktop/data_true/',
+                      'results_path': "/home/jakub/PycharmProjects/Root/results", 'true_data': True},
+    }
+    # Wypełnienie i zapisanie histogramów wszystkich próbek. Zwracane obiekty Simulation są wczytywane z zapisanych
+    # plików z wynikami
+    results = run_samples(samples)
 
     # Wywołanie funkcji do stworzenia łączonych histogramów
-    draw_combined_histograms(sim, sim_true_data)
+    draw_combined_histograms(results['mc'], results['true_data'])
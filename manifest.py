@@ -0,0 +1,159 @@
+import os
+import json
+import pickle
+import hashlib
+from pathlib import Path
+
+
+def checksum(path: str, block_size: int = 1024 ** 2) -> str:
+    """
+    Funkcja obliczająca sumę kontrolną (sha1) pliku, czytając go w blokach
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_pickle(path: str, value):
+    """
+    Funkcja zapisująca obiekt do pliku pickle (przez plik tymczasowy, żeby przerwanie zapisu nie zostawiło
+    niekompletnego pliku)
+    """
+    path = Path(path)
+    temp = path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(temp, 'wb') as file:
+        pickle.dump(value, file)
+    temp.replace(path)
+
+
+def read_pickle(path: str):
+    """
+    Funkcja wczytująca obiekt zapisany przez write_pickle
+    """
+    with open(path, 'rb') as file:
+        return pickle.load(file)
+
+
+class Manifest:
+    """
+    Spis przetworzonych plików .root (ścieżka, rozmiar, czas modyfikacji, suma kontrolna) dla trybu
+    przyrostowego. Częściowe wyniki każdego pliku zapisywane są w tym samym katalogu (jeden plik pickle na plik
+    z danymi, bez ROOT), razem z sumą wyników wszystkich plików ze spisu (total.pkl)
+    """
+
+    def __init__(self, directory: str, settings: dict):
+        """
+        :param directory: Katalog, w którym zapisywany jest spis (manifest.json) i częściowe wyniki
+        :param settings: Ustawienia przetwarzania (np. preselekcja). Jeśli różnią się od zapisanych, wszystkie
+            pliki są przetwarzane od nowa
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / 'manifest.json'
+        self.total_path = self.directory / 'total.pkl'
+        # Ustawienia są porównywane po zapisaniu do JSON (krotki zamieniane są na listy)
+        self.settings = json.loads(json.dumps(settings))
+        self.entries = {}
+        if self.path.exists():
+            saved = json.loads(self.path.read_text())
+            if saved['settings'] == self.settings:
+                self.entries = saved['files']
+        # Sumy kontrolne obliczone w pending (zapisywane w record)
+        self._checksums = {}
+        # Pliki usunięte od poprzedniego uruchomienia (ich częściowe wyniki są usuwane dopiero w save)
+        self.removed = []
+
+    @staticmethod
+    def _resolve(file: str) -> str:
+        return str(Path(file).resolve())
+
+    def partial_path(self, file: str) -> str:
+        """
+        Funkcja zwracająca ścieżkę do pliku z częściowymi wynikami dla danego pliku z danymi
+        """
+        return str(self.directory / f'{hashlib.sha1(self._resolve(file).encode()).hexdigest()}.pkl')
+
+    def pending(self, files: list[str]) -> list[str]:
+        """
+        Funkcja zwracająca pliki nowe lub zmienione od ostatniego przetworzenia. Wpisy plików, których już nie ma,
+        są usuwane (ich częściowe wyniki - dopiero w save). Suma kontrolna jest obliczana tylko, gdy zmienił się rozmiar
+        lub czas modyfikacji pliku
+
+        :param files: Ścieżki do plików .root (bez ścieżki do drzewa)
+        """
+        paths = {self._resolve(file): file for file in files}
+        for path in list(self.entries):
+            if path not in paths:
+                self.removed.append(path)
+                del self.entries[path]
+
+        pending = []
+        for path, file in paths.items():
+            stat = os.stat(path)
+            entry = self.entries.get(path)
+            if entry is not None and not Path(self.partial_path(path)).exists():
+                entry = None
+            if entry is not None and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                continue
+            self._checksums[path] = checksum(path)
+            if entry is not None and entry['checksum'] == self._checksums[path]:
+                # Zmienił się tylko czas modyfikacji - plik nie musi być przetwarzany ponownie
+                entry['mtime_ns'] = stat.st_mtime_ns
+                continue
+            pending.append(file)
+        return pending
+
+    def record(self, file: str):
+        """
+        Funkcja dopisująca do spisu plik, którego częściowe wyniki zostały zapisane
+        """
+        path = self._resolve(file)
+        stat = os.stat(path)
+        self.entries[path] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'checksum': self._checksums.pop(path, None) or checksum(path),
+        }
+
+    def partials(self) -> list[str]:
+        """
+        Funkcja zwracająca ścieżki do częściowych wyników wszystkich plików ze spisu
+        """
+        return [self.partial_path(path) for path in sorted(self.entries)]
+
+    def save(self):
+        """
+        Funkcja zapisująca spis (przez plik tymczasowy, żeby przerwanie zapisu nie uszkodziło spisu) i usuwająca
+        częściowe wyniki usuniętych plików
+        """
+        temp = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        temp.write_text(json.dumps({'settings': self.settings, 'files': self.entries}, indent=1))
+        temp.replace(self.path)
+        for path in self.removed:
+            Path(self.partial_path(path)).unlink(missing_ok=True)
+        self.removed = []
+
+    def load_total(self):
+        """
+        Funkcja wczytująca sumę wyników zapisaną przez save_total. Plik jest od razu usuwany, więc przerwanie
+        przetwarzania nie zostawia sumy niezgodnej z częściowymi wynikami
+
+        :return: Sumy kontrolne plików uwzględnionych w sumie (ścieżka: suma kontrolna) i suma wyników lub None,
+            jeśli suma nie istnieje lub została obliczona z innymi ustawieniami
+        """
+        if not self.total_path.exists():
+            return None
+        total = read_pickle(self.total_path)
+        self.total_path.unlink()
+        if total['settings'] != self.settings:
+            return None
+        return total['files'], total['results']
+
+    def save_total(self, results: dict):
+        """
+        Funkcja zapisująca sumę wyników wszystkich plików ze spisu (przez plik tymczasowy)
+        """
+        files = {path: entry['checksum'] for path, entry in self.entries.items()}
+        write_pickle(self.total_path, {'settings': self.settings, 'files': files, 'results': results})
@@ -20,3 +20,29 @@ data_reco = {
     "Py": "piplus_PY",
     "Pz": "piplus_PZ"
 }
+
+# Kombinacje cząstek, dla których wypełniane są histogramy mas niezmienniczych. Każdy wpis zawiera:
+#   name - nazwa histogramu (atrybut mass_<name> obiektu Simulation, dla masy ze zmiennej TRUEID mass_<name>_true)
+#   title - tytuł histogramu i nazwy osi
+#   nBins, xmin, xmax - binowanie histogramu
+#   daughters - listy cząstek tworzących kombinację (nazwy warunków z Simulation._particle_conditions). Wszystkie
+#       listy wypełniają ten sam histogram (np. stan i stan sprzężony ładunkowo). Masy hipotez cząstek dla
+#       rekonstrukcji pochodzą z pliku particle_masses.py
+#   normalization - opcjonalnie: zakres mas [min, max], w którym tło z mieszania zdarzeń normalizowane jest do
+#       histogramu mas (domyślnie cały histogram, granice zaokrąglane są do granic binów)
+combinations = [
+    {"name": "pipi", "title": "#pi#pi mass;m_{#pi#pi} [MeV];events", "nBins": 100, "xmin": 250, "xmax": 1000,
+     "daughters": [["pi_plus", "pi_minus"]]},
+    {"name": "ppi", "title": "p#pi mass;m_{p#pi} [MeV];events", "nBins": 100, "xmin": 1000, "xmax": 2500,
+     "daughters": [["p_plus", "pi_minus"], ["pi_plus", "p_minus"]]},
+    {"name": "KK", "title": "KK mass;m_{KK} [MeV];events", "nBins": 100, "xmin": 950, "xmax": 1500,
+     "daughters": [["K_plus", "K_minus"]]}
+]
+
+# Maksymalna liczba kombinacji w jednym zdarzeniu (zdarzenia z większą liczbą kombinacji są pomijane)
+max_combinations = 100_000
+
+# Mieszanie zdarzeń (tło kombinatoryczne): liczba poprzednich zdarzeń, z którymi mieszane jest każde zdarzenie,
+# oraz granice klas krotności (liczby cząstek w zdarzeniu po preselekcji). Mieszane są tylko zdarzenia z tej samej
+# klasy
+event_mixing = {"depth": 5, "classes": [5, 10, 20, 40]}
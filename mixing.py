@@ -0,0 +1,122 @@
+import numpy as np
+from combinatorics import invariant_masses
+
+# Liczba zdarzeń mieszanych w jednej porcji (ogranicza zużycie pamięci niezależnie od rozmiaru danych)
+BLOCK_SIZE = 100_000
+
+
+def select_events(store: dict, events: np.ndarray) -> dict:
+    """
+    Funkcja zwracająca zbiór zdarzeń ograniczony do podanych zdarzeń (w podanej kolejności). Tablice cząstek
+    wynikowego zbioru są ciągłe
+
+    :param store: Zbiór zdarzeń: 'class' - klasa krotności każdego zdarzenia, 'particles' - słownik rodzajów cząstek
+        (tablice 'E', 'PX', 'PY', 'PZ', 'count', 'start', jak w Simulation.create_mass_histogram)
+    :param events: Indeksy wybranych zdarzeń
+    """
+    particles = {}
+    for name, particle in store['particles'].items():
+        count = particle['count'][events]
+        start = np.cumsum(count) - count
+        # Indeksy cząstek wybranych zdarzeń
+        index = np.repeat(particle['start'][events] - start, count) + np.arange(count.sum())
+        particles[name] = {'name': name, 'count': count, 'start': start,
+                           **{key: particle[key][index] for key in ['E', 'PX', 'PY', 'PZ']}}
+    return {'class': store['class'][events], 'particles': particles}
+
+
+def concatenate(first: dict, second: dict) -> dict:
+    """
+    Funkcja łącząca dwa zbiory zdarzeń (zdarzenia drugiego zbioru są po zdarzeniach pierwszego)
+    """
+    particles = {}
+    for name, particle in first['particles'].items():
+        other = second['particles'][name]
+        count = np.concatenate((particle['count'], other['count']))
+        particles[name] = {'name': name, 'count': count, 'start': np.cumsum(count) - count,
+                           **{key: np.concatenate((particle[key], other[key])) for key in ['E', 'PX', 'PY', 'PZ']}}
+    return {'class': np.concatenate((first['class'], second['class'])), 'particles': particles}
+
+
+class MixingPool:
+    """
+    Pula ostatnich zdarzeń do mieszania zdarzeń (estymacja tła kombinatorycznego). Pierwsza cząstka kombinacji
+    pochodzi z bieżącego zdarzenia, a pozostałe z jednego z depth poprzednich zdarzeń tej samej klasy krotności.
+    Pula przechowuje tylko depth ostatnich zdarzeń każdej klasy, więc zużycie pamięci nie zależy od rozmiaru
+    danych
+    """
+
+    def __init__(self, depth: int, classes: list):
+        """
+        :param depth: Liczba poprzednich zdarzeń, z którymi mieszane jest każde zdarzenie
+        :param classes: Granice klas krotności (liczby cząstek w zdarzeniu)
+        """
+        self.depth = depth
+        self.classes = np.asarray(classes)
+        self.pool = None
+
+    def multiplicity_class(self, multiplicity: np.ndarray) -> np.ndarray:
+        """
+        Funkcja zwracająca klasę krotności każdego zdarzenia
+        """
+        return np.digitize(multiplicity, self.classes)
+
+    def _partners(self, classes: np.ndarray, pooled: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Funkcja zwracająca pary (bieżące zdarzenie, poprzednie zdarzenie tej samej klasy) dla wszystkich zdarzeń
+        spoza puli
+
+        :param classes: Klasy krotności zdarzeń (kolejność przetwarzania)
+        :param pooled: Liczba zdarzeń z puli (na początku tablicy)
+        """
+        order = np.argsort(classes, kind='stable')
+        sorted_classes = classes[order]
+        current, partner = [], []
+        for lag in range(1, self.depth + 1):
+            same = sorted_classes[lag:] == sorted_classes[:-lag]
+            current.append(order[lag:][same])
+            partner.append(order[:-lag][same])
+        current = np.concatenate(current) if current else np.zeros(0, dtype=np.int64)
+        partner = np.concatenate(partner) if partner else np.zeros(0, dtype=np.int64)
+        new = current >= pooled
+        return current[new], partner[new]
+
+    def _last_events(self, classes: np.ndarray) -> np.ndarray:
+        """
+        Funkcja zwracająca indeksy depth ostatnich zdarzeń każdej klasy (w kolejności przetwarzania)
+        """
+        order = np.argsort(classes, kind='stable')
+        sorted_classes = classes[order]
+        # Pozycja ostatniego zdarzenia klasy dla każdego zdarzenia (po sortowaniu)
+        group_end = np.searchsorted(sorted_classes, sorted_classes, side='right')
+        keep = group_end - np.arange(order.size) <= self.depth
+        return np.sort(order[keep])
+
+    def mix(self, store: dict, combinations: list, max_combinations: int, skipped: dict = None):
+        """
+        Generator zwracający masy niezmiennicze kombinacji z różnych zdarzeń (nazwa kombinacji, masy) dla zdarzeń
+        ze zbioru store, mieszanych z pulą i z wcześniejszymi zdarzeniami zbioru. Po zakończeniu pula zawiera
+        ostatnie zdarzenia zbioru
+
+        :param combinations: Kombinacje cząstek (np. z pliku mass_histograms.py)
+        :param max_combinations: Maksymalna liczba kombinacji w jednej parze zdarzeń
+        :param skipped: Słownik liczników par zdarzeń pominiętych z powodu max_combinations (klucz: nazwa
+            kombinacji z przyrostkiem '_mixed', patrz combinatorics.invariant_masses)
+        """
+        pooled = 0 if self.pool is None else self.pool['class'].size
+        combined = store if self.pool is None else concatenate(self.pool, store)
+        current, partner = self._partners(combined['class'], pooled)
+        for spec in combinations:
+            for daughters in spec["daughters"]:
+                first = combined['particles'][daughters[0]]
+                mixed = [{**first, 'count': first['count'][current], 'start': first['start'][current]}]
+                for name in daughters[1:]:
+                    particle = combined['particles'][name]
+                    # Cząstki z poprzedniego zdarzenia mają inną nazwę, żeby nie były traktowane jako te same
+                    # cząstki co pierwsza cząstka kombinacji
+                    mixed.append({**particle, 'name': f'{name}_mixed', 'count': particle['count'][partner],
+                                  'start': particle['start'][partner]})
+                for masses in invariant_masses(mixed, max_combinations, skipped=skipped,
+                                               key=f'{spec["name"]}_mixed'):
+                    yield spec["name"], masses
+        self.pool = select_events(combined, self._last_events(combined['class']))
@@ -1,3 +1,6 @@
 pi_mass = 139.570
 p_mass = 938.272
 K_mass = 493.677
+
+# Masy hipotez cząstek (nazwy jak w warunkach Simulation._particle_conditions)
+masses = {'pi': pi_mass, 'K': K_mass, 'p': p_mass}
@@ -0,0 +1,38 @@
+import numpy as np
+
+# Bity kategorii cząstki: spełnia kryterium, TRUEID to szukana cząstka, ID to szukana cząstka
+PASSES = 4
+TRUE = 2
+RECO = 1
+
+
+def confusion_counts(passes: list[np.ndarray], true_is: list[np.ndarray], reco_is: list[np.ndarray]) -> np.ndarray:
+    """
+    Funkcja zliczająca cząstki we wszystkich kategoriach dla wielu definicji naraz. Każda cząstka jest kodowana
+    jako liczba 0-7 (bity PASSES, TRUE, RECO), a wszystkie kategorie są zliczane jednym wywołaniem np.bincount
+
+    :param passes: Dla każdej definicji maska cząstek spełniających kryterium
+    :param true_is: Dla każdej definicji maska cząstek, których TRUEID to szukana cząstka
+    :param reco_is: Dla każdej definicji maska cząstek, których ID to szukana cząstka
+    :return: Tablica o wymiarach (liczba definicji, 8) z liczbą cząstek w każdej kategorii
+    """
+    if not passes:
+        return np.zeros((0, 8), dtype=np.int64)
+    codes = np.empty((len(passes), passes[0].size), dtype=np.int64)
+    for idx, (passing, true, reco) in enumerate(zip(passes, true_is, reco_is)):
+        # Kategorie kolejnych definicji mają przesunięte numery, żeby zliczyć wszystko naraz
+        codes[idx] = idx * 8 + passing * PASSES + true * TRUE + reco * RECO
+    return np.bincount(codes.ravel(), minlength=len(passes) * 8).reshape(len(passes), 8)
+
+
+def summarize(counts: np.ndarray, particle: str) -> dict:
+    """
+    Funkcja zamieniająca liczby cząstek w kategoriach na statystyki dla cząstek spełniających kryterium
+    """
+    return {
+        f'total_{particle}': int(counts[PASSES:].sum()),
+        f'true_positive_{particle}': int(counts[PASSES | TRUE | RECO]),
+        f'false_positive_{particle}': int(counts[PASSES | RECO]),
+        f'true_negative_{particle}': int(counts[PASSES]),
+        f'false_negative_{particle}': int(counts[PASSES | TRUE]),
+    }
@@ -0,0 +1,13 @@
+# Kryteria preselekcyjne w postaci (zmienna, operator, wartość). Cząstki spełniające kryterium są odrzucane
+cuts = [
+    ("piplus_P", ">", 100000),
+    ("piplus_PT", "<", 100),
+    ("piplus_TRACK_GhostProb", ">", 0.3),
+    ("piplus_TRACK_CHI2NDOF", ">", 3),
+    ("piplus_IPCHI2_OWNPV", ">", 3)
+]
+
+# Kryteria preselekcyjne stosowane tylko dla danych z symulacji Monte Carlo
+cuts_mc = [
+    ("piplus_TRUEID", "==", 0)
+]
@@ -0,0 +1,305 @@
+import re
+import queue
+import operator
+import threading
+import uproot
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from jagged import JaggedEvents
+
+# Żeby dostać się do danych do ścieżki do każdego pliku trzeba dopisać ':minbias;1/DecayTree;1',
+# ponieważ wewnątrz plików są takie katalogi
+TREE = ':minbias;1/DecayTree;1'
+
+# Zmienne wczytywane dla danych z symulacji Monte Carlo
+branches_mc = ['piplus_TRUEID', 'piplus_ID', 'piplus_TRUEP_E', 'piplus_TRUEP_X', 'piplus_TRUEP_Y', 'piplus_TRUEP_Z',
+               'piplus_TRUEPT', 'piplus_P', 'piplus_PX', 'piplus_PY', 'piplus_PZ', 'piplus_PT', 'piplus_ETA',
+               'piplus_PIDK', 'piplus_PIDp', 'piplus_ProbNNk', 'piplus_ProbNNp', 'piplus_ProbNNpi', 'eventNumber',
+               'piplus_TRACK_GhostProb', 'piplus_TRACK_CHI2NDOF', 'piplus_IPCHI2_OWNPV', 'runNumber']
+
+# Zmienne wczytywane dla danych doświadczalnych
+branches_true_data = ['piplus_ID', 'piplus_P', 'piplus_PX', 'piplus_PY', 'piplus_PZ', 'piplus_PT', 'piplus_ProbNNk',
+                      'piplus_ProbNNp', 'piplus_ProbNNpi', 'eventNumber', 'piplus_TRACK_GhostProb',
+                      'piplus_TRACK_CHI2NDOF', 'piplus_IPCHI2_OWNPV', 'runNumber']
+
+
+def root_files(directory) -> list[str]:
+    """
+    Funkcja zwracająca listę ścieżek do drzew DecayTree we wszystkich plikach .root z podanego katalogu.
+    Zamiast katalogu można przekazać listę plików .root
+    """
+    if isinstance(directory, (list, tuple)):
+        return [str(file) + TREE for file in directory]
+    # Stworzenie obiektu Path z przekazanej ścieżki do danych
+    path = Path(directory)
+    # Stworzenie listy plików .root w katalogu do którego prowadzi ścieżka
+    return [str(file) + TREE for file in sorted(path.glob('*.root'))]
+
+
+# Operatory dostępne w kryteriach preselekcyjnych
+OPERATORS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le, '==': operator.eq,
+             '!=': operator.ne}
+
+
+def apply_cuts(arrays: dict, cuts: list, cutflow: dict = None) -> dict:
+    """
+    Funkcja odrzucająca cząstki spełniające którekolwiek z kryteriów preselekcyjnych (jedna wspólna maska)
+
+    :param arrays: Słownik tablic wczytanych zmiennych
+    :param cuts: Lista kryteriów (zmienna, operator, wartość), np. z pliku preselection.py
+    :param cutflow: Słownik, do którego dodawana jest liczba wszystkich cząstek ('total') oraz liczba cząstek
+        odrzuconych przez każde kryterium (w kolejności kryteriów, tak jak przy ich kolejnym stosowaniu)
+    :return: Słownik tablic zawierający tylko cząstki, które przeszły preselekcję
+    """
+    if not arrays:
+        return arrays
+    keep = np.ones(len(next(iter(arrays.values()))), dtype=bool)
+    if cutflow is not None:
+        cutflow['total'] = cutflow.get('total', 0) + keep.size
+    for branch, op, value in cuts:
+        rejected = OPERATORS[op](arrays[branch], value)
+        if cutflow is not None:
+            name = f'{branch} {op} {value}'
+            cutflow[name] = cutflow.get(name, 0) + int(np.count_nonzero(rejected & keep))
+        keep &= ~rejected
+    return {branch: values[keep] for branch, values in arrays.items()}
+
+
+def add_file_number(arrays: dict, file_number: int) -> dict:
+    """
+    Funkcja dopisująca do danych numer pliku (zmienna 'fileNumber'), żeby zdarzenia o tym samym numerze
+    z różnych plików nie były łączone
+    """
+    size = len(next(iter(arrays.values()))) if arrays else 0
+    return {**arrays, 'fileNumber': np.full(size, file_number, dtype=np.int32)}
+
+
+# Typy zmiennych w trybie oszczędzania pamięci (pozostałe zmienne zmiennoprzecinkowe zapisywane są jako float32,
+# a pozostałe zmienne całkowite, np. eventNumber, nie są zmieniane). Energia i składowe pędu zostają w float64,
+# ponieważ przy obliczaniu masy niezmienniczej (E^2 - p^2) precyzja float32 nie wystarcza
+compact_types = {'piplus_ID': np.int16, 'piplus_TRUEID': np.int32, 'piplus_TRUEP_E': np.float64,
+                 'piplus_TRUEP_X': np.float64, 'piplus_TRUEP_Y': np.float64, 'piplus_TRUEP_Z': np.float64,
+                 'piplus_P': np.float64, 'piplus_PX': np.float64, 'piplus_PY': np.float64, 'piplus_PZ': np.float64}
+
+
+def compact(arrays: dict, columns) -> dict:
+    """
+    Funkcja zostawiająca tylko podane zmienne i zapisująca je w mniejszych typach (tryb oszczędzania pamięci)
+
+    :param arrays: Słownik tablic wczytanych zmiennych (po preselekcji)
+    :param columns: Zmienne potrzebne w dalszych obliczeniach. Zmienne, których nie ma w danych (np. runNumber
+        z EVENT_KEYS), są pomijane, tak jak przy tworzeniu indeksu zdarzeń
+    """
+    result = {}
+    for branch in columns:
+        if branch not in arrays:
+            continue
+        values = arrays[branch]
+        if branch in compact_types:
+            values = values.astype(compact_types[branch])
+        elif np.issubdtype(values.dtype, np.floating):
+            values = values.astype(np.float32)
+        result[branch] = values
+    return result
+
+
+# Pule wątków dekompresji koszyków (liczba wątków: pula), tworzone raz w każdym procesie
+_executors = {}
+
+
+def executors(workers: int) -> dict:
+    """
+    Funkcja zwracająca argumenty uproot.open/uproot.iterate, z którymi koszyki są dekompresowane w workers wątkach
+    (pusty słownik dla workers <= 1 - dekompresja w bieżącym wątku)
+    """
+    if workers <= 1:
+        return {}
+    if workers not in _executors:
+        _executors[workers] = uproot.ThreadPoolExecutor(max_workers=workers)
+    return {'decompression_executor': _executors[workers]}
+
+
+def prefetch(iterable, depth: int):
+    """
+    Generator zwracający elementy iterable, które są przygotowywane (wczytywane i dekompresowane) w osobnym wątku
+    w czasie przetwarzania poprzednich elementów. Gotowych elementów czekających na przetworzenie jest co najwyżej
+    depth, co ogranicza zużycie pamięci. Dla depth <= 0 elementy są przygotowywane w bieżącym wątku
+
+    :param iterable: Elementy do przygotowania (np. generator kawałków danych)
+    :param depth: Liczba elementów wczytywanych naprzód
+    """
+    if depth <= 0:
+        yield from iterable
+        return
+
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    # Znacznik końca danych (razem z ewentualnym wyjątkiem z wątku wczytującego)
+    end = object()
+
+    def put(entry) -> bool:
+        # Czekanie na miejsce w kolejce, przerywane gdy generator zostanie zamknięty
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((end, None))
+        except BaseException as error:
+            put((end, error))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is end:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _read_file(file: str, branches: list[str], cache=None, workers: int = 1) -> dict:
+    """
+    Funkcja wczytująca wybrane zmienne z jednego pliku (z pamięci podręcznej, jeśli jest podana)
+    """
+    if cache is None:
+        return uproot.open(file, **executors(workers)).arrays(filter_name=branches, library='np')
+    return cache.read(file, branches, executors(workers))
+
+
+def read_files(files: list[str], branches: list[str], cache=None, cuts=(), cutflow: dict = None,
+               columns=None, read_ahead: int = 0, workers: int = 1, jagged: bool = False):
+    """
+    Funkcja wczytująca wybrane zmienne ze wszystkich plików do jednego obiektu pd.DataFrame. Preselekcja jest
+    stosowana osobno dla każdego pliku, więc odrzucone cząstki nie trafiają do wynikowych danych
+
+    :param cache: Obiekt cache.BranchCache. Jeśli podany, dane są wczytywane z lokalnej pamięci podręcznej
+    :param cuts: Kryteria preselekcyjne (patrz apply_cuts)
+    :param cutflow: Słownik liczników odrzuconych cząstek (patrz apply_cuts)
+    :param columns: Jeśli podane, po preselekcji zostają tylko te zmienne, zapisane w mniejszych typach
+        (patrz compact)
+    :param read_ahead: Liczba plików wczytywanych naprzód w osobnym wątku w czasie preselekcji bieżącego pliku
+        (patrz prefetch)
+    :param workers: Liczba wątków dekompresji koszyków (patrz executors)
+    :param jagged: Jeśli True, zwracany jest obiekt jagged.JaggedEvents (bez tworzenia pd.DataFrame, indeks zdarzeń
+        tworzony osobno dla każdego pliku)
+    """
+    frames = []
+    read = (_read_file(file, branches, cache, workers) for file in files)
+    for file_number, arrays in enumerate(prefetch(read, read_ahead)):
+        arrays = add_file_number(apply_cuts(arrays, cuts, cutflow), file_number)
+        if columns is not None:
+            arrays = compact(arrays, columns)
+        frames.append(JaggedEvents.from_arrays(arrays) if jagged else pd.DataFrame(arrays))
+    if jagged:
+        return JaggedEvents.concatenate(frames)
+    if not frames:
+        return pd.DataFrame([])
+    return pd.concat(frames, ignore_index=True)
+
+
+def iterate_events(files: list[str], branches: list[str], step_size, cache=None, cuts=(), cutflow: dict = None,
+                   columns=None, read_ahead: int = 0, workers: int = 1, jagged: bool = False):
+    """
+    Generator zwracający dane w kawałkach o ograniczonym rozmiarze. Każdy zwracany kawałek zawiera tylko pełne
+    zdarzenia - cząstki ostatniego zdarzenia kawałka są przenoszone do następnego kawałka z tego samego pliku.
+    Zakładamy, że wewnątrz pliku cząstki jednego zdarzenia (runNumber, eventNumber) zapisane są jedna po drugiej
+
+    :param files: Ścieżki do drzew (np. z funkcji root_files)
+    :param branches: Zmienne do wczytania
+    :param step_size: Rozmiar kawałka: liczba wpisów (int) lub rozmiar w pamięci (str, np. '100 MB')
+    :param cache: Obiekt cache.BranchCache. Jeśli podany, dane są wczytywane z lokalnej pamięci podręcznej
+    :param cuts: Kryteria preselekcyjne stosowane do każdego kawałka zaraz po wczytaniu (patrz apply_cuts)
+    :param cutflow: Słownik liczników odrzuconych cząstek (patrz apply_cuts)
+    :param columns: Jeśli podane, po preselekcji zostają tylko te zmienne, zapisane w mniejszych typach
+        (patrz compact)
+    :param read_ahead: Liczba kawałków wczytywanych naprzód w osobnym wątku w czasie przetwarzania bieżącego
+        kawałka (patrz prefetch)
+    :param workers: Liczba wątków dekompresji koszyków (patrz executors)
+    :param jagged: Jeśli True, kawałki zwracane są jako obiekty jagged.JaggedEvents zamiast pd.DataFrame
+    """
+    def output(arrays: dict):
+        return JaggedEvents.from_arrays(arrays) if jagged else pd.DataFrame(arrays)
+
+    # Cząstki niekompletnego zdarzenia z końca poprzedniego kawałka (słownik tablic)
+    carry = None
+    current_file = None
+    file_numbers = {file[:-len(TREE)]: file_number for file_number, file in enumerate(files)}
+    for arrays, file in prefetch(_file_chunks(files, branches, step_size, cache, workers), read_ahead):
+        arrays = add_file_number(apply_cuts(arrays, cuts, cutflow), file_numbers[file])
+        if columns is not None:
+            arrays = compact(arrays, columns)
+        # Ostatnie zdarzenie poprzedniego pliku jest już kompletne
+        if file != current_file:
+            if carry is not None and len(carry['fileNumber']):
+                yield output(carry)
+            carry = None
+            current_file = file
+        if carry is not None:
+            arrays = {branch: np.concatenate((carry[branch], values)) for branch, values in arrays.items()}
+        size = len(arrays['fileNumber'])
+        if size == 0:
+            continue
+
+        # Szukamy początku ostatniego zdarzenia w kawałku. Dane nie są sortowane, żeby nie rozdzielić
+        # przeniesionego zdarzenia
+        other_events = np.zeros(size, dtype=bool)
+        for key in ['runNumber', 'eventNumber']:
+            if key in arrays:
+                values = arrays[key]
+                other_events |= values != values[-1]
+        other_events = np.flatnonzero(other_events)
+        split = other_events[-1] + 1 if other_events.size else 0
+        carry = {branch: values[split:] for branch, values in arrays.items()}
+        if split > 0:
+            yield output({branch: values[:split] for branch, values in arrays.items()})
+
+    if carry is not None and len(carry['fileNumber']):
+        yield output(carry)
+
+
+def _file_chunks(files: list[str], branches: list[str], step_size, cache=None, workers: int = 1):
+    """
+    Generator zwracający kolejne kawałki danych (słowniki tablic, bez uwzględnienia granic zdarzeń) razem ze
+    ścieżką pliku
+    """
+    if cache is None:
+        for arrays, report in uproot.iterate(files, filter_name=branches, step_size=step_size, library='np',
+                                             report=True, **executors(workers)):
+            yield arrays, report.file_path
+        return
+
+    for file in files:
+        arrays = cache.read(file, branches, executors(workers))
+        entries = len(next(iter(arrays.values())))
+        step = _entries_per_chunk(step_size, arrays)
+        for start in range(0, entries, step):
+            # Wycinki tablic wczytanych przez mmap nie są kopiowane
+            yield {branch: values[start:start + step] for branch, values in arrays.items()}, file[:-len(TREE)]
+
+
+def _entries_per_chunk(step_size, arrays: dict) -> int:
+    """
+    Funkcja zamieniająca rozmiar kawałka (liczba wpisów lub rozmiar w pamięci, np. '100 MB') na liczbę wpisów
+    """
+    if isinstance(step_size, int):
+        return max(step_size, 1)
+    units = {'B': 1, 'KB': 1000, 'MB': 1000 ** 2, 'GB': 1000 ** 3, 'KIB': 1024, 'MIB': 1024 ** 2, 'GIB': 1024 ** 3}
+    number, unit = re.fullmatch(r'\s*([\d.]+)\s*([a-zA-Z]*)\s*', step_size).groups()
+    size = float(number) * units[unit.upper() or 'B']
+    entry_size = sum(values.dtype.itemsize for values in arrays.values())
+    return max(int(size // entry_size), 1)
@@ -0,0 +1,159 @@
+import pickle
+import itertools
+import importlib.util
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Style płócien: rozmiar, marginesy (lewy, prawy, dolny, górny) oraz rozmiary tytułów i etykiet osi
+styles = {
+    "default": {"width": 375, "height": 350, "margins": (0.15, 0.15, 0.125, 0.125), "title_size": 0.05,
+                "label_size": 0.04}
+}
+
+# Płótna funkcji canvas używane bez obiektu Renderer (np. w draw_combined_histograms), osobno w każdym procesie
+_canvases = {}
+# Numery kolejnych obiektów Renderer (unikalne nazwy płócien w procesie)
+_renderers = itertools.count()
+_setup_lock = threading.Lock()
+_ready = False
+
+
+def root():
+    """
+    Funkcja importująca ROOT przy pierwszym rysowaniu (obliczenia nie wymagają ROOT). Przy pierwszym wywołaniu
+    włączany jest tryb wsadowy i tryb wielowątkowy ROOT, a nowe histogramy nie są dodawane do gDirectory (ich
+    właścicielem jest obiekt Pythona, więc histogramy o takich samych nazwach z różnych obiektów Simulation nie
+    zastępują się nawzajem)
+    """
+    global _ready
+    import ROOT
+    with _setup_lock:
+        if not _ready:
+            # Rysowanie bez otwierania okien (szybsze, działa też bez środowiska graficznego)
+            ROOT.gROOT.SetBatch(True)
+            ROOT.EnableThreadSafety()
+            ROOT.TH1.AddDirectory(False)
+            _ready = True
+    return ROOT
+
+
+def root_available() -> bool:
+    """
+    Funkcja sprawdzająca, czy ROOT jest zainstalowany (bez importowania ROOT)
+    """
+    return importlib.util.find_spec('ROOT') is not None
+
+
+def canvas(style: str = "default", canvases: dict = None, prefix: str = ''):
+    """
+    Funkcja zwracająca wyczyszczone płótno danego stylu (ROOT.TCanvas). Płótno jest tworzone tylko przy pierwszym
+    użyciu
+
+    :param canvases: Słownik płócien właściciela (styl: płótno), domyślnie płótna wspólne dla procesu
+    :param prefix: Przedrostek nazwy płótna (unikalny dla właściciela)
+    """
+    canvases = _canvases if canvases is None else canvases
+    if style not in canvases:
+        settings = styles[style]
+        name = f'{prefix}canvas_{style}'
+        c = root().TCanvas(name, name, settings["width"], settings["height"])
+        left, right, bottom, top = settings["margins"]
+        c.SetLeftMargin(left)
+        c.SetRightMargin(right)
+        c.SetBottomMargin(bottom)
+        c.SetTopMargin(top)
+        canvases[style] = c
+    c = canvases[style]
+    c.Clear()
+    c.cd()
+    return c
+
+
+def render(obj, path: str, option: str = '', style: str = "default", canvases: dict = None, prefix: str = ''):
+    """
+    Funkcja rysująca histogram lub wykres na płótnie danego stylu i zapisująca go do pliku
+
+    :param obj: Histogram lub wykres (histogram.Histogram, histogram.Graph lub obiekt ROOT)
+    :param option: Opcja rysowania (np. 'COLZ' dla kolorowych histogramów 2D)
+    :param canvases: Słownik płócien właściciela (patrz canvas)
+    :param prefix: Przedrostek nazw płócien właściciela
+    """
+    settings = styles[style]
+    # Konwersja do obiektu ROOT następuje dopiero przy rysowaniu
+    root()
+    if hasattr(obj, 'to_root'):
+        obj = obj.to_root()
+    # Ustawienia wizualne histogramów
+    obj.SetStats(0)
+    obj.GetXaxis().SetTitleSize(settings["title_size"])
+    obj.GetYaxis().SetTitleSize(settings["title_size"])
+    obj.GetXaxis().SetLabelSize(settings["label_size"])
+    obj.GetYaxis().SetLabelSize(settings["label_size"])
+    c = canvas(style, canvases, prefix)
+    obj.Draw(option)
+    c.Print(path)
+
+
+def _render_serialized(jobs: list[tuple], canvases: dict = None, prefix: str = '') -> int:
+    """
+    Funkcja rysująca zserializowane histogramy (także w procesie roboczym) i zwracająca ich liczbę
+    """
+    for data, path, option, style in jobs:
+        render(pickle.loads(data), path, option, style, canvases, prefix)
+    return len(jobs)
+
+
+class Renderer:
+    """
+    Obiekt zapisujący histogramy i wykresy do plików graficznych. Tryby pracy:
+    1. 'now' - histogram jest rysowany od razu
+    2. 'defer' - zapisywana jest kopia histogramu (zserializowana), a rysowanie następuje w flush, opcjonalnie
+       w kilku procesach
+    3. 'skip' - histogramy nie są rysowane (np. gdy wyniki są tylko obliczane, a rysowane osobno)
+    """
+
+    def __init__(self, mode: str = 'now', workers: int = 1):
+        """
+        :param mode: Tryb pracy: 'now', 'defer' lub 'skip'
+        :param workers: Liczba procesów używanych w flush
+        """
+        if mode not in ('now', 'defer', 'skip'):
+            raise ValueError(f"Unknown rendering mode: {mode}")
+        self.mode = mode
+        self.workers = workers
+        # Płótna tego obiektu (styl: płótno) i przedrostek ich nazw, dzięki czemu kilka obiektów Renderer (np.
+        # w różnych wątkach) nie używa tych samych płócien
+        self.canvases = {}
+        self.prefix = f'renderer{next(_renderers)}_'
+        # Zserializowane histogramy czekające na narysowanie: (dane, ścieżka, opcja, styl)
+        self.jobs = []
+
+    def submit(self, obj, path: str, option: str = '', style: str = "default"):
+        """
+        Funkcja zlecająca zapisanie histogramu lub wykresu do pliku
+        """
+        if self.mode == 'skip':
+            return
+        if self.mode == 'now':
+            render(obj, path, option, style, self.canvases, self.prefix)
+            return
+        # Kopia jest robiona od razu, więc późniejsze zmiany histogramu (np. normalizacja) nie mają wpływu na wynik
+        self.jobs.append((pickle.dumps(obj), path, option, style))
+
+    def flush(self) -> int:
+        """
+        Funkcja rysująca wszystkie odłożone histogramy. Jeśli workers > 1, histogramy są dzielone między procesy
+        (każdy z własnym ROOT i własnymi płótnami)
+
+        :return: Liczba narysowanych histogramów
+        """
+        jobs, self.jobs = self.jobs, []
+        if self.workers <= 1 or len(jobs) <= 1:
+            return _render_serialized(jobs, self.canvases, self.prefix)
+
+        # Procesy są tworzone przez 'spawn', ponieważ ROOT nie działa poprawnie po fork
+        context = multiprocessing.get_context('spawn')
+        batches = [jobs[i::self.workers] for i in range(self.workers)]
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            return sum(pool.map(_render_serialized, [batch for batch in batches if batch]))
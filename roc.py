@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+
+def scan_counts(values: np.ndarray, is_true: np.ndarray, cutoffs: np.ndarray) -> np.ndarray:
+    """
+    Funkcja obliczająca true_positive, false_positive, true_negative i false_negative dla wszystkich wartości
+    kryterium (zmienna > kryterium) naraz: jedno sortowanie i sumy kumulatywne
+
+    :param values: Wartości zmiennej na którą nakładane jest kryterium
+    :param is_true: Maska cząstek, które są szukaną cząstką
+    :param cutoffs: Rosnące wartości kryterium
+    :return: Tablica o wymiarach (4, liczba kryteriów): TP, FP, TN, FN. Tablice z kolejnych kawałków danych można
+        sumować
+    """
+    order = np.argsort(values, kind='stable')
+    # Liczba szukanych cząstek wśród cząstek o wartościach mniejszych lub równych kolejnym wartościom
+    true_cumulative = np.concatenate(([0], np.cumsum(is_true[order])))
+    # Liczba cząstek niespełniających kryterium (wartość <= kryterium)
+    below = np.searchsorted(values[order], cutoffs, side='right')
+    false_negative = true_cumulative[below]
+    true_positive = true_cumulative[-1] - false_negative
+    false_positive = (values.size - below) - true_positive
+    true_negative = below - false_negative
+    return np.stack([true_positive, false_positive, true_negative, false_negative]).astype(np.int64)
+
+
+def scan_table(cutoffs: np.ndarray, counts: np.ndarray) -> pd.DataFrame:
+    """
+    Funkcja tworząca tabelę wyników skanowania z wydajnością (TP / (TP + FN)) i czystością (TP / (TP + FP))
+    """
+    true_positive, false_positive, true_negative, false_negative = counts
+    efficiency = np.divide(true_positive, true_positive + false_negative, out=np.zeros(cutoffs.size),
+                           where=(true_positive + false_negative) > 0)
+    purity = np.divide(true_positive, true_positive + false_positive, out=np.zeros(cutoffs.size),
+                       where=(true_positive + false_positive) > 0)
+    return pd.DataFrame({
+        'cutoff': cutoffs,
+        'true_positive': true_positive,
+        'false_positive': false_positive,
+        'true_negative': true_negative,
+        'false_negative': false_negative,
+        'efficiency': efficiency,
+        'purity': purity,
+    })
@@ -1,155 +1,189 @@
-import ROOT
-import uproot
 import numpy as np
 import pandas as pd
 import math
+import json
+import logging
+import resource
 from hist_types import *
 from mass_histograms import *
-from line_profiler_pycharm import profile
-from pathlib import Path
+from hist_registry import histograms
+from efficiency_types import *
+from efficiency import *
+from statistics_types import statistics, scans
+from pid_statistics import confusion_counts, summarize
+from roc import scan_counts, scan_table
+from instrumentation import Instrumentation, timed
+from histogram import Histogram, Graph
 from particle_masses import *
+from reader import *
+from event_index import EventIndex, EVENT_KEYS
+from jagged import JaggedEvents
+from kinematics import Kinematics
+from cache import BranchCache
+from combinatorics import invariant_masses
+from mixing import MixingPool, select_events, BLOCK_SIZE
+from rendering import Renderer, root_available
+from manifest import Manifest, write_pickle, read_pickle
+import preselection
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import multiprocessing
+import itertools
+
+# Numery kolejnych obiektów Simulation (unikalne przedrostki nazw histogramów w procesie)
+_instances = itertools.count()
+logger = logging.getLogger(__name__)
 
 
 class Simulation:
 
-    def __init__(self, data_path, results_path, true_data=False):
+    def __init__(self, data_path, results_path, true_data=False, chunk_size=None, workers=1, cache_path=None,
+                 cache_size=20 * 1024 ** 3, cuts=None, scan=False,
+                 renderer=None, state_path=None, low_memory=False, mixing=False, profile=False,
+                 read_ahead=1, decompression_workers=1, jagged=False):
         """
         Konstruktor obiektu Simulation
+
+        :param data_path: Katalog z plikami .root lub lista plików .root. Jeśli None, dane nie są wczytywane
+            (np. przy wczytywaniu zapisanych wyników w Simulation.load)
+        :param chunk_size: Jeśli podany, dane są wczytywane i przetwarzane w kawałkach o takim rozmiarze (liczba
+            wpisów lub np. '100 MB') dopiero w fill_all_histograms. Zużycie pamięci zależy wtedy od rozmiaru
+            kawałka, a nie od rozmiaru całego zbioru danych
+        :param workers: Liczba procesów. Jeśli większa od 1, każdy plik jest przetwarzany w osobnym procesie
+            w fill_all_histograms, a częściowe histogramy, statystyki i liczniki wydajności są następnie sumowane
+        :param cache_path: Katalog lokalnej pamięci podręcznej wczytywanych zmiennych (cache.BranchCache).
+            Jeśli podany, każdy plik jest dekompresowany tylko raz, a kolejne uruchomienia wczytują dane przez mmap
+        :param cache_size: Maksymalny rozmiar pamięci podręcznej w bajtach
+        :param cuts: Lista kryteriów preselekcyjnych (zmienna, operator, wartość) stosowanych podczas wczytywania
+            danych (domyślnie kryteria z pliku preselection.py)
+        :param scan: Jeśli True, dla danych z symulacji Monte Carlo wyznaczane są statystyki dla wielu wartości
+            kryteriów selekcji naraz (statistics_types.scans), zapisywane jako tabele .csv i krzywe ROC
+        :param renderer: Obiekt rendering.Renderer używany do zapisywania histogramów i wykresów (domyślnie
+            rysowanie od razu). Z trybem 'defer' rysowanie można wykonać później (renderer.flush), także w kilku
+            procesach, a z trybem 'skip' pominąć
+        :param state_path: Katalog stanu trybu przyrostowego (manifest.Manifest). Jeśli podany, fill_all_histograms
+            przetwarza tylko pliki nowe lub zmienione od poprzedniego uruchomienia, zapisuje ich częściowe wyniki
+            i uaktualnia nimi zapisaną sumę wyników wszystkich plików. Zużycie pamięci (memory.csv) obejmuje wtedy
+            tylko pliki przetworzone w tym uruchomieniu
+        :param low_memory: Jeśli True, po preselekcji zostają tylko potrzebne zmienne zapisane w mniejszych typach
+            (float32, int16/int32, patrz reader.compact), a każda zmienna jest usuwana z danych zaraz po ostatnim
+            etapie obliczeń, który jej używa
+        :param mixing: Jeśli True, dla mas z rekonstrukcji wypełniane są też histogramy z mieszania zdarzeń
+            (atrybuty mass_<nazwa>_mixed, ustawienia w mass_histograms.event_mixing), z których tworzone są
+            histogramy tła kombinatorycznego (background_histograms). Zdarzenia są mieszane z poprzednimi zdarzeniami
+            z jednej puli, więc mieszanie nie działa z workers > 1 ani ze state_path (każdy proces lub plik miałby
+            osobną, początkowo pustą pulę i inne widma tła niż przy przetwarzaniu w jednym procesie)
+        :param profile: Jeśli True, mierzony jest czas (rzeczywisty i procesora), liczba wierszy danych i zużycie
+            pamięci każdego etapu obliczeń i grupy histogramów (instrumentation.Instrumentation), a wyniki zapisywane
+            są w fill_all_histograms do plików statistics/timing.json i statistics/timing.csv. Jeśli 'lines',
+            dodatkowo mierzony jest czas każdej linii najbardziej kosztownych funkcji (wymaga pakietu line_profiler,
+            tylko w procesie głównym). Jeśli False, pomiar nie wprowadza żadnych dodatkowych obliczeń
+        :param read_ahead: Liczba plików (lub kawałków w trybie strumieniowym) wczytywanych naprzód w osobnym wątku
+            w czasie przetwarzania bieżących danych (reader.prefetch). Ogranicza zużycie pamięci przez wczytane dane;
+            0 - wczytywanie bez wyprzedzenia
+        :param decompression_workers: Liczba wątków dekompresji koszyków przy wczytywaniu plików .root
+        :param jagged: Jeśli True, dane przechowywane są w formacie zdarzeń (jagged.JaggedEvents) zamiast
+            pd.DataFrame: bez tworzenia ramki danych i bez globalnego sortowania, z indeksem zdarzeń tworzonym przy
+            wczytywaniu każdego pliku lub kawałka
         """
 
+        # Przedrostek nazw histogramów tego obiektu (histogramy różnych obiektów mają różne nazwy także po konwersji
+        # do ROOT, więc wiele obiektów Simulation może działać w jednym procesie, również w osobnych wątkach)
+        self.prefix = f'sim{next(_instances)}_'
         # ścieżka do folderu 'results' jest ustawiana jako parametr obiektu
         self.results_path = results_path
         # true_data jest ustawiane jako parametr obiektu
         self.true_data = true_data
+        # ścieżka do danych i rozmiar kawałka są ustawiane jako parametry obiektu
+        self.data_path = data_path
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.cache_path = cache_path
+        self.cache_size = cache_size
+        self.cache = BranchCache(cache_path, cache_size) if cache_path is not None else None
+        # Kryteria preselekcyjne (kryterium na TRUEID jest stosowane tylko gdy true_data=False)
+        if cuts is None:
+            cuts = preselection.cuts if true_data else preselection.cuts_mc + preselection.cuts
+        self.cuts = cuts
+        self.scan = scan
+        self.renderer = renderer if renderer is not None else Renderer()
+        self.state_path = state_path
+        self.low_memory = low_memory
+        self.read_ahead = read_ahead
+        self.decompression_workers = decompression_workers
+        self.jagged = jagged
+        # Pomiar czasu etapów obliczeń (None - pomiar wyłączony)
+        self.instrumentation = Instrumentation(profile == 'lines') if profile else None
+        if self.instrumentation is not None:
+            self.instrumentation.add_line_profile(Simulation.create_mass_histogram, Simulation.create_count_histogram,
+                                                  Simulation._accumulate_efficiency,
+                                                  Simulation._fill_registered_histograms, invariant_masses)
+        if mixing and (workers > 1 or state_path is not None):
+            raise ValueError("Event mixing requires serial processing (workers=1 and no state_path)")
+        # Pula zdarzeń do mieszania (zachowywana między kawałkami danych)
+        self.mixing_pool = MixingPool(event_mixing["depth"], event_mixing["classes"]) if mixing else None
         # inicjalizacja obiektu do przechowywania danych
         self.data = pd.DataFrame([])
-        # Otwieranie plików z danymi
-        if true_data:
-            self._create_dataframe_true_data(data_path)
-        else:
-            self._create_dataframe(data_path)
-        # Sortowanie danych wraz z rosnącym eventNumber
-        self.data = self.data.sort_values('eventNumber')
-        # Wywołanie preselekcji
-        self._preselection()
-
-        # Inicjalizacja histogramów mas (w przypadku true_data=False są to histogramy z rekonstrukcji)
-        self.mass_pipi = ROOT.TH1F('mass_pipi', '#pi#pi mass;m_{#pi#pi} [MeV];events', 100, 250, 1000)
-        self.mass_ppi = ROOT.TH1F('mass_ppi', 'p#pi mass;m_{p#pi} [MeV];events', 100, 1000, 2500)
-        self.mass_KK = ROOT.TH1F('mass_KK', 'KK mass;m_{KK} [MeV];events', 100, 950, 1500)
+        # Indeks zdarzeń danych z self.data (event_index.EventIndex)
+        self.events = EventIndex.build([])
+        # Inicjalizacja statystyk i liczników wydajności (sumowanych po kawałkach danych)
+        self.statistics = {}
+        self.efficiency = {}
+        # Liczniki TP/FP/TN/FN dla każdej wartości kryterium w trybie scan (nazwa: tablica (4, liczba kryteriów))
+        self.scans = {}
+        # Liczba cząstek odrzuconych przez każde kryterium preselekcyjne
+        self.cutflow = {}
+        # Liczba zdarzeń (par zdarzeń przy mieszaniu) pominiętych w histogramach mas z powodu max_combinations
+        # (nazwa kombinacji z przyrostkiem histogramu: liczba zdarzeń)
+        self.skipped = {}
+        # Histogramy z rejestru hist_registry.py (nazwa: histogram)
+        self.histograms = {}
+        # Zużycie pamięci po każdym etapie obliczeń (etap: rozmiar danych i maksymalne zużycie pamięci procesu)
+        self.memory = {}
+
+        # Inicjalizacja histogramów mas dla kombinacji z pliku mass_histograms.py (atrybuty mass_<nazwa>,
+        # w przypadku true_data=False są to histogramy z rekonstrukcji)
+        for spec in combinations:
+            setattr(self, f'mass_{spec["name"]}', self._create_mass_histogram(spec))
+            # Histogramy mas kombinacji z różnych zdarzeń
+            if self.mixing_pool is not None:
+                setattr(self, f'mass_{spec["name"]}_mixed', self._create_mass_histogram(spec, '_mixed'))
 
         # Inicjalizacja histogramów zliczeń (w przypadku true_data=False są to histogramy z rekonstrukcji)
-        self.count_pi = ROOT.TH1I('count_pi', '#pi multiplicity;#pi multiplicity;events', 50, 0, 50)
-        self.count_p = ROOT.TH1I('count_p', 'p multiplicity;p multiplicity;events', 20, 0, 20)
-        self.count_K = ROOT.TH1I('count_K', 'K multiplicity;K multiplicity;events', 20, 0, 20)
+        self.count_pi = self._create_count_histogram('count_pi', '#pi multiplicity;#pi multiplicity;events', 50)
+        self.count_p = self._create_count_histogram('count_p', 'p multiplicity;p multiplicity;events', 20)
+        self.count_K = self._create_count_histogram('count_K', 'K multiplicity;K multiplicity;events', 20)
 
         # Kroki wykonywane tylko dla danych z symulacji Monte Carlo
         if not self.true_data:
-            # Wyznaczanie statystyk dla kryteriów na PID
-            self.statistics_PID = self._get_statistics(PID, ['piplus_PIDK', 'piplus_PIDp'])
-            # Wyznaczanie statystyk dla kryteriów dla ProbNN
-            self.statistics_ProbNN = self._get_statistics(ProbNN, ['piplus_ProbNNk', 'piplus_ProbNNp'])
-            # Zapisanie statystyk do pliku .csv
-            self._save_statistics()
-            # Obliczenie wydajności kryteriów na ProbNN oraz ich czystości identyfikacji w zależności od
-            # pędu poprzecznego i pseudopośpieszności i zapisanie ich do plików
-            self.calculate_efficiency_pt_1()
-            self.calculate_efficiency_eta_1()
-            self.calculate_efficiency_pt_2()
-            self.calculate_efficiency_eta_2()
-
-            # Tworzenie histogramów PID z kryteriami PID > 0.1
-            self.pid_K = self._create_histogram_1D(PID, 'pid_K', 'PIDK;PIDK;events')
-            self.pid_p = self._create_histogram_1D(PID, 'pid_p', 'PIDp;PIDp;events')
-            self.pid_K_true = self._create_histogram_1D(PID, 'pid_K_true', 'PIDK if particle is K;PIDK;events')
-            self.pid_p_true = self._create_histogram_1D(PID, 'pid_p_true', 'PIDp if particle is p;PIDp;events')
-            self.pid_K_pi = self._create_histogram_1D(PID, 'pid_K_pi', 'PIDK if particle is pi;PIDK;events')
-            self.pid_p_pi = self._create_histogram_1D(PID, 'pid_p_pi', 'PIDp if particle is pi;PIDp;events')
-
-            # Tworzenie histogramów z ProbNN z kryteriami ProbNN > 0.9
-            self.probnn_K = self._create_histogram_1D(ProbNN, 'probnn_K', 'ProbNNK;ProbNNK;events')
-            self.probnn_p = self._create_histogram_1D(ProbNN, 'probnn_p', 'ProbNNp;ProbNNp;events')
-            self.probnn_K_true = self._create_histogram_1D(ProbNN, 'probnn_K_true',
-                                                           'ProbNNK if particle is K;ProbNNK;events')
-            self.probnn_p_true = self._create_histogram_1D(ProbNN, 'probnn_p_true',
-                                                           'ProbNNp if particle is p;ProbNNp;events')
-            self.probnn_K_pi = self._create_histogram_1D(ProbNN, 'probnn_K_pi',
-                                                         'ProbNNK if particle is pi;ProbNNK;events')
-            self.probnn_p_pi = self._create_histogram_1D(ProbNN, 'probnn_p_pi',
-                                                         'ProbNNp if particle is pi;ProbNNp;events')
-            self.probnn_pi = self._create_histogram_1D(ProbNN, 'probnn_pi', 'ProbNNpi;ProbNNpi;events')
-            self.probnn_pi_true = self._create_histogram_1D(ProbNN, 'probnn_pi_true',
-                                                            'ProbNNpi if particle is pi;ProbNNpi;events')
-            self.probnn_pi_not = self._create_histogram_1D(ProbNN, 'probnn_pi_not',
-                                                           'ProbNNpi if particle is not pi;ProbNNpi;events')
-
-            # Tworzenie 2-wymiarowych histogramów z PID/ProbNN z kryteriami: PID > 0.1, ProbNN > 0.9
-            self.hist_K = self._create_histogram_2D(PID_ProbNN, 'hist_K', 'PIDK/ProbNNK;PIDK;ProbNNK')
-            self.hist_p = self._create_histogram_2D(PID_ProbNN, 'hist_p', 'PIDp/ProbNNp;PIDp;ProbNNp')
-            self.hist_K_true = self._create_histogram_2D(PID_ProbNN, 'hist_K_true',
-                                                         'PIDK/ProbNNK if particle is K;PIDK;ProbNNK')
-            self.hist_p_true = self._create_histogram_2D(PID_ProbNN, 'hist_p_true',
-                                                         'PIDp/ProbNNp if particle is p;PIDp;ProbNNp')
-            self.hist_K_pi = self._create_histogram_2D(PID_ProbNN, 'hist_K_pi',
-                                                       'PIDK/ProbNNK if particle is pi;PIDK;ProbNNK')
-            self.hist_p_pi = self._create_histogram_2D(PID_ProbNN, 'hist_p_pi',
-                                                       'PIDp/ProbNNp if particle is pi;PIDp;ProbNNp')
-
-            # Tworzenie 2-wymiarowych histogramów z PID/ProbNNpi z kryteriami: PID > 0.1
-            self.hist_Kpi = self._create_histogram_2D(PID_ProbNNpi, 'hist_Kpi', 'PIDK/ProbNNpi;PIDK;ProbNNpi')
-            self.hist_ppi = self._create_histogram_2D(PID_ProbNNpi, 'hist_ppi', 'PIDp/ProbNNpi;PIDp;ProbNNpi')
-            self.hist_Kpi_true = self._create_histogram_2D(PID_ProbNNpi, 'hist_Kpi_true',
-                                                           'PIDK/ProbNNpi if particle is K;PIDK;ProbNNpi')
-            self.hist_ppi_true = self._create_histogram_2D(PID_ProbNNpi, 'hist_ppi_true',
-                                                           'PIDp/ProbNNpi if particle is p;PIDp;ProbNNpi')
-            self.hist_Kpi_pi = self._create_histogram_2D(PID_ProbNNpi, 'hist_Kpi_pi',
-                                                         'PIDK/ProbNNpi if particle is pi;PIDK;ProbNNpi')
-            self.hist_ppi_pi = self._create_histogram_2D(PID_ProbNNpi, 'hist_ppi_pi',
-                                                         'PIDp/ProbNNpi if particle is pi;PIDp;ProbNNpi')
-
-            # Tworzenie 2-wymiarowych histogramów ProbNN/p_T z kryteriami: ProbNN > 0.9
-            self.probnnm_K = self._create_histogram_2D(ProbNN_m, 'ProbNNm_K', 'ProbNNK/P_{t};P_{t} [MeV];ProbNNK')
-            self.probnnm_p = self._create_histogram_2D(ProbNN_m, 'ProbNNm_p', 'ProbNNp/P_{t};P_{t} [MeV];ProbNNp')
-            self.probnnm_K_true = self._create_histogram_2D(ProbNN_m, 'ProbNNm_K_true',
-                                                            'ProbNNK/P_{t} if particle is K;P_{t} [MeV];ProbNNK')
-            self.probnnm_p_true = self._create_histogram_2D(ProbNN_m, 'ProbNNm_p_true',
-                                                            'ProbNNp/P_{t} if particle is p;P_{t} [MeV];ProbNNp')
-            self.probnnm_K_pi = self._create_histogram_2D(ProbNN_m, 'ProbNNm_K_pi',
-                                                          'ProbNNK/P_{t} if particle is pi;P_{t} [MeV];ProbNNK')
-            self.probnnm_p_pi = self._create_histogram_2D(ProbNN_m, 'ProbNNm_p_pi',
-                                                          'ProbNNp/P_{t} if particle is pi;P_{t} [MeV];ProbNNp')
-            self.probnnm_pi = self._create_histogram_2D(ProbNN_m, 'probnnm_pi', 'ProbNNpi/P_{t};P_{t} [MeV];ProbNNpi')
-            self.probnnm_pi_true = self._create_histogram_2D(ProbNN_m, 'probnnm_pi_true',
-                                                             'ProbNNpi/P_{t} if particle is pi;P_{t} [MeV];ProbNNpi')
-            self.probnnm_pi_not = self._create_histogram_2D(ProbNN_m, 'probnnm_pi_not',
-                                                            'ProbNNpi/P_{t} if particle is not pi;P_{t} [MeV];ProbNNpi')
-
-            # Tworzenie 2-wymiarowych histogramów ProbNN/eta z kryteriami: ProbNN > 0.9
-            self.probnneta_K = self._create_histogram_2D(ProbNN_eta, 'ProbNNeta_K', 'ProbNNK/#eta;#eta;ProbNNK')
-            self.probnneta_p = self._create_histogram_2D(ProbNN_eta, 'ProbNNeta_p', 'ProbNNp/#eta;#eta;ProbNNp')
-            self.probnneta_K_true = self._create_histogram_2D(ProbNN_eta, 'ProbNNeta_K_true',
-                                                              'ProbNNK/#eta if particle is K;#eta;ProbNNK')
-            self.probnneta_p_true = self._create_histogram_2D(ProbNN_eta, 'ProbNNeta_p_true',
-                                                              'ProbNNp/#eta if particle is p;#eta;ProbNNp')
-            self.probnneta_K_pi = self._create_histogram_2D(ProbNN_eta, 'ProbNNeta_K_pi',
-                                                            'ProbNNK/#eta if particle is #eta;ProbNNK')
-            self.probnneta_p_pi = self._create_histogram_2D(ProbNN_eta, 'ProbNNeta_p_pi',
-                                                            'ProbNNp/#eta if particle is pi;#eta;ProbNNp')
-            self.probnneta_pi = self._create_histogram_2D(ProbNN_eta, 'probnneta_pi', 'ProbNNpi/#eta;#eta;ProbNNpi')
-            self.probnneta_pi_true = self._create_histogram_2D(ProbNN_eta, 'probnneta_pi_true',
-                                                               'ProbNNpi/#eta if particle is pi;#eta;ProbNNpi')
-            self.probnneta_pi_not = self._create_histogram_2D(ProbNN_eta, 'probnneta_pi_not',
-                                                              'ProbNNpi/#eta if particle is not pi;#eta;ProbNNpi')
-
-            # Tworzenie histogramów mas wyznaczonych ze zmiennej TRUEID
-            self.mass_pipi_true = ROOT.TH1F('mass_pipi_true', '#pi#pi mass;m_{#pi#pi} [MeV];events', 100, 250, 1000)
-            self.mass_ppi_true = ROOT.TH1F('mass_ppi_true', 'p#pi mass;m_{p#pi} [MeV];events', 100, 1000, 2500)
-            self.mass_KK_true = ROOT.TH1F('mass_KK_true', 'KK mass;m_{KK} [MeV];events', 100, 950, 1500)
+            # Tworzenie histogramów PID/ProbNN zdefiniowanych w pliku hist_registry.py
+            for spec in histograms:
+                self.histograms[spec["name"]] = self._create_histogram(spec)
+
+            # Tworzenie histogramów mas wyznaczonych ze zmiennej TRUEID (atrybuty mass_<nazwa>_true)
+            for spec in combinations:
+                setattr(self, f'mass_{spec["name"]}_true', self._create_mass_histogram(spec, '_true'))
 
             # Tworzenie histogramów zliczeń wyznaczonych ze zmiennej TRUEID
-            self.count_pi_true = ROOT.TH1I('count_pi_true', '#pi multiplicity;#pi multiplicity;events', 50, 0, 50)
-            self.count_p_true = ROOT.TH1I('count_p_true', 'p multiplicity;p multiplicity;events', 20, 0, 20)
-            self.count_K_true = ROOT.TH1I('count_K_true', 'K multiplicity;K multiplicity;events', 20, 0, 20)
+            self.count_pi_true = self._create_count_histogram('count_pi_true',
+                                                              '#pi multiplicity;#pi multiplicity;events', 50)
+            self.count_p_true = self._create_count_histogram('count_p_true', 'p multiplicity;p multiplicity;events', 20)
+            self.count_K_true = self._create_count_histogram('count_K_true', 'K multiplicity;K multiplicity;events', 20)
+
+        # W trybie strumieniowym i równoległym dane są wczytywane dopiero w fill_all_histograms
+        if self.data_path is None or self.chunk_size is not None or self.workers > 1 or self.state_path is not None:
+            return
+
+        # Otwieranie plików z danymi
+        if true_data:
+            self._create_dataframe_true_data(data_path)
+        else:
+            self._create_dataframe(data_path)
+        # Indeks zdarzeń (cząstki jednego zdarzenia są ułożone obok siebie)
+        self._index_events()
+
+        # Wyznaczanie statystyk i wydajności kryteriów (zapisywane są w fill_all_histograms)
+        self._accumulate()
 
     def __call__(self):
         """
@@ -159,253 +193,530 @@ class Simulation:
         """
         return self.mass_pipi, self.mass_ppi, self.mass_KK
 
+    @timed('read')
     def _create_dataframe(self, directory: str):
         """
         Funkcja wczytująca dane z plików dla danych z symulacji Monte Carlo
         """
-        # Stworzenie obiektu Path z przekazanej ścieżki do danych
-        path = Path(directory)
-        # Stworzenie listy plików .root w katalogu do którego prowadzi ścieżka
-        files = list(path.glob('*.root'))
-        files_to_dataframe = []
-        # Iteracja po plikach
-        for idx, file in enumerate(files):
-            # Żeby dostać się do danych do ścieżki do każdego pliku trzeba dopisać ':minbias;1/DecayTree;1',
-            # ponieważ wewnątrz plików są takie katalogi
-            file_temp = str(file) + ':minbias;1/DecayTree;1'
-            files_to_dataframe.append(file_temp)
-
-        # Wczytujemy wartości wybranych zmiennych ze wszystkich plików do obiektu pd.DataFrame
-        self.data = uproot.concatenate(files_to_dataframe, filter_name=['piplus_TRUEID', 'piplus_ID', 'piplus_TRUEP_E',
-                                                                        'piplus_TRUEP_X', 'piplus_TRUEP_Y',
-                                                                        'piplus_TRUEP_Z',
-                                                                        'piplus_TRUEPT', 'piplus_P', 'piplus_PX',
-                                                                        'piplus_PY',
-                                                                        'piplus_PZ', 'piplus_PT', 'piplus_ETA',
-                                                                        'piplus_PIDK', 'piplus_PIDp', 'piplus_ProbNNk',
-                                                                        'piplus_ProbNNp', 'piplus_ProbNNpi',
-                                                                        'eventNumber',
-                                                                        'piplus_TRACK_GhostProb',
-                                                                        'piplus_TRACK_CHI2NDOF',
-                                                                        'piplus_IPCHI2_OWNPV'],
-                                       library='pd')
+        # Wczytujemy wartości wybranych zmiennych ze wszystkich plików do obiektu pd.DataFrame (z preselekcją)
+        self.data = read_files(root_files(directory), branches_mc, self.cache, self.cuts, self.cutflow,
+                               self._columns(), self.read_ahead, self.decompression_workers, self.jagged)
 
+    @timed('read')
     def _create_dataframe_true_data(self, directory: str):
         """
         Funkcja wczytująca dane z plików dla danych doświadczalnych
         """
-        # Stworzenie obiektu Path z przekazanej ścieżki do danych
-        path = Path(directory)
-        # Stworzenie listy plików .root w katalogu do którego prowadzi ścieżka
-        files = list(path.glob('*.root'))
-        event_files = []
-        # Iteracja po plikach
-        for file in files:
-            # Żeby dostać się do danych do ścieżki do każdego pliku trzeba dopisać ':minbias;1/DecayTree;1',
-            # ponieważ wewnątrz plików są takie katalogi
-            event_files.append(str(file) + ':minbias;1/DecayTree;1')
-
-        # Wczytujemy wartości wybranych zmiennych ze wszystkich plików do obiektu pd.DataFrame
-        self.data = uproot.concatenate(event_files, filter_name=['piplus_ID', 'piplus_P', 'piplus_PX', 'piplus_PY',
-                                                                 'piplus_PZ', 'piplus_PT', 'piplus_ProbNNk',
-                                                                 'piplus_ProbNNp', 'piplus_ProbNNpi', 'eventNumber',
-                                                                 'piplus_TRACK_GhostProb', 'piplus_TRACK_CHI2NDOF',
-                                                                 'piplus_IPCHI2_OWNPV'],
-                                       library='pd')
-
-    def _preselection(self):
-        """
-        Funkcja stosująca na danych kryteria preselekcyjne
-        """
-        # Kryterium na TRUE_ID jest stosowane tylko gdy true_data=False
+        # Wczytujemy wartości wybranych zmiennych ze wszystkich plików do obiektu pd.DataFrame (z preselekcją)
+        self.data = read_files(root_files(directory), branches_true_data, self.cache, self.cuts, self.cutflow,
+                               self._columns(), self.read_ahead, self.decompression_workers, self.jagged)
+
+    def _save_preselection(self):
+        """
+        Funkcja zapisująca do pliku .csv liczbę cząstek odrzuconych przez każde kryterium preselekcyjne
+        """
+        cutflow_DF = pd.DataFrame({'rejected': self.cutflow})
+        suffix = '_true_data' if self.true_data else ''
+        cutflow_DF.to_csv(f'{self.results_path}/statistics/preselection{suffix}.csv', index_label='cut')
+
+    def _save_skipped(self):
+        """
+        Funkcja zapisująca do pliku .csv liczbę zdarzeń pominiętych w histogramach mas z powodu max_combinations
+        i ostrzegająca o histogramach, w których pominięto zdarzenia
+        """
+        skipped_DF = pd.DataFrame({'skipped': self.skipped}, dtype=np.int64)
+        suffix = '_true_data' if self.true_data else ''
+        skipped_DF.to_csv(f'{self.results_path}/statistics/skipped{suffix}.csv', index_label='histogram')
+        for name, count in self.skipped.items():
+            if count:
+                logger.warning("mass_%s: %d events skipped (more than max_combinations=%d combinations)", name,
+                               count, max_combinations)
+
+    @timed('event index')
+    def _index_events(self):
+        """
+        Funkcja tworząca indeks zdarzeń z kluczy (plik, run, zdarzenie) danych z self.data. Jeśli cząstki zdarzeń
+        nie są ułożone obok siebie, dane są raz przestawiane (stabilne sortowanie po kluczach)
+        """
+        if isinstance(self.data, JaggedEvents):
+            # Dane w formacie zdarzeń mają indeks zdarzeń utworzony przy wczytywaniu
+            self.events = self.data.index
+            return
+        self.events = EventIndex.from_data(self.data)
+        if self.events.order is not None:
+            self.data = self.data.take(self.events.order).reset_index(drop=True)
+            self.events.order = None
+
+    def _column(self, key: str) -> np.ndarray:
+        """
+        Funkcja zwracająca wartości zmiennej z self.data jako tablicę numpy (dla pd.DataFrame i jagged.JaggedEvents)
+        """
+        values = self.data[key]
+        return values if isinstance(values, np.ndarray) else values.values
+
+    def _stage_columns(self) -> dict:
+        """
+        Funkcja zwracająca zmienne potrzebne w kolejnych etapach obliczeń (etap: zbiór zmiennych), w kolejności
+        wykonywania etapów
+        """
+        stages = {}
         if not self.true_data:
-            self.data = self.data.drop(self.data[self.data['piplus_TRUEID'] == 0].index)
-        self.data = self.data.drop(self.data[self.data['piplus_P'] > 100000].index)
-        self.data = self.data.drop(self.data[self.data['piplus_PT'] < 100].index)
-        self.data = self.data.drop(self.data[self.data['piplus_TRACK_GhostProb'] > 0.3].index)
-        self.data = self.data.drop(self.data[self.data['piplus_TRACK_CHI2NDOF'] > 3].index)
-        self.data = self.data.drop(self.data[self.data['piplus_IPCHI2_OWNPV'] > 3].index)
+            stages['statistics'] = {'piplus_TRUEID', 'piplus_ID'} | {
+                key for definition in statistics.values() for key, _ in definition["particles"].values()}
+            stages['efficiency'] = {'piplus_TRUEID', 'piplus_ProbNNpi', 'piplus_ProbNNk', 'piplus_ProbNNp'} | {
+                spec["key"] for spec in efficiencies}
+            if self.scan:
+                stages['scans'] = {'piplus_TRUEID'} | {spec["key"] for spec in scans.values()}
+        # Histogramy mas i krotności (zmienne z mass_histograms.py) oraz histogramy z rejestru. Zdarzenia
+        # wyznaczane są z indeksu zdarzeń (self.events), więc numery zdarzeń nie są już potrzebne
+        hist_types = [data_reco] if self.true_data else [data_true, data_reco]
+        columns = {value for hist_type in hist_types for name, value in hist_type.items()
+                   if not name.startswith('cutoff')}
+        if not self.true_data:
+            columns |= {'piplus_TRUEID'} | {key for spec in histograms
+                                            for key in spec["keys"] + spec.get("to_save", [])}
+        stages['histograms'] = columns
+        return stages
+
+    def _columns(self):
+        """
+        Funkcja zwracająca zmienne zostawiane po preselekcji w trybie low_memory (None w zwykłym trybie)
+        """
+        if not self.low_memory:
+            return None
+        return sorted(set().union(*self._stage_columns().values(), EVENT_KEYS))
+
+    def _accumulate(self):
+        """
+        Funkcja wyznaczająca statystyki, liczniki wydajności i liczniki trybu scan z danych w self.data (tylko dla
+        danych z symulacji Monte Carlo). Po każdym etapie zwalniane są zmienne, które nie będą już potrzebne
+        """
+        self._record_memory('read')
+        if self.true_data:
+            return
+        self._accumulate_statistics()
+        self._release('statistics')
+        self._accumulate_efficiency()
+        self._release('efficiency')
+        if self.scan:
+            self._accumulate_scans()
+            self._release('scans')
+
+    def _release(self, stage: str):
+        """
+        Funkcja wywoływana po zakończeniu etapu obliczeń: w trybie low_memory usuwa z danych zmienne, których nie
+        używają dalsze etapy, oraz zapisuje zużycie pamięci
+        """
+        if self.low_memory:
+            stages = list(self._stage_columns())
+            later = stages[stages.index(stage) + 1:]
+            needed = set().union(*(self._stage_columns()[name] for name in later))
+            self.data = self.data.drop(columns=[column for column in self.data.columns if column not in needed])
+        self._record_memory(stage)
+
+    def _record_memory(self, stage: str):
+        """
+        Funkcja zapisująca rozmiar danych po etapie obliczeń (największy ze wszystkich kawałków) oraz maksymalne
+        dotychczasowe zużycie pamięci procesu
+        """
+        data = int(self.data.memory_usage(deep=True).sum())
+        # Na Linuksie ru_maxrss podawane jest w kB
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        previous = self.memory.get(stage, {})
+        self.memory[stage] = {'data': max(data, previous.get('data', 0)),
+                              'peak_rss': max(peak, previous.get('peak_rss', 0))}
+
+    def _save_memory(self):
+        """
+        Funkcja zapisująca do pliku .csv zużycie pamięci po każdym etapie obliczeń (w bajtach)
+        """
+        memory_DF = pd.DataFrame.from_dict(self.memory, orient='index')
+        suffix = '_true_data' if self.true_data else ''
+        memory_DF.to_csv(f'{self.results_path}/statistics/memory{suffix}.csv', index_label='stage')
+
+    def _create_mass_histogram(self, spec: dict, suffix: str = ''):
+        """
+        Funkcja tworząca histogram mas dla kombinacji z pliku mass_histograms.py
+        """
+        name = f'{self.prefix}mass_{spec["name"]}{suffix}'
+        return Histogram(name, spec["title"], [(spec["nBins"], spec["xmin"], spec["xmax"])])
+
+    def _create_count_histogram(self, name: str, title: str, n_bins: int):
+        """
+        Funkcja tworząca histogram krotności (biny o szerokości 1 od 0 do n_bins)
+        """
+        return Histogram(f'{self.prefix}{name}', title, [(n_bins, 0, n_bins)], 'I')
+
+    def _mass_histograms(self, suffix: str = '') -> dict:
+        """
+        Funkcja zwracająca histogramy mas wszystkich kombinacji (nazwa kombinacji: histogram)
+        """
+        return {spec["name"]: getattr(self, f'mass_{spec["name"]}{suffix}') for spec in combinations}
 
     @staticmethod
     def _create_histogram_1D(hist_type: dict, name: str, title: str):
         """
         Funkcja tworząca 1-wymiarowe histogramy. Przekazywany jest typ histogramu zdefiniowany w pliku hist_types.py
         """
-        return ROOT.TH1F(name, title, hist_type["nBins"], hist_type["xmin"], hist_type["xmax"])
+        return Histogram(name, title, [(hist_type["nBins"], hist_type["xmin"], hist_type["xmax"])])
+
+    def _create_histogram(self, spec: dict):
+        """
+        Funkcja tworząca histogram 1D lub 2D (zależnie od liczby zmiennych) na podstawie wpisu z hist_registry.py
+        """
+        if len(spec["keys"]) == 1:
+            return self._create_histogram_1D(spec["type"], f'{self.prefix}{spec["name"]}', spec["title"])
+        return self._create_histogram_2D(spec["type"], f'{self.prefix}{spec["name"]}', spec["title"])
 
     @staticmethod
     def _create_histogram_2D(hist_type: dict, name: str, title: str):
         """
         Funkcja tworząca 2-wymiarowe histogramy. Przekazywany jest typ histogramu zdefiniowany w pliku hist_types.py
         """
-        return ROOT.TH2F(name, title, hist_type["nBins_1"], hist_type["xmin_1"], hist_type["xmax_1"],
-                         hist_type["nBins_2"], hist_type["xmin_2"], hist_type["xmax_2"])
+        return Histogram(name, title, [(hist_type["nBins_1"], hist_type["xmin_1"], hist_type["xmax_1"]),
+                                       (hist_type["nBins_2"], hist_type["xmin_2"], hist_type["xmax_2"])])
 
     def fill_all_histograms(self):
         """
-        Funkcja wypełniająca histogramy
+        Funkcja wypełniająca histogramy. W trybie strumieniowym (chunk_size) wczytuje dane kawałek po kawałku,
+        stosuje preselekcję, wypełnia histogramy i sumuje statystyki oraz liczniki wydajności. W trybie równoległym
+        (workers > 1) robi to samo dla każdego pliku w osobnym procesie. Na końcu zapisuje statystyki i wykresy
+        wydajności
+        """
+        if self.state_path is not None:
+            self._process_incremental()
+        elif self.workers > 1:
+            self._process_parallel()
+        else:
+            self._process()
+
+        # Zapisanie liczby cząstek odrzuconych w preselekcji, zdarzeń pominiętych w histogramach mas i zużycia
+        # pamięci
+        self._save_preselection()
+        self._save_skipped()
+        self._save_memory()
+        # Kroki wykonywane tylko dla danych z symulacji Monte Carlo
+        if not self.true_data:
+            # Zapisanie statystyk do pliku .csv
+            self._save_statistics()
+            # Zapisanie wykresów wydajności kryteriów na ProbNN oraz ich czystości identyfikacji w zależności od
+            # pędu poprzecznego i pseudopośpieszności
+            self.save_efficiency()
+            # Zapisanie tabel i krzywych ROC z trybu scan
+            if self.scan:
+                self.save_scans()
+        # Zapisanie wszystkich histogramów i liczników do jednego pliku (.root, a bez ROOT - .pkl)
+        self.save_results()
+        # Zapisanie wyników pomiaru czasu etapów obliczeń
+        self._save_timing()
+
+    def _process(self):
+        """
+        Funkcja przetwarzająca dane w bieżącym procesie (bez zapisywania wyników)
+        """
+        if self.chunk_size is None:
+            self._fill_histograms()
+            self._release('histograms')
+            return
+
+        branches = branches_true_data if self.true_data else branches_mc
+        chunks = iterate_events(root_files(self.data_path), branches, self.chunk_size, self.cache, self.cuts,
+                                self.cutflow, self._columns(), self.read_ahead, self.decompression_workers,
+                                self.jagged)
+        if self.instrumentation is not None:
+            chunks = self.instrumentation.iterate('read', chunks)
+        for chunk in chunks:
+            self.data = chunk
+            self._index_events()
+            self._accumulate()
+            self._fill_histograms()
+            self._release('histograms')
+        # Zwolnienie pamięci zajmowanej przez ostatni kawałek
+        self.data = pd.DataFrame([])
+
+    def _process_parallel(self):
+        """
+        Funkcja przetwarzająca każdy plik w osobnym procesie i łącząca częściowe wyniki
+        """
+        files = root_files(self.data_path)
+        # Największe pliki są przetwarzane jako pierwsze, żeby procesy kończyły pracę w podobnym czasie
+        files = sorted((file[:-len(TREE)] for file in files), key=lambda file: Path(file).stat().st_size,
+                       reverse=True)
+        settings = self._worker_settings()
+        # Procesy są tworzone przez 'spawn', ponieważ ROOT nie działa poprawnie po fork
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            futures = [pool.submit(_fill_partial, [file], settings) for file in files]
+            for future in as_completed(futures):
+                self._merge(future.result())
+
+    def _worker_settings(self) -> dict:
+        """
+        Funkcja zwracająca argumenty konstruktora Simulation dla procesów roboczych (ustawienia tego obiektu bez
+        ścieżki do danych, przetwarzania równoległego i trybu przyrostowego)
+        """
+        return {
+            'results_path': self.results_path,
+            'true_data': self.true_data,
+            'chunk_size': self.chunk_size,
+            'cache_path': self.cache_path,
+            'cache_size': self.cache_size,
+            'cuts': self.cuts,
+            'scan': self.scan,
+            'mixing': self.mixing_pool is not None,
+            'profile': self.instrumentation is not None,
+            'read_ahead': self.read_ahead,
+            'decompression_workers': self.decompression_workers,
+            'jagged': self.jagged,
+            'low_memory': self.low_memory,
+        }
+
+    def _process_incremental(self):
+        """
+        Funkcja przetwarzająca tylko pliki nowe lub zmienione od poprzedniego uruchomienia (według spisu
+        w katalogu state_path). Wyniki są sumą z poprzedniego uruchomienia, z której odejmowane są częściowe wyniki
+        plików zmienionych lub usuniętych i do której dodawane są częściowe wyniki przetworzonych plików. Jeśli
+        sumy nie ma lub nie zgadza się ze spisem, sumowane są częściowe wyniki wszystkich plików ze spisu
+        """
+        settings = {'true_data': self.true_data, 'cuts': self.cuts, 'scan': self.scan,
+                    'mixing': self.mixing_pool is not None}
+        manifest = Manifest(self.state_path, settings)
+        files = [file[:-len(TREE)] for file in root_files(self.data_path)]
+        pending = manifest.pending(files)
+        # Odjęcie od sumy wyników plików zmienionych lub usuniętych (przed nadpisaniem ich częściowych wyników)
+        total = self._load_total(manifest, pending)
+        tasks = [(file, manifest.partial_path(file), self._worker_settings()) for file in pending]
+
+        if self.workers > 1 and len(tasks) > 1:
+            # Procesy są tworzone przez 'spawn', ponieważ ROOT nie działa poprawnie po fork
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+                futures = {pool.submit(_save_partial, *task): task[0] for task in tasks}
+                for future in as_completed(futures):
+                    self._merge_usage(future.result())
+                    manifest.record(futures[future])
+        else:
+            for task in tasks:
+                self._merge_usage(_save_partial(*task))
+                manifest.record(task[0])
+        manifest.save()
+
+        if total:
+            # Suma obejmuje pozostałe pliki ze spisu - dodawane są tylko częściowe wyniki przetworzonych plików
+            partials = [manifest.partial_path(file) for file in pending]
+        else:
+            # Sumowanie częściowych wyników wszystkich plików (bez wczytywania danych)
+            partials = manifest.partials()
+        for path in partials:
+            self._merge(read_pickle(path))
+        manifest.save_total(self._partial_results(usage=False))
+
+    def _load_total(self, manifest: Manifest, pending: list[str]) -> bool:
+        """
+        Funkcja dodająca do wyników sumę z poprzedniego uruchomienia bez wyników plików zmienionych (pending)
+        i usuniętych od tamtej pory
+
+        :return: False, jeśli sumy nie ma lub nie zgadza się ze spisem (trzeba ją obliczyć od nowa)
+        """
+        saved = manifest.load_total()
+        if saved is None:
+            return False
+        files, results = saved
+        changed = {str(Path(file).resolve()) for file in pending}
+        stale = [path for path in files if path not in manifest.entries or path in changed]
+        if any(not Path(manifest.partial_path(path)).exists() for path in stale):
+            return False
+        remaining = {path: value for path, value in files.items() if path not in stale}
+        # Pozostałe pliki muszą być w spisie z takimi samymi sumami kontrolnymi, a pliki ze spisu spoza sumy muszą
+        # być przetwarzane w tym uruchomieniu
+        expected = {path: entry['checksum'] for path, entry in manifest.entries.items() if path not in changed}
+        if remaining != expected:
+            return False
+        self._merge(results)
+        for path in stale:
+            self._merge(read_pickle(manifest.partial_path(path)), sign=-1)
+        return True
+
+    def _histograms(self) -> dict:
+        """
+        Funkcja zwracająca słownik wszystkich histogramów obiektu (nazwa atrybutu: histogram)
+        """
+        attributes = {name: value for name, value in vars(self).items() if isinstance(value, Histogram)}
+        return {**attributes, **self.histograms}
+
+    def _partial_results(self, usage: bool = True) -> dict:
+        """
+        Funkcja zwracająca częściowe wyniki (histogramy, statystyki i liczniki wydajności) do połączenia
+        w procesie głównym
+
+        :param usage: Jeśli False, bez zużycia pamięci i wyników pomiaru czasu (wyniki zapisywane w trybie
+            przyrostowym)
+        """
+        results = {
+            'histograms': self._histograms(),
+            'statistics': self.statistics,
+            'efficiency': self.efficiency,
+            'cutflow': self.cutflow,
+            'scans': self.scans,
+            'skipped': self.skipped,
+        }
+        if usage:
+            results['memory'] = self.memory
+            results['timing'] = self.instrumentation.records if self.instrumentation is not None else {}
+        return results
+
+    def _merge(self, partial: dict, sign: int = 1):
+        """
+        Funkcja dodająca częściowe wyniki z innego procesu do wyników tego obiektu
+
+        :param sign: -1 - odjęcie częściowych wyników dodanych wcześniej (np. pliku zmienionego od poprzedniego
+            uruchomienia w trybie przyrostowym). Histogramy i liczniki zawierają liczby całkowite, więc odjęcie jest
+            dokładne
+        """
+        histograms = self._histograms()
+        for name, hist in partial['histograms'].items():
+            histograms[name].add(hist, sign)
+        for name, values in partial['statistics'].items():
+            self.statistics[name] = self._add_statistics(self.statistics.get(name, {}),
+                                                         {key: sign * value for key, value in values.items()})
+        self.cutflow = self._add_statistics(self.cutflow,
+                                            {key: sign * value for key, value in partial['cutflow'].items()})
+        for name, counters in partial['efficiency'].items():
+            merged = self.efficiency.setdefault(name, {})
+            for particle, values in counters.items():
+                merged[particle] = merged.get(particle, 0) + sign * values
+        for name, counts in partial['scans'].items():
+            self.scans[name] = self.scans.get(name, 0) + sign * counts
+        self.skipped = self._add_statistics(self.skipped,
+                                            {key: sign * value for key, value in partial.get('skipped', {}).items()})
+        self._merge_usage(partial)
+
+    def _merge_usage(self, partial: dict):
+        """
+        Funkcja dodająca zużycie pamięci i wyniki pomiaru czasu z innego procesu
+        """
+        # Zużycie pamięci: największe ze wszystkich procesów
+        for stage, usage in partial.get('memory', {}).items():
+            previous = self.memory.get(stage, {})
+            self.memory[stage] = {key: max(value, previous.get(key, 0)) for key, value in usage.items()}
+        self._merge_timing(partial.get('timing', {}))
+
+    def _merge_timing(self, records: dict):
+        """
+        Funkcja dodająca wyniki pomiaru czasu z innego procesu (tylko gdy pomiar jest włączony)
+        """
+        if self.instrumentation is not None and records:
+            self.instrumentation.merge(records)
+
+    def _save_timing(self):
+        """
+        Funkcja zapisująca wyniki pomiaru czasu etapów obliczeń do plików statistics/timing.json
+        i statistics/timing.csv (tylko gdy pomiar jest włączony)
+        """
+        if self.instrumentation is None:
+            return
+        suffix = '_true_data' if self.true_data else ''
+        self.instrumentation.write(f'{self.results_path}/statistics/timing{suffix}')
+
+    def _fill_histograms(self):
+        """
+        Funkcja wypełniająca histogramy danymi znajdującymi się aktualnie w self.data
         """
         # Wypełnianie histogramów mas
         if self.true_data:
             # mass/count
-            self.create_mass_histogram(data_reco, [self.mass_pipi, self.mass_ppi, self.mass_KK],
-                                       [self.count_pi, self.count_p, self.count_K])
+            self.create_count_histogram(data_reco, [self.count_pi, self.count_p, self.count_K])
+            self.create_mass_histogram(data_reco, self._mass_histograms())
         else:
             # mass/count
-            self.create_mass_histogram(data_true, [self.mass_pipi_true, self.mass_ppi_true, self.mass_KK_true],
-                                       [self.count_pi_true, self.count_p_true, self.count_K_true])
-            self.create_mass_histogram(data_reco, [self.mass_pipi, self.mass_ppi, self.mass_KK],
-                                       [self.count_pi, self.count_p, self.count_K])
-
-            # Wypełnianie histogramów PID
-            self._fill_histogram_1D(self.pid_K_true, PID, 'piplus_PIDK', 321)
-            self._fill_histogram_1D(self.pid_K_pi, PID, 'piplus_PIDK', 211)
-            self._fill_histogram_1D(self.pid_K, PID, 'piplus_PIDK')
-            self._fill_histogram_1D(self.pid_p_true, PID, 'piplus_PIDp', 2212)
-            self._fill_histogram_1D(self.pid_p_pi, PID, 'piplus_PIDp', 211)
-            self._fill_histogram_1D(self.pid_p, PID, 'piplus_PIDK')
-
-            # Wypełnianie histogramów ProbNN
-            self._fill_histogram_1D(self.probnn_K_true, ProbNN, 'piplus_ProbNNk', 321)
-            self._fill_histogram_1D(self.probnn_K_pi, ProbNN, 'piplus_ProbNNk', 211)
-            self._fill_histogram_1D(self.probnn_K, ProbNN, 'piplus_ProbNNk')
-            self._fill_histogram_1D(self.probnn_p_true, ProbNN, 'piplus_ProbNNp', 2212)
-            self._fill_histogram_1D(self.probnn_p_pi, ProbNN, 'piplus_ProbNNp', 211)
-            self._fill_histogram_1D(self.probnn_p, ProbNN, 'piplus_ProbNNp')
-            self._fill_histogram_1D(self.probnn_pi, ProbNN, 'piplus_ProbNNpi')
-            self._fill_histogram_1D(self.probnn_pi_true, ProbNN, 'piplus_ProbNNpi', 211)
-            self._fill_histogram_1D(self.probnn_pi_not, ProbNN, 'piplus_ProbNNpi', -211)
-
-            # Wypełnianie histogramów PID/ProbNN
-            self._fill_histogram_2D(self.hist_K_true, PID_ProbNN, ['piplus_PIDK', 'piplus_ProbNNk'], 321)
-            self._fill_histogram_2D(self.hist_K_pi, PID_ProbNN, ['piplus_PIDK', 'piplus_ProbNNk'], 211)
-            self._fill_histogram_2D(self.hist_K, PID_ProbNN, ['piplus_PIDK', 'piplus_ProbNNk'])
-            self._fill_histogram_2D(self.hist_p_true, PID_ProbNN, ['piplus_PIDp', 'piplus_ProbNNp'], 2212)
-            self._fill_histogram_2D(self.hist_p_pi, PID_ProbNN, ['piplus_PIDp', 'piplus_ProbNNp'], 211)
-            self._fill_histogram_2D(self.hist_p, PID_ProbNN, ['piplus_PIDp', 'piplus_ProbNNp'])
-
-            # Wypełnianie histogramów PID/ProbNNpi
-            self._fill_histogram_2D(self.hist_Kpi_true, PID_ProbNNpi, ['piplus_PIDK', 'piplus_ProbNNk'], 321,
-                                    ['piplus_PIDK', 'piplus_ProbNNpi'])
-            self._fill_histogram_2D(self.hist_Kpi_pi, PID_ProbNNpi, ['piplus_PIDK', 'piplus_ProbNNk'], 211,
-                                    ['piplus_PIDK', 'piplus_ProbNNpi'])
-            self._fill_histogram_2D(self.hist_Kpi, PID_ProbNNpi, ['piplus_PIDK', 'piplus_ProbNNk'],
-                                    to_save=['piplus_PIDK', 'piplus_ProbNNpi'])
-            self._fill_histogram_2D(self.hist_ppi_true, PID_ProbNNpi, ['piplus_PIDp', 'piplus_ProbNNp'], 2212,
-                                    ['piplus_PIDp', 'piplus_ProbNNpi'])
-            self._fill_histogram_2D(self.hist_ppi_pi, PID_ProbNNpi, ['piplus_PIDp', 'piplus_ProbNNp'], 211,
-                                    to_save=['piplus_PIDp', 'piplus_ProbNNpi'])
-            self._fill_histogram_2D(self.hist_ppi, PID_ProbNNpi, ['piplus_PIDp', 'piplus_ProbNNp'],
-                                    to_save=['piplus_PIDp', 'piplus_ProbNNpi'])
-
-            # Wypełnianie histogramów ProbNN/pęd poprzeczny
-            self._fill_histogram_2D(self.probnnm_K_true, ProbNN_m, ['piplus_TRUEPT', 'piplus_ProbNNk'], 321)
-            self._fill_histogram_2D(self.probnnm_K_pi, ProbNN_m, ['piplus_TRUEPT', 'piplus_ProbNNk'], 211)
-            self._fill_histogram_2D(self.probnnm_K, ProbNN_m, ['piplus_TRUEPT', 'piplus_ProbNNk'])
-            self._fill_histogram_2D(self.probnnm_p_true, ProbNN_m, ['piplus_TRUEPT', 'piplus_ProbNNp'], 2212)
-            self._fill_histogram_2D(self.probnnm_p_pi, ProbNN_m, ['piplus_TRUEPT', 'piplus_ProbNNp'], 211)
-            self._fill_histogram_2D(self.probnnm_p, ProbNN_m, ['piplus_TRUEPT', 'piplus_ProbNNp'])
-            self._fill_histogram_2D(self.probnnm_pi_true, ProbNN_m, ['piplus_TRUEPT', 'piplus_ProbNNpi'], 211)
-            self._fill_histogram_2D(self.probnnm_pi_not, ProbNN_m, ['piplus_TRUEPT', 'piplus_ProbNNpi'], -211)
-            self._fill_histogram_2D(self.probnnm_pi, ProbNN_m, ['piplus_TRUEPT', 'piplus_ProbNNpi'])
-
-            # Wypełnianie histogramów ProbNN/pseudopośpieszność
-            self._fill_histogram_2D(self.probnneta_K_true, ProbNN_eta, ['piplus_ETA', 'piplus_ProbNNk'], 321)
-            self._fill_histogram_2D(self.probnneta_K_pi, ProbNN_eta, ['piplus_ETA', 'piplus_ProbNNk'], 211)
-            self._fill_histogram_2D(self.probnneta_K, ProbNN_eta, ['piplus_ETA', 'piplus_ProbNNk'])
-            self._fill_histogram_2D(self.probnneta_p_true, ProbNN_eta, ['piplus_ETA', 'piplus_ProbNNp'], 2212)
-            self._fill_histogram_2D(self.probnneta_p_pi, ProbNN_eta, ['piplus_ETA', 'piplus_ProbNNp'], 211)
-            self._fill_histogram_2D(self.probnneta_p, ProbNN_eta, ['piplus_ETA', 'piplus_ProbNNp'])
-            self._fill_histogram_2D(self.probnneta_pi_true, ProbNN_eta, ['piplus_ETA', 'piplus_ProbNNpi'], 211)
-            self._fill_histogram_2D(self.probnneta_pi_not, ProbNN_eta, ['piplus_ETA', 'piplus_ProbNNpi'], -211)
-            self._fill_histogram_2D(self.probnneta_pi, ProbNN_eta, ['piplus_ETA', 'piplus_ProbNNpi'])
-
-    def _fill_histogram_1D(self, hist: ROOT.TH1F, hist_type: dict, key: str, true_id: int = 0,
-                           to_save: str = None):
-        """
-        Funkcja wypełniająca histogramy 1D
-
-        :param hist: Histogram do wypełnienia
-        :param hist_type: Typ histogramu z pliku hist_types.py
-        :param key: Nazwa zmiennej na którą nałożone jest kryterium selekcji
-        :param true_id: Warunek na TRUEID:
-            1. Jeśli większe od 0, to cząstki na histogramie muszą być cząstką określoną przez podany numer
-            2. Jeśli równe 0, to brak warunku na TRUEID
-            3. Jeśli mniejsze od 0, to cząstki na histogramie mogą być dowolną cząstką, oprócz tej określonej przez
-                moduł podanego numeru
-        :param to_save: Nazwa zmiennej, którą zostanie wypełniony histogram (domyślnie zmienna przekazana przez key)
-        """
-
-        # Jeśli nie została przekazana zmienna którą ma być wypełniony histogram to jest nią ta przekazana jako key
-        if to_save is None:
-            to_save = key
-
-        # Definiowanie warunków na wartości które mają wypełnić histogram
-        if true_id == 0:
-            condition = self.data[key] > hist_type['cutoff']
-        elif true_id > 0:
-            condition = (self.data[key] > hist_type['cutoff']) & (abs(self.data['piplus_TRUEID']) == true_id)
-        else:
-            condition = (self.data[key] > hist_type['cutoff']) & (abs(self.data['piplus_TRUEID']) != -true_id)
-
-        # Wyciągnięcie z danych szukanych wartości (w miejsce odrzuconych cząstek pojawia się NaN)
-        values = np.where(condition, self.data[to_save], np.NaN)
-        # Odrzucenie wartości NaN z szukanych wartości
-        values = values[~np.isnan(values)]
-        # Wypełnienie histogramu szukanymi wartościami
-        hist.FillN(values.size, values, np.ones(shape=values.size))
-
-    def _fill_histogram_2D(self, hist: ROOT.TH2F, hist_type: dict, keys: list[str],
-                           true_id: int = 0, to_save: list[str] = None):
-        """
-        Funkcja wypełniająca histogramy 2D
-
-        :param hist: Histogram do wypełnienia
-        :param hist_type: Typ histogramu z pliku hist_types.py
-        :param keys: Nazwy zmiennych na którą nałożone są kryteria selekcji
-        :param true_id: Warunek na TRUEID:
-            1. Jeśli większe od 0, to cząstki na histogramie muszą być cząstką określoną przez podany numer
-            2. Jeśli równe 0, to brak warunku na TRUEID
-            3. Jeśli mniejsze od 0, to cząstki na histogramie mogą być dowolną cząstką, oprócz tej określonej przez
-                moduł podanego numeru
-        :param to_save: Nazwy zmiennych, którymi zostanie wypełniony histogram
-            (domyślnie zmienne przekazane przez keys)
-        """
-        # Jeśli nie zostały przekazane zmienne którymi ma być wypełniony histogram to są nimi te przekazane jako keys
-        if to_save is None:
-            to_save = keys
-
-        # Definiowanie warunków na wartości które mają wypełnić histogram
-        if true_id == 0:
-            condition = (self.data[keys[0]] > hist_type['cutoff_1']) & (self.data[keys[1]] > hist_type['cutoff_2'])
-        elif true_id > 0:
-            condition = (self.data[keys[0]] > hist_type['cutoff_1']) & (self.data[keys[1]] > hist_type['cutoff_2']) & (
-                    abs(self.data['piplus_TRUEID']) == true_id)
-        else:
-            condition = (self.data[keys[0]] > hist_type['cutoff_1']) & (self.data[keys[1]] > hist_type['cutoff_2']) & (
-                    abs(self.data['piplus_TRUEID']) != -true_id)
-        # Wyciągnięcie z danych szukanych wartości 1 zmiennej (w miejsce odrzuconych cząstek pojawia się NaN)
-        values_1 = np.where(condition, self.data[to_save[0]], np.NaN)
-        # Odrzucenie wartości NaN z szukanych wartości
-        values_1 = values_1[~np.isnan(values_1)]
-        # Wyciągnięcie z danych szukanych wartości 2 zmiennej (w miejsce odrzuconych cząstek pojawia się NaN)
-        values_2 = np.where(condition, self.data[to_save[1]], np.NaN)
-        # Odrzucenie wartości NaN z szukanych wartości
-        values_2 = values_2[~np.isnan(values_2)]
-        # Wypełnienie histogramu szukanymi wartościami
-        hist.FillN(values_1.size, values_1, values_2, np.ones(shape=values_1.size))
+            self.create_count_histogram(data_true, [self.count_pi_true, self.count_p_true, self.count_K_true])
+            self.create_mass_histogram(data_true, self._mass_histograms('_true'))
+            self.create_count_histogram(data_reco, [self.count_pi, self.count_p, self.count_K])
+            self.create_mass_histogram(data_reco, self._mass_histograms())
+
+            # Wypełnianie histogramów PID/ProbNN z rejestru
+            self._fill_registered_histograms()
+
+    @timed('registry histograms')
+    def _fill_registered_histograms(self):
+        """
+        Funkcja wypełniająca wszystkie histogramy z rejestru (hist_registry.py) w jednym przejściu. Każda maska
+        i każda kolumna danych jest obliczana tylko raz i wykorzystywana przez wszystkie histogramy
+        """
+        # Obliczone wcześniej kolumny danych i maski
+        columns = {}
+        masks = {}
+
+        def column(key: str) -> np.ndarray:
+            if key not in columns:
+                columns[key] = np.asarray(self._column(key), dtype=np.float64)
+            return columns[key]
+
+        def cut_mask(key: str, cutoff: float) -> np.ndarray:
+            # Warunek: zmienna > kryterium selekcji
+            if (key, cutoff) not in masks:
+                masks[(key, cutoff)] = column(key) > cutoff
+            return masks[(key, cutoff)]
+
+        def true_id_mask(true_id: int) -> np.ndarray:
+            # Warunek na TRUEID (patrz opis true_id w hist_registry.py)
+            if true_id not in masks:
+                if 'abs_TRUEID' not in columns:
+                    columns['abs_TRUEID'] = np.abs(self._column('piplus_TRUEID'))
+                if true_id > 0:
+                    masks[true_id] = columns['abs_TRUEID'] == true_id
+                else:
+                    masks[true_id] = columns['abs_TRUEID'] != -true_id
+            return masks[true_id]
+
+        for spec in histograms:
+            hist_type = spec["type"]
+            true_id = spec.get("true_id", 0)
+            to_save = spec.get("to_save", spec["keys"])
+            if len(spec["keys"]) == 1:
+                cuts = ((spec["keys"][0], hist_type["cutoff"]),)
+            else:
+                cuts = ((spec["keys"][0], hist_type["cutoff_1"]), (spec["keys"][1], hist_type["cutoff_2"]))
+
+            # Wspólna maska wszystkich warunków (obliczana raz dla każdego zestawu warunków)
+            selection = (cuts, true_id)
+            if selection not in masks:
+                condition = cut_mask(*cuts[0])
+                for cut in cuts[1:]:
+                    condition = condition & cut_mask(*cut)
+                if true_id != 0:
+                    condition = condition & true_id_mask(true_id)
+                masks[selection] = condition
+            condition = masks[selection]
+
+            # Wypełnienie histogramu szukanymi wartościami
+            hist = self.histograms[spec["name"]]
+            values = [column(key)[condition] for key in to_save]
+            hist.fill(*values)
 
     def save_all_histograms(self):
         """
         Funkcja zapisująca wszytskie histogramy do plików
         """
+        self._submit_all_histograms()
+        # Ponowne zapisanie wyników pomiaru czasu (razem z czasem zapisywania histogramów)
+        self._save_timing()
+
+    @timed('rendering')
+    def _submit_all_histograms(self):
+        """
+        Funkcja przekazująca wszystkie histogramy do zapisania (self.renderer)
+        """
 
         # Zapisywanie histogramów dla danych doświadczalnych
         if self.true_data:
             # Zapisywanie histogramów mas i krotności
-            self._save_histogram(self.mass_pipi, f'{self.results_path}/mass_histograms_true_data/pipi_mass.png')
-            self._save_histogram(self.mass_ppi, f'{self.results_path}/mass_histograms_true_data/ppi_mass.png')
-            self._save_histogram(self.mass_KK, f'{self.results_path}/mass_histograms_true_data/KK_mass.png')
+            for name, hist in self._mass_histograms().items():
+                self._save_histogram(hist, f'{self.results_path}/mass_histograms_true_data/{name}_mass.png')
+            if self.mixing_pool is not None:
+                for name, hist in self.background_histograms().items():
+                    self._save_histogram(hist,
+                                         f'{self.results_path}/mass_histograms_true_data/{name}_mass_background.png')
             self._save_histogram(self.count_pi, f'{self.results_path}/count_histograms_true_data/pi_count.png')
             self._save_histogram(self.count_p, f'{self.results_path}/count_histograms_true_data/p_count.png')
             self._save_histogram(self.count_K, f'{self.results_path}/count_histograms_true_data/K_count.png')
@@ -413,796 +724,483 @@ class Simulation:
         # Zapisywanie histogramów dla danych symulacyjnych
         else:
             # Zapisywanie histogramów mas i krotności ze zmiennej TRUEID
-            self._save_histogram(self.mass_pipi_true, f'{self.results_path}/mass_histograms/pipi_mass_true.png')
-            self._save_histogram(self.mass_ppi_true, f'{self.results_path}/mass_histograms/ppi_mass_true.png')
-            self._save_histogram(self.mass_KK_true, f'{self.results_path}/mass_histograms/KK_mass_true.png')
+            for name, hist in self._mass_histograms('_true').items():
+                self._save_histogram(hist, f'{self.results_path}/mass_histograms/{name}_mass_true.png')
             self._save_histogram(self.count_pi_true, f'{self.results_path}/count_histograms/pi_count_true.png')
             self._save_histogram(self.count_p_true, f'{self.results_path}/count_histograms/p_count_true.png')
             self._save_histogram(self.count_K_true, f'{self.results_path}/count_histograms/K_count_true.png')
 
             # Zapisywanie histogramów mas i krotności z rekonstrukcji
-            self._save_histogram(self.mass_pipi, f'{self.results_path}/mass_histograms/pipi_mass_reco.png')
-            self._save_histogram(self.mass_ppi, f'{self.results_path}/mass_histograms/ppi_mass_reco.png')
-            self._save_histogram(self.mass_KK, f'{self.results_path}/mass_histograms/KK_mass_reco.png')
+            for name, hist in self._mass_histograms().items():
+                self._save_histogram(hist, f'{self.results_path}/mass_histograms/{name}_mass_reco.png')
+            if self.mixing_pool is not None:
+                for name, hist in self.background_histograms().items():
+                    self._save_histogram(hist, f'{self.results_path}/mass_histograms/{name}_mass_background.png')
             self._save_histogram(self.count_pi, f'{self.results_path}/count_histograms/pi_count_reco.png')
             self._save_histogram(self.count_p, f'{self.results_path}/count_histograms/p_count_reco.png')
             self._save_histogram(self.count_K, f'{self.results_path}/count_histograms/K_count_reco.png')
 
-            # Zapisywanie histogramów PID
-            self._save_histogram(self.pid_K_true, f"{self.results_path}/PID/pid_K_true.png")
-            self._save_histogram(self.pid_p_true, f"{self.results_path}/PID/pid_p_true.png")
-            self._save_histogram(self.pid_K_pi, f"{self.results_path}/PID/pid_K_pi.png")
-            self._save_histogram(self.pid_p_pi, f"{self.results_path}/PID/pid_p_pi.png")
-            self._save_histogram(self.pid_K, f"{self.results_path}/PID/pid_K.png")
-            self._save_histogram(self.pid_p, f"{self.results_path}/PID/pid_p.png")
-
-            # Zapisywanie histogramów ProbNN
-            self._save_histogram(self.probnn_K_true, f"{self.results_path}/ProbNN/probnn_K_true.png")
-            self._save_histogram(self.probnn_p_true, f"{self.results_path}/ProbNN/probnn_p_true.png")
-            self._save_histogram(self.probnn_K_pi, f"{self.results_path}/ProbNN/probnn_K_pi.png")
-            self._save_histogram(self.probnn_p_pi, f"{self.results_path}/ProbNN/probnn_p_pi.png")
-            self._save_histogram(self.probnn_K, f"{self.results_path}/ProbNN/probnn_K.png")
-            self._save_histogram(self.probnn_p, f"{self.results_path}/ProbNN/probnn_p.png")
-            self._save_histogram(self.probnn_pi, f"{self.results_path}/ProbNN/probnn_pi.png")
-            self._save_histogram(self.probnn_pi_true, f"{self.results_path}/ProbNN/probnn_pi_true.png")
-            self._save_histogram(self.probnn_pi_not, f"{self.results_path}/ProbNN/probnn_pi_not.png")
-
-            # Zapisywanie histogramów PID/ProbNN
-            self._save_histogram(self.hist_K_true, f"{self.results_path}/PID_ProbNN/hist_K_true.png", True)
-            self._save_histogram(self.hist_p_true, f"{self.results_path}/PID_ProbNN/hist_p_true.png", True)
-            self._save_histogram(self.hist_K_pi, f"{self.results_path}/PID_ProbNN/hist_K_pi.png", True)
-            self._save_histogram(self.hist_p_pi, f"{self.results_path}/PID_ProbNN/hist_p_pi.png", True)
-            self._save_histogram(self.hist_K, f"{self.results_path}/PID_ProbNN/hist_K.png", True)
-            self._save_histogram(self.hist_p, f"{self.results_path}/PID_ProbNN/hist_p.png", True)
-
-            # Zapisywanie histogramów PID/ProbNNpi
-            self._save_histogram(self.hist_Kpi_true, f"{self.results_path}/PID_ProbNNpi/hist_Kpi_true.png", True)
-            self._save_histogram(self.hist_ppi_true, f"{self.results_path}/PID_ProbNNpi/hist_ppi_true.png", True)
-            self._save_histogram(self.hist_Kpi_pi, f"{self.results_path}/PID_ProbNNpi/hist_Kpi_pi.png", True)
-            self._save_histogram(self.hist_ppi_pi, f"{self.results_path}/PID_ProbNNpi/hist_ppi_pi.png", True)
-            self._save_histogram(self.hist_Kpi, f"{self.results_path}/PID_ProbNNpi/hist_Kpi.png", True)
-            self._save_histogram(self.hist_ppi, f"{self.results_path}/PID_ProbNNpi/hist_ppi.png", True)
-
-            # Zapisywanie histogramów ProbNN/pęd poprzeczny
-            self._save_histogram(self.probnnm_K_true, f"{self.results_path}/ProbNN_m/probnnm_K_true.png", True)
-            self._save_histogram(self.probnnm_p_true, f"{self.results_path}/ProbNN_m/probnnm_p_true.png", True)
-            self._save_histogram(self.probnnm_K_pi, f"{self.results_path}/ProbNN_m/probnnm_K_pi.png", True)
-            self._save_histogram(self.probnnm_p_pi, f"{self.results_path}/ProbNN_m/probnnm_p_pi.png", True)
-            self._save_histogram(self.probnnm_K, f"{self.results_path}/ProbNN_m/probnnm_K.png", True)
-            self._save_histogram(self.probnnm_p, f"{self.results_path}/ProbNN_m/probnnm_p.png", True)
-            self._save_histogram(self.probnnm_pi, f"{self.results_path}/ProbNN_m/probnnm_pi.png", True)
-            self._save_histogram(self.probnnm_pi_true, f"{self.results_path}/ProbNN_m/probnnm_pi_true.png", True)
-            self._save_histogram(self.probnnm_pi_not, f"{self.results_path}/ProbNN_m/probnnm_pi_not.png", True)
-
-            # # Zapisywanie histogramów ProbNN/pseudopośpieszność
-            self._save_histogram(self.probnneta_K_true, f"{self.results_path}/ProbNN_eta/probnneta_K_true.png", True)
-            self._save_histogram(self.probnneta_p_true, f"{self.results_path}/ProbNN_eta/probnneta_p_true.png", True)
-            self._save_histogram(self.probnneta_K_pi, f"{self.results_path}/ProbNN_eta/probnneta_K_pi.png", True)
-            self._save_histogram(self.probnneta_p_pi, f"{self.results_path}/ProbNN_eta/probnneta_p_pi.png", True)
-            self._save_histogram(self.probnneta_K, f"{self.results_path}/ProbNN_eta/probnneta_K.png", True)
-            self._save_histogram(self.probnneta_p, f"{self.results_path}/ProbNN_eta/probnneta_p.png", True)
-            self._save_histogram(self.probnneta_pi, f"{self.results_path}/ProbNN_eta/probnneta_pi.png", True)
-            self._save_histogram(self.probnneta_pi_true, f"{self.results_path}/ProbNN_eta/probnneta_pi_true.png", True)
-            self._save_histogram(self.probnneta_pi_not, f"{self.results_path}/ProbNN_eta/probnneta_pi_not.png", True)
+            # Zapisywanie histogramów PID/ProbNN z rejestru (histogramy 2D są kolorowe)
+            for spec in histograms:
+                self._save_histogram(self.histograms[spec["name"]],
+                                     f'{self.results_path}/{spec["dir"]}/{spec["name"]}.png', len(spec["keys"]) == 2)
 
-    @staticmethod
-    def _save_histogram(hist: ROOT.TObject, path: str, colz: bool = False):
+    def _save_histogram(self, hist, path: str, colz: bool = False):
         """
-        Funkcja zapisująca histogram
+        Funkcja zapisująca histogram (przez self.renderer)
         """
-
-        # Ustawienia wizualne histogramów i stworzenie obiektu TCanvas
-        hist.SetStats(0)
-        hist.GetXaxis().SetTitleSize(0.05)
-        hist.GetYaxis().SetTitleSize(0.05)
-        hist.GetXaxis().SetLabelSize(0.04)
-        hist.GetYaxis().SetLabelSize(0.04)
-        c = ROOT.TCanvas('c', 'c', 375, 350)
-        c.Draw()
-        c.SetLeftMargin(0.15)
-        c.SetRightMargin(0.15)
-        c.SetBottomMargin(0.125)
-        c.SetTopMargin(0.125)
-
         # Jeśli colz = True, histogram będzie kolorowy (dostępne tylko dla histogramów 2D)
-        if colz:
-            hist.Draw('COLZ')
-        else:
-            hist.Draw()
-        # Zapisanie histogramu
-        c.Print(path)
-
-    def _get_statistics(self, hist_type: dict, keys: list[str]) -> dict:
-        """
-        Funkcja obliczająca statystyki
-
-        :param hist_type: typ histogramu z pliku hist_types.py (dostępne tylko PID i ProbNN).
-            Obliczne są statystyki dla kryteriów przekazanych przez typ histogramu dla kaonów i protonów
-        :param keys: Zmienne na których stosowane są kryteria
-        """
-
-        # Oblicznie liczby cząstek K spełniających kryterium
-        total_K = np.sum(np.where(self.data[keys[0]] > hist_type['cutoff'], 1, 0))
-        # Obliczanie wielkości true_positive, false_positive, true_negative, false_negative dla cząśtki K
-        # po spełnieniu kryteriów
-        true_positive_K = np.sum(
-            np.where((self.data[keys[0]] > hist_type['cutoff']) & (abs(self.data['piplus_TRUEID']) == 321) & (
-                    abs(self.data['piplus_ID']) == 321),
-                     1, 0))
-        false_positive_K = np.sum(
-            np.where((self.data[keys[0]] > hist_type['cutoff']) & (abs(self.data['piplus_TRUEID']) != 321) & (
-                    abs(self.data['piplus_ID']) == 321),
-                     1, 0))
-        true_negative_K = np.sum(
-            np.where((self.data[keys[0]] > hist_type['cutoff']) & (abs(self.data['piplus_TRUEID']) != 321) & (
-                    abs(self.data['piplus_ID']) != 321),
-                     1, 0))
-        false_negative_K = np.sum(
-            np.where((self.data[keys[0]] > hist_type['cutoff']) & (abs(self.data['piplus_TRUEID']) == 321) & (
-                    abs(self.data['piplus_ID']) != 321),
-                     1, 0))
-
-        # Oblicznie liczby cząstek K spełniających kryterium
-        total_p = np.sum(np.where(self.data[keys[1]] > hist_type['cutoff'], 1, 0))
-        # Obliczanie wielkości true_positive, false_positive, true_negative, false_negative dla cząśtki K
-        # po spełnieniu kryteriów
-        true_positive_p = np.sum(
-            np.where((self.data[keys[1]] > hist_type['cutoff']) & (abs(self.data['piplus_TRUEID']) == 2212) & (
-                    abs(self.data['piplus_ID']) == 2212),
-                     1, 0))
-        false_positive_p = np.sum(
-            np.where((self.data[keys[1]] > hist_type['cutoff']) & (abs(self.data['piplus_TRUEID']) != 2212) & (
-                    abs(self.data['piplus_ID']) == 2212),
-                     1, 0))
-        true_negative_p = np.sum(
-            np.where((self.data[keys[1]] > hist_type['cutoff']) & (abs(self.data['piplus_TRUEID']) != 2212) & (
-                    abs(self.data['piplus_ID']) != 2212),
-                     1, 0))
-        false_negative_p = np.sum(
-            np.where((self.data[keys[1]] > hist_type['cutoff']) & (abs(self.data['piplus_TRUEID']) == 2212) & (
-                    abs(self.data['piplus_ID']) != 2212),
-                     1, 0))
-
-        # Tworzenie słownika z obliczonych wartości
-        statistics = {
-            'total_K': total_K,
-            'true_positive_K': true_positive_K,
-            'false_positive_K': false_positive_K,
-            'true_negative_K': true_negative_K,
-            'false_negative_K': false_negative_K,
-            'total_p': total_p,
-            'true_positive_p': true_positive_p,
-            'false_positive_p': false_positive_p,
-            'true_negative_p': true_negative_p,
-            'false_negative_p': false_negative_p,
-        }
+        self.renderer.submit(hist, path, 'COLZ' if colz else '')
+
+    def _get_statistics(self, definitions: dict) -> dict:
+        """
+        Funkcja obliczająca statystyki (total, true_positive, false_positive, true_negative, false_negative) dla
+        wszystkich definicji i cząstek naraz
 
+        :param definitions: Definicje statystyk (np. z pliku statistics_types.py)
+        :return: Słownik: nazwa definicji - słownik statystyk
+        """
+        TRUEID = np.abs(self._column('piplus_TRUEID'))
+        ID = np.abs(self._column('piplus_ID'))
+        # Maski TRUEID/ID są obliczane raz dla każdej cząstki
+        true_is = {}
+        reco_is = {}
+        passes, trues, recos, names = [], [], [], []
+        for name, definition in definitions.items():
+            for particle, (key, particle_id) in definition["particles"].items():
+                if particle_id not in true_is:
+                    true_is[particle_id] = TRUEID == particle_id
+                    reco_is[particle_id] = ID == particle_id
+                passes.append(self._column(key) > definition["cutoff"])
+                trues.append(true_is[particle_id])
+                recos.append(reco_is[particle_id])
+                names.append((name, particle))
+
+        statistics = {name: {} for name in definitions}
+        for (name, particle), counts in zip(names, confusion_counts(passes, trues, recos)):
+            statistics[name].update(summarize(counts, particle))
         return statistics
 
+    @timed('statistics')
+    def _accumulate_statistics(self):
+        """
+        Funkcja dodająca statystyki z aktualnych danych do statystyk zebranych wcześniej
+        """
+        for name, values in self._get_statistics(statistics).items():
+            self.statistics[name] = self._add_statistics(self.statistics.get(name, {}), values)
+
+    @staticmethod
+    def _add_statistics(statistics: dict, other: dict) -> dict:
+        """
+        Funkcja sumująca dwa słowniki statystyk
+        """
+        return {key: statistics.get(key, 0) + value for key, value in other.items()}
+
     def _save_statistics(self):
         """
         Funkcja zapisująca statystyki do pliku .csv
         """
-        statistics_DF = pd.DataFrame([self.statistics_PID, self.statistics_ProbNN], index=['PID', 'ProbNN'])
+        statistics_DF = pd.DataFrame(list(self.statistics.values()), index=list(self.statistics))
         statistics_DF.to_csv(f'{self.results_path}/statistics/statistics.csv')
 
-    @profile
-    def create_mass_histogram(self, hist_type: dict, mass_hists: list[ROOT.TH1], count_hists: list[ROOT.TH1]):
+    def _particle_conditions(self, hist_type: dict) -> dict:
+        """
+        Funkcja zwracająca warunki (maski) wyboru konkretnych rodzajów cząstek z podziałem na ładunek
+
+        :param hist_type: Typ histogramu z pliku mass_hisstograms.py (data_reco lub data_true)
+        """
+        ID = self._column(hist_type["ID"])
+        if hist_type["ID"] == "piplus_TRUEID":
+            # Warunki z TRUEID
+            return {
+                'pi_plus': ID == 211,
+                'pi_minus': ID == -211,
+                'K_plus': ID == 321,
+                'K_minus': ID == -321,
+                'p_plus': ID == 2212,
+                'p_minus': ID == -2212,
+            }
+        # Warunki z kryteriami selekcji. Do zdeterminowania ładunku cząstku użyta została zmienna ID.
+        # Jeśli ID >= 0: ładunek dodatni (0 jest uwzględnione, żeby program nie przestał działać jeśli wystąpi
+        # taka wartość. Nie powinno się to nigdy zdarzyć, jest to tylko środek zapobiegawczy)
+        # Jeśli ID < 0: ładunek ujemny
+        ProbNNpi = self._column(hist_type["ProbNNpi"]) > hist_type["cutoff_pi"]
+        ProbNNK = self._column(hist_type["ProbNNK"]) > hist_type["cutoff_K"]
+        ProbNNp = self._column(hist_type["ProbNNp"]) > hist_type["cutoff_p"]
+        return {
+            'pi_plus': ProbNNpi & (ID >= 0),
+            'pi_minus': ProbNNpi & (ID < 0),
+            'K_plus': ProbNNK & (ID >= 0),
+            'K_minus': ProbNNK & (ID < 0),
+            'p_plus': ProbNNp & (ID >= 0),
+            'p_minus': ProbNNp & (ID < 0),
+        }
+
+    @timed('count histograms')
+    def create_count_histogram(self, hist_type: dict, count_hists: list[Histogram]):
+        """
+        Funkcja obliczająca krotności cząstek we wszystkich zdarzeniach naraz i wypełniająca histogramy krotności
+
+        :param hist_type: Typ histogramu z pliku mass_hisstograms.py (data_reco lub data_true)
+        :param count_hists: Histogramy krotności do wypełnienia (po kolei: pi, p, K)
+        """
+
+        if self.events.n_events == 0:
+            return
+        conditions = self._particle_conditions(hist_type)
+
+        for hist, species in zip(count_hists, ['pi', 'p', 'K']):
+            # Liczba cząstek danego rodzaju (obu ładunków) w każdym zdarzeniu
+            condition = conditions[f'{species}_plus'] | conditions[f'{species}_minus']
+            hist.fill(self.events.multiplicity(condition))
+
+    @timed('kinematics')
+    def _kinematics(self, hist_type: dict) -> Kinematics:
+        """
+        Funkcja tworząca kinematykę cząstek z self.data (składowe pędu i energie dla hipotez mas jako ciągłe tablice
+        float64), obliczaną raz dla kawałka danych i wspólną dla wszystkich kombinacji cząstek
+
+        :param hist_type: Typ histogramu z pliku mass_hisstograms.py (data_reco lub data_true)
         """
-        Funkcja obliczająca i tworząca histogramy mas i krotności
+        momentum = [self._column(hist_type[key]) for key in ("Px", "Py", "Pz")]
+        if hist_type["ID"] == "piplus_ID":
+            # Dla data_reco pod zmienną hist_type["E"] przypisany jest pęd, energia jest obliczana z masy hipotezy
+            return Kinematics(*momentum, p=self._column(hist_type["E"]))
+        return Kinematics(*momentum, energy=self._column(hist_type["E"]))
+
+    @timed('mass histograms')
+    def create_mass_histogram(self, hist_type: dict, mass_hists: dict):
+        """
+        Funkcja obliczająca i tworząca histogramy mas dla wszystkich kombinacji z pliku mass_histograms.py
 
         :param hist_type: Typ histogramu z pliku mass_hisstograms.py:
             1. data_reco dla rekonstrukcji masy z danych symulacyjnych i dla masy z danych doświadczalnych
             2. data_true dla masy ze zmiennej TRUEID z danych symulacyjnych
-        :param mass_hists: Histogramy mas do wypełnienia (po kolei: pipi, ppi, KK)
-        :param count_hists: Histogramy krotności do wypełnienia (po kolei: pi, p, K)
-        :return:
+        :param mass_hists: Histogramy mas do wypełnienia (nazwa kombinacji: histogram)
         """
 
-        # Wyciągamy z danych interesujące nas zmienne
-        if hist_type["ID"] == "piplus_TRUEID":
-            data = self.data[
-                [hist_type["ID"], hist_type["E"], hist_type["Px"], hist_type["Py"], hist_type["Pz"], "eventNumber"]]
-        elif hist_type["ID"] == "piplus_ID":
-            data = self.data[
-                [hist_type["ID"], hist_type["E"], hist_type["Px"], hist_type["Py"], hist_type["Pz"],
-                 hist_type["ProbNNK"], hist_type["ProbNNp"], hist_type["ProbNNpi"], "eventNumber"]]
-        else:
-            data = self.data["eventNumber"]
-
-        # Tablica numerów zdarzeń dla wszystkich cząstek
-        event_numbers_all = data["eventNumber"].values
-        # Usunięcie wszystkich duplikujących się numerów zdarzeń
-        event_numbers = np.unique(event_numbers_all)
-        # Stworzenie tablicy przechowującej informację w którym miejscu w danych zaczyna się następne zdarzenie.
-        # Ważna jest kolejność w jakiej dane są ustawione
-        new_event = np.concatenate(np.array(np.where(np.diff(event_numbers_all)))) + 1
-        new_event = np.append(new_event, event_numbers_all.size)
-        new_event = np.insert(new_event, 0, 0)
-
+        if self.events.n_events == 0:
+            return
         # Warunki na cząstki
-        if hist_type["ID"] == "piplus_TRUEID":
-            # Warunki z TRUEID
-            condition_pi_plus = data[hist_type["ID"]] == 211
-            condition_pi_minus = data[hist_type["ID"]] == -211
-            condition_K_plus = data[hist_type["ID"]] == 321
-            condition_K_minus = data[hist_type["ID"]] == -321
-            condition_p_plus = data[hist_type["ID"]] == 2212
-            condition_p_minus = data[hist_type["ID"]] == -2212
-        elif hist_type["ID"] == "piplus_ID":
-            # Warunki z kryteriami selekcji. Do zdeterminowania ładunku cząstku użyta została zmienna ID.
-            # Jeśli ID >= 0: ładunek dodatni (0 jest uwzględnione, żeby program nie przestał działać jeśli wystąpi
-            # taka wartość. Nie powinno się to nigdy zdarzyć, jest to tylko środek zapobiegawczy)
-            # Jeśli ID < 0: ładunek ujemny
-            condition_pi_plus = (data[hist_type["ProbNNpi"]] > hist_type["cutoff_pi"]) & (data[hist_type["ID"]] >= 0)
-            condition_pi_minus = (data[hist_type["ProbNNpi"]] > hist_type["cutoff_pi"]) & (data[hist_type["ID"]] < 0)
-            condition_K_plus = (data[hist_type["ProbNNK"]] > hist_type["cutoff_K"]) & (data[hist_type["ID"]] >= 0)
-            condition_K_minus = (data[hist_type["ProbNNK"]] > hist_type["cutoff_K"]) & (data[hist_type["ID"]] < 0)
-            condition_p_plus = (data[hist_type["ProbNNp"]] > hist_type["cutoff_p"]) & (data[hist_type["ID"]] >= 0)
-            condition_p_minus = (data[hist_type["ProbNNp"]] > hist_type["cutoff_p"]) & (data[hist_type["ID"]] < 0)
-        else:
-            # Uwzglęniony else, żeby kompilator nie zgłaszał warningów. Ten przypadek nigdy nie występuje.
-            condition_pi_plus = 0
-            condition_pi_minus = 0
-            condition_K_plus = 0
-            condition_K_minus = 0
-            condition_p_plus = 0
-            condition_p_minus = 0
+        conditions = self._particle_conditions(hist_type)
+
+        kinematics = self._kinematics(hist_type)
+
+        # Dla każdego rodzaju cząstek używanego w kombinacjach tworzone są ciągłe tablice energii i pędów
+        # (uporządkowane wg zdarzeń, pobierane z tablic kinematyki po indeksach) oraz liczba takich cząstek
+        # w każdym zdarzeniu
+        particles = {}
+        for name in {daughter for spec in combinations for daughters in spec["daughters"] for daughter in daughters}:
+            condition = conditions[name]
+            count = self.events.multiplicity(condition)
+            particles[name] = {
+                **kinematics.particles(name, condition),
+                'count': count,
+                # Indeks pierwszej cząstki w każdym zdarzeniu
+                'start': np.cumsum(count) - count,
+            }
+
+        # Wypełnianie histogramów mas dla wszystkich kombinacji (w porcjach zdarzeń). Zdarzenia pominięte z powodu
+        # max_combinations są zliczane osobno dla każdego histogramu
+        suffix = '_true' if hist_type["ID"] == "piplus_TRUEID" else ''
+        for spec in combinations:
+            hist = mass_hists[spec["name"]]
+            for daughters in spec["daughters"]:
+                for values_to_fill in invariant_masses([particles[name] for name in daughters], max_combinations,
+                                                       skipped=self.skipped, key=f'{spec["name"]}{suffix}'):
+                    hist.fill(values_to_fill)
+
+        # Mieszanie zdarzeń (tylko dla mas z rekonstrukcji)
+        if self.mixing_pool is not None and hist_type["ID"] == "piplus_ID":
+            self._fill_mixed_histograms(particles)
+
+    @timed('event mixing')
+    def _fill_mixed_histograms(self, particles: dict):
+        """
+        Funkcja wypełniająca histogramy mas kombinacji z różnych zdarzeń (porcjami po BLOCK_SIZE zdarzeń)
 
-        if hist_type["ID"] == "piplus_ID":
-            # Stworzenie tablic zawierających energie konkretnych rodzajów cząstek w celu późniejszych szybszych
-            # obliczeń. Przypadek dla typu histogramu: data_reco. Pod zmienną hist_type["E"] przypisany jest pęd cząstki
-            pi_plus_E_all = np.sqrt(data.loc[condition_pi_plus][hist_type["E"]].values ** 2 + pi_mass ** 2)
-            pi_minus_E_all = np.sqrt(data.loc[condition_pi_minus][hist_type["E"]].values ** 2 + pi_mass ** 2)
-            p_plus_E_all = np.sqrt(data.loc[condition_p_plus][hist_type["E"]].values ** 2 + p_mass ** 2)
-            p_minus_E_all = np.sqrt(data.loc[condition_p_minus][hist_type["E"]].values ** 2 + p_mass ** 2)
-            K_plus_E_all = np.sqrt(data.loc[condition_K_plus][hist_type["E"]].values ** 2 + K_mass ** 2)
-            K_minus_E_all = np.sqrt(data.loc[condition_K_minus][hist_type["E"]].values ** 2 + K_mass ** 2)
-        else:
-            # Stworzenie tablic zawierających energie konkretnych rodzajów cząstek w celu późniejszych szybszych
-            # obliczeń. Przypadek dla typu histogramu: data_true.
-            pi_plus_E_all = data.loc[condition_pi_plus][hist_type["E"]].values
-            pi_minus_E_all = data.loc[condition_pi_minus][hist_type["E"]].values
-            p_plus_E_all = data.loc[condition_p_plus][hist_type["E"]].values
-            p_minus_E_all = data.loc[condition_p_minus][hist_type["E"]].values
-            K_plus_E_all = data.loc[condition_K_plus][hist_type["E"]].values
-            K_minus_E_all = data.loc[condition_K_minus][hist_type["E"]].values
-
-        # Stworzenie tablic zawierających wszystkie współrzędne pędów konkretnych rodzajów cząstek w celu późniejszych
-        # szybszych obliczeń
-        pi_plus_PX_all = data.loc[condition_pi_plus][hist_type["Px"]].values
-        pi_plus_PY_all = data.loc[condition_pi_plus][hist_type["Py"]].values
-        pi_plus_PZ_all = data.loc[condition_pi_plus][hist_type["Pz"]].values
-        pi_minus_PX_all = data.loc[condition_pi_minus][hist_type["Px"]].values
-        pi_minus_PY_all = data.loc[condition_pi_minus][hist_type["Py"]].values
-        pi_minus_PZ_all = data.loc[condition_pi_minus][hist_type["Pz"]].values
-        p_plus_PX_all = data.loc[condition_p_plus][hist_type["Px"]].values
-        p_plus_PY_all = data.loc[condition_p_plus][hist_type["Py"]].values
-        p_plus_PZ_all = data.loc[condition_p_plus][hist_type["Pz"]].values
-        p_minus_PX_all = data.loc[condition_p_minus][hist_type["Px"]].values
-        p_minus_PY_all = data.loc[condition_p_minus][hist_type["Py"]].values
-        p_minus_PZ_all = data.loc[condition_p_minus][hist_type["Pz"]].values
-        K_plus_PX_all = data.loc[condition_K_plus][hist_type["Px"]].values
-        K_plus_PY_all = data.loc[condition_K_plus][hist_type["Py"]].values
-        K_plus_PZ_all = data.loc[condition_K_plus][hist_type["Pz"]].values
-        K_minus_PX_all = data.loc[condition_K_minus][hist_type["Px"]].values
-        K_minus_PY_all = data.loc[condition_K_minus][hist_type["Py"]].values
-        K_minus_PZ_all = data.loc[condition_K_minus][hist_type["Pz"]].values
-
-        # Inicjalizacja kumulatywnych zmiennych służących do liczenia cząstek wewnątrz pętli
-        pi_plus_cum = 0
-        pi_minus_cum = 0
-        p_plus_cum = 0
-        p_minus_cum = 0
-        K_plus_cum = 0
-        K_minus_cum = 0
-
-        # Iteracja po wszystkich numerach zdarzeń
-        for idx, event in enumerate(event_numbers):
-            if hist_type["ID"] == "piplus_TRUEID":
-                # Przypadek dla histogramu typu: data_true. Definiowanie warunków na konkretne cząstki znajdujące się
-                # w danym zdarzeniu. Tablica new_event zawiera indeksy z głównych danych na których zaczynają się
-                # kolejne zdarzenia.
-                condition_pi_plus = data[hist_type["ID"]].values[new_event[idx]:new_event[idx + 1]] == 211
-                condition_pi_minus = data[hist_type["ID"]].values[new_event[idx]:new_event[idx + 1]] == -211
-                condition_K_plus = data[hist_type["ID"]].values[new_event[idx]:new_event[idx + 1]] == 321
-                condition_K_minus = data[hist_type["ID"]].values[new_event[idx]:new_event[idx + 1]] == -321
-                condition_p_plus = data[hist_type["ID"]].values[new_event[idx]:new_event[idx + 1]] == 2212
-                condition_p_minus = data[hist_type["ID"]].values[new_event[idx]:new_event[idx + 1]] == -2212
-            elif hist_type["ID"] == "piplus_ID":
-                # Przypadek dla histogramu typu: data_reco. Definiowanie warunków na konkretne cząstki znajdujące się
-                # w danym zdarzeniu. Ponownie do zdeterminowania ładunku wykorzystana jest zmienna ID
-                condition_pi_plus = (data[hist_type["ProbNNpi"]].values[new_event[idx]:new_event[idx + 1]] > hist_type[
-                    "cutoff_pi"]) & (data[hist_type["ID"]].values[new_event[idx]:new_event[idx + 1]] >= 0)
-                condition_pi_minus = (data[hist_type["ProbNNpi"]].values[new_event[idx]:new_event[idx + 1]] > hist_type[
-                    "cutoff_pi"]) & (data[hist_type["ID"]].values[new_event[idx]:new_event[idx + 1]] < 0)
-                condition_K_plus = (data[hist_type["ProbNNK"]].values[new_event[idx]:new_event[idx + 1]] > hist_type[
-                    "cutoff_K"]) & (data[hist_type["ID"]].values[new_event[idx]:new_event[idx + 1]] >= 0)
-                condition_K_minus = (data[hist_type["ProbNNK"]].values[new_event[idx]:new_event[idx + 1]] > hist_type[
-                    "cutoff_K"]) & (data[hist_type["ID"]].values[new_event[idx]:new_event[idx + 1]] < 0)
-                condition_p_plus = (data[hist_type["ProbNNp"]].values[new_event[idx]:new_event[idx + 1]] > hist_type[
-                    "cutoff_p"]) & (data[hist_type["ID"]].values[new_event[idx]:new_event[idx + 1]] >= 0)
-                condition_p_minus = (data[hist_type["ProbNNp"]].values[new_event[idx]:new_event[idx + 1]] > hist_type[
-                    "cutoff_p"]) & (data[hist_type["ID"]].values[new_event[idx]:new_event[idx + 1]] < 0)
-            else:
-                # Uwzglęniony else, żeby kompilator nie zgłaszał warningów. Ten przypadek nigdy nie występuje.
-                condition_pi_plus = 0
-                condition_pi_minus = 0
-                condition_K_plus = 0
-                condition_K_minus = 0
-                condition_p_plus = 0
-                condition_p_minus = 0
-
-            # Zliczane są liczby konkretnych cząstek w danym zdarzeniu
-            pi_plus_count = np.count_nonzero(np.where(condition_pi_plus, 1, 0))
-            pi_minus_count = np.count_nonzero(np.where(condition_pi_minus, 1, 0))
-            p_plus_count = np.count_nonzero(np.where(condition_p_plus, 1, 0))
-            p_minus_count = np.count_nonzero(np.where(condition_p_minus, 1, 0))
-            K_plus_count = np.count_nonzero(np.where(condition_K_plus, 1, 0))
-            K_minus_count = np.count_nonzero(np.where(condition_K_minus, 1, 0))
-
-            # Zliczone wartości dodawane są do zmiennych kumulatywnych
-            pi_plus_cum += pi_plus_count
-            pi_minus_cum += pi_minus_count
-            p_plus_cum += p_plus_count
-            p_minus_cum += p_minus_count
-            K_plus_cum += K_plus_count
-            K_minus_cum += K_minus_count
-
-            # Wypełnianie histogramów krotności
-            count_hists[0].Fill(pi_plus_count + pi_minus_count)
-            count_hists[1].Fill(p_plus_count + p_minus_count)
-            count_hists[2].Fill(K_plus_count + K_minus_count)
-
-            # Jeśli w danym zdarzeniu zarejestrowano przynajmniej 1 pi+ i przynajmniej 1 pi-
-            if pi_plus_count != 0 and pi_minus_count != 0:
-                # Tworzone są macierze wszystkich kombinacji energii i współrzędnych pędu czątek pi+ i pi-
-                # zarejestrowanych w tym zdarzeniu
-                pi_plus_E, pi_minus_E = np.meshgrid(pi_plus_E_all[pi_plus_cum - pi_plus_count:pi_plus_cum],
-                                                    pi_minus_E_all[pi_minus_cum - pi_minus_count:pi_minus_cum])
-                pi_plus_PX, pi_minus_PX = np.meshgrid(pi_plus_PX_all[pi_plus_cum - pi_plus_count:pi_plus_cum],
-                                                      pi_minus_PX_all[pi_minus_cum - pi_minus_count:pi_minus_cum])
-                pi_plus_PY, pi_minus_PY = np.meshgrid(pi_plus_PY_all[pi_plus_cum - pi_plus_count:pi_plus_cum],
-                                                      pi_minus_PY_all[pi_minus_cum - pi_minus_count:pi_minus_cum])
-                pi_plus_PZ, pi_minus_PZ = np.meshgrid(pi_plus_PZ_all[pi_plus_cum - pi_plus_count:pi_plus_cum],
-                                                      pi_minus_PZ_all[pi_minus_cum - pi_minus_count:pi_minus_cum])
-                # Obliczanie mas niezmienniczych dla wszystkich kombinacji
-                values_to_fill = np.sqrt((pi_plus_E + pi_minus_E) ** 2 - (pi_plus_PX + pi_minus_PX) ** 2 - (
-                        pi_plus_PY + pi_minus_PY) ** 2 - (pi_plus_PZ + pi_minus_PZ) ** 2)
-                # Redukowanie wymiaru macierzy jeśli tablice kombinacji nie są wektorami
-                if pi_plus_count > 1 and pi_minus_count > 1:
-                    values_to_fill = np.concatenate(values_to_fill, axis=0)
-                # Wypełniane histogramu masy dla pary cząstek pipi
-                mass_hists[0].FillN(values_to_fill.size, values_to_fill, np.ones(values_to_fill.size))
-
-            # Jeśli w danym zdarzeniu zarejestrowano przynajmniej 1 K+ i przynajmniej 1 K-
-            if K_plus_count != 0 and K_minus_count != 0:
-                # Tworzone są macierze wszystkich kombinacji energii i współrzędnych pędu czątek K+ i K-
-                # zarejestrowanych w tym zdarzeniu
-                K_plus_E, K_minus_E = np.meshgrid(K_plus_E_all[K_plus_cum - K_plus_count:K_plus_cum],
-                                                  K_minus_E_all[K_minus_cum - K_minus_count:K_minus_cum])
-                K_plus_PX, K_minus_PX = np.meshgrid(K_plus_PX_all[K_plus_cum - K_plus_count:K_plus_cum],
-                                                    K_minus_PX_all[K_minus_cum - K_minus_count:K_minus_cum])
-                K_plus_PY, K_minus_PY = np.meshgrid(K_plus_PY_all[K_plus_cum - K_plus_count:K_plus_cum],
-                                                    K_minus_PY_all[K_minus_cum - K_minus_count:K_minus_cum])
-                K_plus_PZ, K_minus_PZ = np.meshgrid(K_plus_PZ_all[K_plus_cum - K_plus_count:K_plus_cum],
-                                                    K_minus_PZ_all[K_minus_cum - K_minus_count:K_minus_cum])
-                # Obliczanie mas niezmienniczych dla wszystkich kombinacji
-                values_to_fill = np.sqrt(
-                    (K_plus_E + K_minus_E) ** 2 - (K_plus_PX + K_minus_PX) ** 2 - (K_plus_PY + K_minus_PY) ** 2 - (
-                            K_plus_PZ + K_minus_PZ) ** 2)
-                # Redukowanie wymiaru macierzy jeśli tablice kombinacji nie są wektorami
-                if K_plus_count > 1 and K_minus_count > 1:
-                    values_to_fill = np.concatenate(values_to_fill, axis=0)
-                # Wypełniane histogramu masy dla pary cząstek KK
-                mass_hists[2].FillN(values_to_fill.size, values_to_fill, np.ones(values_to_fill.size))
-
-            # Jeśli w danym zdarzeniu zarejestrowano przynajmniej 1 p i przynajmniej 1 pi-
-            if p_plus_count != 0 and pi_minus_count != 0:
-                # Tworzone są macierze wszystkich kombinacji energii i współrzędnych pędu czątek p i pi-
-                # zarejestrowanych w tym zdarzeniu
-                p_plus_E, pi_minus_E = np.meshgrid(p_plus_E_all[p_plus_cum - p_plus_count:p_plus_cum],
-                                                   pi_minus_E_all[pi_minus_cum - pi_minus_count:pi_minus_cum])
-                p_plus_PX, pi_minus_PX = np.meshgrid(p_plus_PX_all[p_plus_cum - p_plus_count:p_plus_cum],
-                                                     pi_minus_PX_all[pi_minus_cum - pi_minus_count:pi_minus_cum])
-                p_plus_PY, pi_minus_PY = np.meshgrid(p_plus_PY_all[p_plus_cum - p_plus_count:p_plus_cum],
-                                                     pi_minus_PY_all[pi_minus_cum - pi_minus_count:pi_minus_cum])
-                p_plus_PZ, pi_minus_PZ = np.meshgrid(p_plus_PZ_all[p_plus_cum - p_plus_count:p_plus_cum],
-                                                     pi_minus_PZ_all[pi_minus_cum - pi_minus_count:pi_minus_cum])
-                # Obliczanie mas niezmienniczych dla wszystkich kombinacji
-                values_to_fill = np.sqrt(
-                    (p_plus_E + pi_minus_E) ** 2 - (p_plus_PX + pi_minus_PX) ** 2 - (p_plus_PY + pi_minus_PY) ** 2 - (
-                            p_plus_PZ + pi_minus_PZ) ** 2)
-                # Redukowanie wymiaru macierzy jeśli tablice kombinacji nie są wektorami
-                if p_plus_count > 1 and pi_minus_count > 1:
-                    values_to_fill = np.concatenate(values_to_fill, axis=0)
-                # Wypełniane histogramu masy dla pary cząstek ppi
-                mass_hists[1].FillN(values_to_fill.size, values_to_fill, np.ones(values_to_fill.size))
-
-            # Jeśli w danym zdarzeniu zarejestrowano przynajmniej 1 pi+ i przynajmniej 1 anty-p
-            if pi_plus_count != 0 and p_minus_count != 0:
-                # Tworzone są macierze wszystkich kombinacji energii i współrzędnych pędu czątek pi+ i anty-p
-                # zarejestrowanych w tym zdarzeniu
-                pi_plus_E, p_minus_E = np.meshgrid(pi_plus_E_all[pi_plus_cum - pi_plus_count:pi_plus_cum],
-                                                   p_minus_E_all[p_minus_cum - p_minus_count:p_minus_cum])
-                pi_plus_PX, p_minus_PX = np.meshgrid(pi_plus_PX_all[pi_plus_cum - pi_plus_count:pi_plus_cum],
-                                                     p_minus_PX_all[p_minus_cum - p_minus_count:p_minus_cum])
-                pi_plus_PY, p_minus_PY = np.meshgrid(pi_plus_PY_all[pi_plus_cum - pi_plus_count:pi_plus_cum],
-                                                     p_minus_PY_all[p_minus_cum - p_minus_count:p_minus_cum])
-                pi_plus_PZ, p_minus_PZ = np.meshgrid(pi_plus_PZ_all[pi_plus_cum - pi_plus_count:pi_plus_cum],
-                                                     p_minus_PZ_all[p_minus_cum - p_minus_count:p_minus_cum])
-                # Obliczanie mas niezmienniczych dla wszystkich kombinacji
-                values_to_fill = np.sqrt(
-                    (pi_plus_E + p_minus_E) ** 2 - (pi_plus_PX + p_minus_PX) ** 2 - (pi_plus_PY + p_minus_PY) ** 2 - (
-                            pi_plus_PZ + p_minus_PZ) ** 2)
-                # Redukowanie wymiaru macierzy jeśli tablice kombinacji nie są wektorami
-                if pi_plus_count > 1 and p_minus_count > 1:
-                    values_to_fill = np.concatenate(values_to_fill, axis=0)
-                # Wypełniane histogramu masy dla pary cząstek ppi
-                mass_hists[1].FillN(values_to_fill.size, values_to_fill, np.ones(values_to_fill.size))
-
-        xehs = 5
-
-    @profile
-    def calculate_efficiency_pt_1(self):
-        """
-        Funkcja obliczająca czystość identyfikacji w funkcji pędu poprzecznego
-        """
-
-        # Tworzenie osi pędów poprzecznych
-        pt = np.linspace(0, 2000, 51)
-
-        # Wyciągnięcie z danych interesujących nas zmiennych
-        data = self.data[
-            ['piplus_TRUEID', 'piplus_PT', 'piplus_ProbNNk', 'piplus_ProbNNp', 'piplus_ProbNNpi']]
-
-        # Sortowanie danych wraz z rosnącym pędem poprzecznym. Kolejność jest ważna.
-        data_pt = data.sort_values('piplus_PT')
-
-        # Stworzenie tablic interesujących nas zmiennych w celu późniejszych szybszych obliczeń
-        ProbNNpi = data_pt['piplus_ProbNNpi'].values
-        ProbNNp = data_pt['piplus_ProbNNp'].values
-        ProbNNK = data_pt['piplus_ProbNNk'].values
-        TRUEID = data_pt['piplus_TRUEID'].values
-        PT = data_pt['piplus_PT'].values
-
-        # Inicjalizujemy 50 binów do wykresów z zerami jako wszystkimi wartościami
-        pi_values = np.zeros(pt.size - 1)
-        p_values = np.zeros(pt.size - 1)
-        K_values = np.zeros(pt.size - 1)
-
-        # Inicjalizujemy zmienne liczące cząstki
-        pi_count = 0
-        pi_true_count = 0
-        p_count = 0
-        p_true_count = 0
-        K_count = 0
-        K_true_count = 0
-
-        # Inicjalizujemy zmienną liczącą biny
-        idx = 0
-
-        # Iteracja po wszystkich cząstkach
-        for number in range(TRUEID.size):
-            # Jeśli pęd poprzeczny cząstki jest większy od górnej granicy aktualnego binu
-            if PT[number] > pt[idx + 1]:
-                # Zapisujemy zliczone w aktualnym binie dane upewniając się, że nie dzielimy przez 0. Jeśli w danym
-                # binie nie było szukanego rodzaju cząstki nic nie jest wpisywane, ponieważ biny miały
-                # domyślnie wartości 0
-                if pi_true_count > 0:
-                    pi_values[idx] = pi_count / pi_true_count
-                if p_true_count > 0:
-                    p_values[idx] = p_count / p_true_count
-                if K_true_count > 0:
-                    K_values[idx] = K_count / K_true_count
-                # Przesunięcie do następnego binu
-                idx += 1
-                # Wyzerowanie zmiennych liczących
-                pi_count = 0
-                pi_true_count = 0
-                p_count = 0
-                p_true_count = 0
-                K_count = 0
-                K_true_count = 0
-            # Przerwanie pętli po przejściu przez wszystkie biny
-            if idx == pt.size - 1:
-                break
-            # Zliczanie cząstek
-            if abs(TRUEID[number]) == 211:
-                pi_true_count += 1
-                if ProbNNpi[number] > 0.9:
-                    pi_count += 1
-            elif abs(TRUEID[number]) == 321:
-                K_true_count += 1
-                if ProbNNK[number] > 0.9:
-                    K_count += 1
-            elif abs(TRUEID[number]) == 2212:
-                p_true_count += 1
-                if ProbNNp[number] > 0.9:
-                    p_count += 1
-
-        # Tworzenie wykresów
-        graph_pt_pi = ROOT.TGraph(pt.size - 1, pt / 1000, pi_values)
-        graph_pt_pi.SetTitle("#pi identification purity;P_{t} [GeV];Efficiency")
-        graph_pt_p = ROOT.TGraph(pt.size - 1, pt / 1000, p_values)
-        graph_pt_p.SetTitle("p identification purity;P_{t} [GeV];Efficiency")
-        graph_pt_K = ROOT.TGraph(pt.size - 1, pt / 1000, K_values)
-        graph_pt_K.SetTitle("K identification purity;P_{t} [GeV];Efficiency")
-
-        # Zapisywanie wykresów
-        self._save_histogram(graph_pt_pi, f'{self.results_path}/efficiency/efficiency_pt_pi_1.png')
-        self._save_histogram(graph_pt_p, f'{self.results_path}/efficiency/efficiency_pt_p_1.png')
-        self._save_histogram(graph_pt_K, f'{self.results_path}/efficiency/efficiency_pt_K_1.png')
-
-    @profile
-    def calculate_efficiency_eta_1(self):
-        """
-        Funkcja obliczająca czystość identyfikacji w funkcji pseudopośpieszności
-        """
-
-        # Tworzenie osi pseudopośpieszności
-        eta = np.linspace(2, 5, 26)
-
-        # Wyciągnięcie z danych interesujących nas zmiennych
-        data = self.data[
-            ['piplus_TRUEID', 'piplus_ETA', 'piplus_ProbNNk', 'piplus_ProbNNp', 'piplus_ProbNNpi']]
-
-        # Sortowanie danych wraz z rosnącą pseudopośpiesznością. Kolejność jest ważna.
-        data_eta = data.sort_values('piplus_ETA')
-
-        # Stworzenie tablic interesujących nas zmiennych w celu późniejszych szybszych obliczeń
-        ProbNNpi = data_eta['piplus_ProbNNpi'].values
-        ProbNNp = data_eta['piplus_ProbNNp'].values
-        ProbNNK = data_eta['piplus_ProbNNk'].values
-        TRUEID = data_eta['piplus_TRUEID'].values
-        ETA = data_eta['piplus_ETA'].values
-
-        # Inicjalizujemy 50 binów do wykresów z zerami jako wszystkimi wartościami
-        pi_values = np.zeros(eta.size - 1)
-        p_values = np.zeros(eta.size - 1)
-        K_values = np.zeros(eta.size - 1)
-
-        # Inicjalizujemy zmienne liczące cząstki
-        pi_count = 0
-        pi_true_count = 0
-        p_count = 0
-        p_true_count = 0
-        K_count = 0
-        K_true_count = 0
-
-        # Inicjalizujemy zmienną liczącą biny
-        idx = 0
-
-        # Iteracja po wszystkich cząstkach
-        for number in range(TRUEID.size):
-            # Jeśli pseudopośpieszność cząstki jest większa od górnej granicy aktualnego binu
-            if ETA[number] > eta[idx + 1]:
-                # Zapisujemy zliczone w aktualnym binie dane upewniając się, że nie dzielimy przez 0. Jeśli w danym
-                # binie nie było szukanego rodzaju cząstki nic nie jest wpisywane, ponieważ biny miały
-                # domyślnie wartości 0
-                if pi_true_count > 0:
-                    pi_values[idx] = pi_count / pi_true_count
-                if p_true_count > 0:
-                    p_values[idx] = p_count / p_true_count
-                if K_true_count > 0:
-                    K_values[idx] = K_count / K_true_count
-                # Przesunięcie do następnego binu
-                idx += 1
-                # Wyzerowanie zmiennych liczących
-                pi_count = 0
-                pi_true_count = 0
-                p_count = 0
-                p_true_count = 0
-                K_count = 0
-                K_true_count = 0
-            # Przerwanie pętli po przejściu przez wszystkie biny
-            if idx == eta.size - 1:
-                break
-            # Zliczanie cząstek
-            if abs(TRUEID[number]) == 211:
-                pi_true_count += 1
-                if ProbNNpi[number] > 0.9:
-                    pi_count += 1
-            elif abs(TRUEID[number]) == 321:
-                K_true_count += 1
-                if ProbNNK[number] > 0.9:
-                    K_count += 1
-            elif abs(TRUEID[number]) == 2212:
-                p_true_count += 1
-                if ProbNNp[number] > 0.9:
-                    p_count += 1
-
-        # Tworzenie wykresów
-        graph_eta_pi = ROOT.TGraph(eta.size - 1, eta, pi_values)
-        graph_eta_pi.SetTitle("#pi identification purity;#eta;Efficiency")
-        graph_eta_p = ROOT.TGraph(eta.size - 1, eta, p_values)
-        graph_eta_p.SetTitle("p identification purity;#eta;Efficiency")
-        graph_eta_K = ROOT.TGraph(eta.size - 1, eta, K_values)
-        graph_eta_K.SetTitle("K identification purity;#eta;Efficiency")
-
-        # Zapisywanie wykresów
-        self._save_histogram(graph_eta_pi, f'{self.results_path}/efficiency/efficiency_eta_pi_1.png')
-        self._save_histogram(graph_eta_p, f'{self.results_path}/efficiency/efficiency_eta_p_1.png')
-        self._save_histogram(graph_eta_K, f'{self.results_path}/efficiency/efficiency_eta_K_1.png')
-
-    @profile
-    def calculate_efficiency_pt_2(self):
-        """
-        Funkcja obliczająca wydajności kryteriów selekcji w funkcji pędu poprzecznego
-        """
-
-        # Tworzenie osi pędów poprzecznych
-        pt = np.linspace(0, 2000, 51)
-
-        # Wyciągnięcie z danych interesujących nas zmiennych
-        data = self.data[
-            ['piplus_TRUEID', 'piplus_PT', 'piplus_ProbNNk', 'piplus_ProbNNp', 'piplus_ProbNNpi']]
-
-        # Sortowanie danych wraz z rosnącym pędem poprzecznym. Kolejność jest ważna.
-        data_pt = data.sort_values('piplus_PT')
-
-        # Stworzenie tablic interesujących nas zmiennych w celu późniejszych szybszych obliczeń
-        ProbNNpi = data_pt['piplus_ProbNNpi'].values
-        ProbNNp = data_pt['piplus_ProbNNp'].values
-        ProbNNK = data_pt['piplus_ProbNNk'].values
-        TRUEID = data_pt['piplus_TRUEID'].values
-        PT = data_pt['piplus_PT'].values
-
-        # Inicjalizujemy 50 binów do wykresów z zerami jako wszystkimi wartościami
-        pi_values = np.zeros(pt.size - 1)
-        p_values = np.zeros(pt.size - 1)
-        K_values = np.zeros(pt.size - 1)
-
-        # Inicjalizujemy zmienne liczące cząstki
-        pi_count = 0
-        pi_true_count = 0
-        p_count = 0
-        p_true_count = 0
-        K_count = 0
-        K_true_count = 0
-
-        # Inicjalizujemy zmienną liczącą biny
-        idx = 0
-
-        # Iteracja po wszystkich cząstkach
-        for number in range(TRUEID.size):
-            # Jeśli pęd poprzeczny cząstki jest większy od górnej granicy aktualnego binu
-            if PT[number] > pt[idx + 1]:
-                # Zapisujemy zliczone w aktualnym binie dane upewniając się, że nie dzielimy przez 0. Jeśli w danym
-                # binie nie było szukanego rodzaju cząstki nic nie jest wpisywane, ponieważ biny miały
-                # domyślnie wartości 0
-                if pi_true_count > 0:
-                    pi_values[idx] = pi_true_count / pi_count
-                if p_true_count > 0:
-                    p_values[idx] = p_true_count / p_count
-                if K_true_count > 0:
-                    K_values[idx] = K_true_count / K_count
-                # Przesunięcie do następnego binu
-                idx += 1
-                # Wyzerowanie zmiennych liczących
-                pi_count = 0
-                pi_true_count = 0
-                p_count = 0
-                p_true_count = 0
-                K_count = 0
-                K_true_count = 0
-            # Przerwanie pętli po przejściu przez wszystkie biny
-            if idx == pt.size - 1:
-                break
-            # Zliczanie cząstek
-            if ProbNNpi[number] > 0.9:
-                pi_count += 1
-                if abs(TRUEID[number]) == 211:
-                    pi_true_count += 1
-            elif ProbNNK[number] > 0.9:
-                K_count += 1
-                if abs(TRUEID[number]) == 321:
-                    K_true_count += 1
-            elif ProbNNp[number] > 0.9:
-                p_count += 1
-                if abs(TRUEID[number]) == 2212:
-                    p_true_count += 1
-
-        # Tworzenie wykresów
-        graph_pt_pi = ROOT.TGraph(pt.size - 1, pt / 1000, pi_values)
-        graph_pt_pi.SetTitle("#pi cut efficiency;P_{t} [GeV];Efficiency")
-        graph_pt_p = ROOT.TGraph(pt.size - 1, pt / 1000, p_values)
-        graph_pt_p.SetTitle("p cut efficiency;P_{t} [GeV];Efficiency")
-        graph_pt_K = ROOT.TGraph(pt.size - 1, pt / 1000, K_values)
-        graph_pt_K.SetTitle("K cut efficiency;P_{t} [GeV];Efficiency")
-
-        # Zapisywanie wykresów
-        self._save_histogram(graph_pt_pi, f'{self.results_path}/efficiency/efficiency_pt_pi_2.png')
-        self._save_histogram(graph_pt_p, f'{self.results_path}/efficiency/efficiency_pt_p_2.png')
-        self._save_histogram(graph_pt_K, f'{self.results_path}/efficiency/efficiency_pt_K_2.png')
-
-    @profile
-    def calculate_efficiency_eta_2(self):
-        """
-        Funkcja obliczająca wydajności kryteriów selekcji w funkcji pseudopośpieszności
-        """
-
-        # Tworzenie osi pseudopośpieszności
-        eta = np.linspace(2, 5, 26)
-
-        # Wyciągnięcie z danych interesujących nas zmiennych
-        data = self.data[
-            ['piplus_TRUEID', 'piplus_ETA', 'piplus_ProbNNk', 'piplus_ProbNNp', 'piplus_ProbNNpi']]
-
-        # Sortowanie danych wraz z rosnącą pseudopośpiesznością. Kolejność jest ważna.
-        data_eta = data.sort_values('piplus_ETA')
-
-        # Stworzenie tablic interesujących nas zmiennych w celu późniejszych szybszych obliczeń
-        ProbNNpi = data_eta['piplus_ProbNNpi'].values
-        ProbNNp = data_eta['piplus_ProbNNp'].values
-        ProbNNK = data_eta['piplus_ProbNNk'].values
-        TRUEID = data_eta['piplus_TRUEID'].values
-        ETA = data_eta['piplus_ETA'].values
-
-        # Inicjalizujemy 50 binów do wykresów z zerami jako wszystkimi wartościami
-        pi_values = np.zeros(eta.size - 1)
-        p_values = np.zeros(eta.size - 1)
-        K_values = np.zeros(eta.size - 1)
-
-        # Inicjalizujemy zmienne liczące cząstki
-        pi_count = 0
-        pi_true_count = 0
-        p_count = 0
-        p_true_count = 0
-        K_count = 0
-        K_true_count = 0
-
-        # Inicjalizujemy zmienną liczącą biny
-        idx = 0
-
-        # Iteracja po wszystkich cząstkach
-        for number in range(TRUEID.size):
-            # Jeśli pseudopośpieszność cząstki jest większa od górnej granicy aktualnego binu
-            if ETA[number] > eta[idx + 1]:
-                # Zapisujemy zliczone w aktualnym binie dane upewniając się, że nie dzielimy przez 0. Jeśli w danym
-                # binie nie było szukanego rodzaju cząstki nic nie jest wpisywane, ponieważ biny miały
-                # domyślnie wartości 0
-                if pi_true_count > 0:
-                    pi_values[idx] = pi_true_count / pi_count
-                if p_true_count > 0:
-                    p_values[idx] = p_true_count / p_count
-                if K_true_count > 0:
-                    K_values[idx] = K_true_count / K_count
-                # Przesunięcie do następnego binu
-                idx += 1
-                # Wyzerowanie zmiennych liczących
-                pi_count = 0
-                pi_true_count = 0
-                p_count = 0
-                p_true_count = 0
-                K_count = 0
-                K_true_count = 0
-            # Przerwanie pętli po przejściu przez wszystkie biny
-            if idx == eta.size - 1:
-                break
-            # Zliczanie cząstek
-            if ProbNNpi[number] > 0.9:
-                pi_count += 1
-                if abs(TRUEID[number]) == 211:
-                    pi_true_count += 1
-            elif ProbNNK[number] > 0.9:
-                K_count += 1
-                if abs(TRUEID[number]) == 321:
-                    K_true_count += 1
-            elif ProbNNp[number] > 0.9:
-                p_count += 1
-                if abs(TRUEID[number]) == 2212:
-                    p_true_count += 1
-
-        # Tworzenie wykresów
-        graph_eta_pi = ROOT.TGraph(eta.size - 1, eta, pi_values)
-        graph_eta_pi.SetTitle("#pi cut efficiency;#eta;Efficiency")
-        graph_eta_p = ROOT.TGraph(eta.size - 1, eta, p_values)
-        graph_eta_p.SetTitle("p cut efficiency;#eta;Efficiency")
-        graph_eta_K = ROOT.TGraph(eta.size - 1, eta, K_values)
-        graph_eta_K.SetTitle("K cut efficiency;#eta;Efficiency")
-
-        # Zapisywanie wykresów
-        self._save_histogram(graph_eta_pi, f'{self.results_path}/efficiency/efficiency_eta_pi_2.png')
-        self._save_histogram(graph_eta_p, f'{self.results_path}/efficiency/efficiency_eta_p_2.png')
-        self._save_histogram(graph_eta_K, f'{self.results_path}/efficiency/efficiency_eta_K_2.png')
+        :param particles: Cząstki każdego rodzaju, jak w create_mass_histogram
+        """
+        store = {'class': self.mixing_pool.multiplicity_class(self.events.lengths), 'particles': particles}
+        mixed_hists = self._mass_histograms('_mixed')
+        for start in range(0, self.events.n_events, BLOCK_SIZE):
+            block = select_events(store, np.arange(start, min(start + BLOCK_SIZE, self.events.n_events)))
+            for name, values_to_fill in self.mixing_pool.mix(block, combinations, max_combinations, self.skipped):
+                mixed_hists[name].fill(values_to_fill)
+
+    def background_histograms(self) -> dict:
+        """
+        Funkcja zwracająca histogramy tła kombinatorycznego: histogramy z mieszania zdarzeń znormalizowane do
+        histogramów mas z rekonstrukcji w zakresie normalization (nazwa kombinacji: histogram)
+        """
+        backgrounds = {}
+        for spec in combinations:
+            same = getattr(self, f'mass_{spec["name"]}')
+            mixed = getattr(self, f'mass_{spec["name"]}_mixed')
+            low, high = spec.get("normalization", (spec["xmin"], spec["xmax"]))
+            first, last = int(same.find_bin(low)), int(same.find_bin(high)) - 1
+            background = mixed.clone(f'{self.prefix}mass_{spec["name"]}_background')
+            if mixed.integral(first, last) > 0:
+                background.scale(same.integral(first, last) / mixed.integral(first, last))
+            backgrounds[spec["name"]] = background
+        return backgrounds
+
+    def _efficiency_masks(self) -> dict:
+        """
+        Funkcja zwracająca nazwane maski cząstek używane w licznikach i mianownikach wykresów wydajności
+        (efficiency_types.py)
+        """
+        TRUEID = np.abs(self._column('piplus_TRUEID'))
+        ProbNNpi = self._column('piplus_ProbNNpi') > ProbNN['cutoff']
+        ProbNNK = self._column('piplus_ProbNNk') > ProbNN['cutoff']
+        ProbNNp = self._column('piplus_ProbNNp') > ProbNN['cutoff']
+        return {
+            'true_pi': TRUEID == 211,
+            'true_K': TRUEID == 321,
+            'true_p': TRUEID == 2212,
+            'ProbNNpi': ProbNNpi,
+            'ProbNNK': ProbNNK,
+            'ProbNNp': ProbNNp,
+            # Kryteria sprawdzane po kolei: pi, K, p
+            'selected_pi': ProbNNpi,
+            'selected_K': ~ProbNNpi & ProbNNK,
+            'selected_p': ~ProbNNpi & ~ProbNNK & ProbNNp,
+        }
+
+    @timed('efficiency')
+    def _accumulate_efficiency(self):
+        """
+        Funkcja dodająca dane z aktualnego zbioru do liczników wszystkich wykresów wydajności z pliku
+        efficiency_types.py
+        """
+        masks = self._efficiency_masks()
+        for spec in efficiencies:
+            edges = np.linspace(spec["xmin"], spec["xmax"], spec["nBins"] + 1)
+            # Numer binu każdej cząstki jest obliczany raz dla wszystkich rodzajów cząstek
+            bins = bin_index(self._column(spec["key"]), edges)
+            counters = self.efficiency.setdefault(spec["name"], {})
+            for particle, selection in spec["selections"].items():
+                numerator = np.logical_and.reduce([masks[name] for name in selection["numerator"]])
+                denominator = np.logical_and.reduce([masks[name] for name in selection["denominator"]])
+                counts = binned_counts(bins, spec["nBins"], numerator, denominator)
+                counters[particle] = counters.get(particle, 0) + counts
+
+    def _efficiency_graphs(self):
+        """
+        Generator zwracający wykresy wydajności i czystości identyfikacji utworzone z zebranych liczników razem
+        z nazwami plików
+        """
+        for spec in efficiencies:
+            if spec["name"] not in self.efficiency:
+                continue
+            axis = np.linspace(spec["xmin"], spec["xmax"], spec["nBins"] + 1) * spec["scale"]
+            for particle in spec["selections"]:
+                # Jeśli w danym binie nie było szukanego rodzaju cząstki wartość wynosi 0
+                values = ratio(self.efficiency[spec["name"]][particle])
+                # Tworzenie wykresu
+                title = f'{labels[particle]} {spec["title"]};{spec["axis"]};Efficiency'
+                yield Graph(axis[:spec["nBins"]], values, title), spec["file"].format(particle)
+
+    @timed('rendering')
+    def save_efficiency(self):
+        """
+        Funkcja tworząca z zebranych liczników wykresy wydajności i czystości identyfikacji oraz zapisująca je
+        """
+        for graph, file in self._efficiency_graphs():
+            self._save_histogram(graph, f'{self.results_path}/efficiency/{file}')
+
+    @staticmethod
+    def _scan_cutoffs(spec: dict) -> np.ndarray:
+        """
+        Funkcja zwracająca sprawdzane wartości kryterium dla wpisu z statistics_types.scans
+        """
+        return np.linspace(spec["xmin"], spec["xmax"], spec["nCutoffs"])
+
+    @timed('scans')
+    def _accumulate_scans(self):
+        """
+        Funkcja dodająca liczniki TP/FP/TN/FN dla wszystkich wartości kryteriów (statistics_types.scans)
+        z aktualnych danych do liczników zebranych wcześniej
+        """
+        TRUEID = np.abs(self._column('piplus_TRUEID'))
+        for name, spec in scans.items():
+            counts = scan_counts(self._column(spec["key"]), TRUEID == spec["id"], self._scan_cutoffs(spec))
+            self.scans[name] = self.scans.get(name, 0) + counts
+
+    def _scan_graphs(self):
+        """
+        Generator zwracający krzywe ROC (czystość w zależności od wydajności) z trybu scan razem z nazwami wyników
+        """
+        for name, spec in scans.items():
+            if name not in self.scans:
+                continue
+            table = scan_table(self._scan_cutoffs(spec), self.scans[name])
+            graph = Graph(table['efficiency'].values, table['purity'].values, f'{name} ROC;Efficiency;Purity')
+            yield graph, name, table
+
+    @timed('rendering')
+    def save_scans(self):
+        """
+        Funkcja zapisująca wyniki trybu scan: tabele .csv (statistics/scan_<nazwa>.csv) oraz krzywe ROC
+        (efficiency/roc_<nazwa>.png)
+        """
+        for graph, name, table in self._scan_graphs():
+            table.to_csv(f'{self.results_path}/statistics/scan_{name}.csv', index=False)
+            self._save_histogram(graph, f'{self.results_path}/efficiency/roc_{name}.png')
+
+    def _results_file(self) -> str:
+        """
+        Funkcja zwracająca domyślną ścieżkę do pliku z wynikami (.root, a jeśli ROOT nie jest zainstalowany - .pkl)
+        """
+        suffix = '_true_data' if self.true_data else ''
+        extension = 'root' if root_available() else 'pkl'
+        return f'{self.results_path}/results{suffix}.{extension}'
+
+    @timed('results file')
+    def save_results(self, path: str = None):
+        """
+        Funkcja zapisująca do jednego pliku .root wszystkie histogramy (katalog histograms), wykresy wydajności
+        i krzywe ROC (katalog graphs) oraz liczniki: statystyki, wydajności, trybu scan, preselekcji i zdarzeń
+        pominiętych w histogramach mas (obiekt TNamed 'counters', w formacie JSON). Wyniki można wczytać bez danych
+        przez Simulation.load. Jeśli ścieżka kończy się na .pkl, histogramy i liczniki zapisywane są do pliku
+        pickle bez ROOT (wykresy wydajności i krzywe ROC są obliczane z liczników)
+
+        :param path: Ścieżka do pliku (domyślnie results/results.root lub results/results_true_data.root, a bez
+            ROOT - results/results.pkl lub results/results_true_data.pkl)
+        """
+        if path is None:
+            path = self._results_file()
+            if path.endswith('.pkl'):
+                logger.warning("ROOT is not available, results saved to %s", path)
+        if path.endswith('.pkl'):
+            write_pickle(path, {'true_data': self.true_data, 'mixing': self.mixing_pool is not None,
+                                'results': self._partial_results(usage=False)})
+            return
+        counters = {
+            'true_data': self.true_data,
+            'mixing': self.mixing_pool is not None,
+            'statistics': self.statistics,
+            'efficiency': self.efficiency,
+            'scans': self.scans,
+            'cutflow': self.cutflow,
+            'skipped': self.skipped,
+        }
+        # ROOT jest potrzebny tylko do zapisania pliku
+        import ROOT
+        file = ROOT.TFile.Open(path, 'RECREATE')
+        histograms_dir = file.mkdir('histograms')
+        for name, hist in self._histograms().items():
+            histograms_dir.WriteObject(hist.to_root(), name)
+        graphs_dir = file.mkdir('graphs')
+        for graph, name in self._efficiency_graphs():
+            graphs_dir.WriteObject(graph.to_root(), name.rsplit('.', 1)[0])
+        for graph, name, _ in self._scan_graphs():
+            graphs_dir.WriteObject(graph.to_root(), f'roc_{name}')
+        # Tablice numpy są zapisywane jako listy
+        file.WriteObject(ROOT.TNamed('counters', json.dumps(counters, default=lambda value: value.tolist())),
+                         'counters')
+        file.Close()
+
+    @classmethod
+    def load(cls, path: str, results_path: str, renderer=None):
+        """
+        Funkcja wczytująca wyniki zapisane przez save_results, bez wczytywania danych. Zwrócony obiekt może być
+        użyty tak jak obiekt po fill_all_histograms (np. __call__, save_all_histograms, draw_combined_histograms)
+
+        :param path: Ścieżka do pliku z wynikami (.root lub .pkl)
+        :param results_path: Ścieżka do katalogu 'results'
+        """
+        if path.endswith('.pkl'):
+            saved = read_pickle(path)
+            sim = cls(None, results_path, saved['true_data'], renderer=renderer, mixing=saved['mixing'])
+            sim._merge(saved['results'])
+            sim.scan = bool(sim.scans)
+            return sim
+        import ROOT
+        file = ROOT.TFile.Open(path)
+        counters = json.loads(file.Get('counters').GetTitle())
+        sim = cls(None, results_path, counters['true_data'], renderer=renderer,
+                  mixing=counters.get('mixing', False))
+        for name, hist in sim._histograms().items():
+            hist.add(Histogram.from_root(file.Get(f'histograms/{name}')))
+        file.Close()
+
+        sim.statistics = counters['statistics']
+        sim.cutflow = counters['cutflow']
+        sim.skipped = counters.get('skipped', {})
+        sim.efficiency = {name: {particle: np.array(values) for particle, values in particles.items()}
+                          for name, particles in counters['efficiency'].items()}
+        sim.scans = {name: np.array(values, dtype=np.int64) for name, values in counters['scans'].items()}
+        sim.scan = bool(sim.scans)
+        return sim
+
+
+def _fill_partial(files: list[str], settings: dict) -> dict:
+    """
+    Funkcja wykonywana w procesie roboczym: przetwarza podane pliki i zwraca częściowe wyniki
+
+    :param settings: Argumenty konstruktora Simulation (Simulation._worker_settings)
+    """
+    sim = Simulation(files, **settings)
+    sim._process()
+    return sim._partial_results()
+
+
+def _save_partial(file: str, path: str, settings: dict) -> dict:
+    """
+    Funkcja przetwarzająca jeden plik i zapisująca jego częściowe wyniki do pliku pickle path (tryb przyrostowy,
+    bez ROOT)
+
+    :param settings: Argumenty konstruktora Simulation (Simulation._worker_settings)
+    :return: Zużycie pamięci i wyniki pomiaru czasu (do Simulation._merge_usage)
+    """
+    sim = Simulation([file], renderer=Renderer('skip'), **settings)
+    sim._process()
+    write_pickle(path, sim._partial_results(usage=False))
+    partial = sim._partial_results()
+    return {'memory': partial['memory'], 'timing': partial['timing']}
+
+
+def _fill_sample(settings: dict) -> Simulation:
+    """
+    Funkcja tworząca obiekt Simulation dla jednej próbki oraz wypełniająca i zapisująca jego histogramy
+    """
+    sim = Simulation(**settings)
+    sim.fill_all_histograms()
+    sim.save_all_histograms()
+    return sim
+
+
+def _run_sample(settings: dict) -> str:
+    """
+    Funkcja wykonywana w osobnym procesie: przetwarza jedną próbkę i zwraca ścieżkę do pliku z wynikami
+    (save_results)
+    """
+    return _fill_sample(settings)._results_file()
+
+
+def run_samples(samples: dict, workers: int = None, threads: bool = False) -> dict:
+    """
+    Funkcja przetwarzająca kilka niezależnych próbek (np. dane z symulacji Monte Carlo i dane doświadczalne)
+    jednocześnie, każdą w osobnym procesie. Każda próbka zapisuje te same wyniki co przy osobnym uruchomieniu
+    (fill_all_histograms i save_all_histograms), a zwracane obiekty są wczytywane z zapisanych plików z wynikami
+    (Simulation.load), np. do draw_combined_histograms. Próbki o takim samym true_data muszą mieć różne
+    katalogi results_path
+
+    :param samples: Słownik: nazwa próbki - argumenty konstruktora Simulation
+    :param workers: Liczba procesów lub wątków (domyślnie po jednym na próbkę)
+    :param threads: Jeśli True, próbki są przetwarzane w wątkach jednego procesu (histogramy i płótna każdego
+        obiektu Simulation mają własne nazwy), a zwracane są obiekty Simulation z tych wątków
+    :return: Słownik: nazwa próbki - obiekt Simulation
+    """
+    if threads:
+        with ThreadPoolExecutor(max_workers=workers or len(samples)) as pool:
+            futures = {name: pool.submit(_fill_sample, settings) for name, settings in samples.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    # Procesy są tworzone przez 'spawn', ponieważ ROOT nie działa poprawnie po fork
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers or len(samples), mp_context=context) as pool:
+        futures = {name: pool.submit(_run_sample, settings) for name, settings in samples.items()}
+        paths = {name: future.result() for name, future in futures.items()}
+    return {name: Simulation.load(paths[name], samples[name]["results_path"]) for name in samples}
@@ -0,0 +1,24 @@
+from hist_types import *
+
+# Definicje statystyk zapisywanych do pliku statistics.csv. Dla każdej definicji podane jest kryterium selekcji
+# oraz dla każdej cząstki: zmienna na którą nałożone jest kryterium i numer cząstki (TRUEID/ID)
+statistics = {
+    "PID": {
+        "cutoff": PID["cutoff"],
+        "particles": {"K": ("piplus_PIDK", 321), "p": ("piplus_PIDp", 2212)}
+    },
+    "ProbNN": {
+        "cutoff": ProbNN["cutoff"],
+        "particles": {"K": ("piplus_ProbNNk", 321), "p": ("piplus_ProbNNp", 2212)}
+    }
+}
+
+# Skanowanie kryteriów selekcji (tryb scan). Dla każdej zmiennej podana jest szukana cząstka (TRUEID) oraz zakres
+# i liczba sprawdzanych wartości kryterium
+scans = {
+    "PIDK": {"key": "piplus_PIDK", "id": 321, "nCutoffs": 2001, "xmin": -100, "xmax": 100},
+    "PIDp": {"key": "piplus_PIDp", "id": 2212, "nCutoffs": 2001, "xmin": -100, "xmax": 100},
+    "ProbNNK": {"key": "piplus_ProbNNk", "id": 321, "nCutoffs": 1001, "xmin": 0, "xmax": 1},
+    "ProbNNp": {"key": "piplus_ProbNNp", "id": 2212, "nCutoffs": 1001, "xmin": 0, "xmax": 1},
+    "ProbNNpi": {"key": "piplus_ProbNNpi", "id": 211, "nCutoffs": 1001, "xmin": 0, "xmax": 1}
+}
@@ -0,0 +1,134 @@
+import uproot
+import numpy as np
+from pathlib import Path
+from particle_masses import masses
+from reader import branches_mc, branches_true_data
+
+# Domyślne ustawienia generatora syntetycznych danych. Każdy wpis można zmienić przekazując słownik settings
+defaults = {
+    # Średnia liczba cząstek w zdarzeniu (rozkład Poissona, co najmniej 1 cząstka)
+    "multiplicity": 20,
+    # Udział rodzajów cząstek (|TRUEID|: udział). 0 oznacza cząstki fałszywe (ghost)
+    "species": {211: 0.70, 321: 0.12, 2212: 0.08, 11: 0.03, 13: 0.02, 0: 0.05},
+    # Prawdopodobieństwo błędnej identyfikacji (ID różne od TRUEID)
+    "misid": 0.1,
+    # Średni pęd poprzeczny [MeV] (rozkład wykładniczy)
+    "pt_mean": 600,
+    # Zakres pseudopośpieszności (rozkład jednorodny)
+    "eta": (1.8, 5.2),
+    # Względna rozdzielczość pomiaru pędu
+    "resolution": 0.005,
+    # Rozkłady zmiennych PIDK i PIDp: średnia dla szukanej cząstki, średnia dla pozostałych cząstek, szerokość
+    "PID": (20, -20, 15),
+    # Parametry rozkładu Beta zmiennych ProbNN dla szukanej cząstki (dla pozostałych cząstek odwrócone)
+    "ProbNN": (5, 1),
+    # Numer runu
+    "run": 1000,
+}
+
+# Masy cząstek spoza particle_masses.py (e, mu) potrzebne do obliczenia energii
+_other_masses = {11: 0.511, 13: 105.658, 0: 139.570}
+
+
+def generate_arrays(n_events: int, settings: dict = None, first_event: int = 0, seed: int = 0) -> dict:
+    """
+    Funkcja generująca syntetyczne dane o takich samych zmiennych jak DecayTree (wszystkie zmienne z
+    reader.branches_mc)
+
+    :param n_events: Liczba zdarzeń
+    :param settings: Zmiany ustawień domyślnych (patrz defaults)
+    :param first_event: Numer pierwszego zdarzenia
+    :param seed: Ziarno generatora liczb losowych
+    :return: Słownik tablic (zmienna: wartości)
+    """
+    settings = {**defaults, **(settings or {})}
+    rng = np.random.default_rng(seed)
+
+    multiplicity = np.maximum(rng.poisson(settings["multiplicity"], n_events), 1)
+    n = int(multiplicity.sum())
+    ids = np.array(list(settings["species"]))
+    fractions = np.array(list(settings["species"].values()), dtype=float)
+    true_id = rng.choice(ids, n, p=fractions / fractions.sum())
+    charge = rng.choice([-1, 1], n)
+
+    # Kinematyka: pęd poprzeczny, pseudopośpieszność i kąt azymutalny
+    pt = rng.exponential(settings["pt_mean"], n)
+    eta = rng.uniform(*settings["eta"], n)
+    phi = rng.uniform(-np.pi, np.pi, n)
+    true_px, true_py, true_pz = pt * np.cos(phi), pt * np.sin(phi), pt * np.sinh(eta)
+    mass = np.zeros(n)
+    for pdg, value in {211: masses['pi'], 321: masses['K'], 2212: masses['p'], **_other_masses}.items():
+        mass[true_id == pdg] = value
+    smear = rng.normal(1, settings["resolution"], n)
+    px, py, pz = true_px * smear, true_py * smear, true_pz * smear
+    reco_pt = np.hypot(px, py)
+
+    # Identyfikacja: z prawdopodobieństwem misid cząstce przypisywany jest losowy rodzaj pi/K/p
+    reco_id = np.where(true_id == 0, 211, true_id)
+    misid = rng.random(n) < settings["misid"]
+    reco_id = np.where(misid, rng.choice([211, 321, 2212], n), reco_id)
+
+    def pid(target: int) -> np.ndarray:
+        signal, background, width = settings["PID"]
+        return rng.normal(np.where(true_id == target, signal, background), width)
+
+    def probnn(target: int) -> np.ndarray:
+        a, b = settings["ProbNN"]
+        is_target = true_id == target
+        return np.where(is_target, rng.beta(a, b, n), rng.beta(b, a, n))
+
+    return {
+        'eventNumber': np.repeat(np.arange(first_event, first_event + n_events, dtype=np.uint64), multiplicity),
+        'runNumber': np.full(n, settings["run"], dtype=np.uint32),
+        'piplus_TRUEID': (true_id * charge).astype(np.int32),
+        'piplus_ID': (reco_id * charge).astype(np.int32),
+        'piplus_TRUEP_E': np.sqrt(pt ** 2 + true_pz ** 2 + mass ** 2),
+        'piplus_TRUEP_X': true_px,
+        'piplus_TRUEP_Y': true_py,
+        'piplus_TRUEP_Z': true_pz,
+        'piplus_TRUEPT': pt,
+        'piplus_P': np.sqrt(reco_pt ** 2 + pz ** 2),
+        'piplus_PX': px,
+        'piplus_PY': py,
+        'piplus_PZ': pz,
+        'piplus_PT': reco_pt,
+        'piplus_ETA': np.arcsinh(pz / reco_pt),
+        'piplus_PIDK': pid(321),
+        'piplus_PIDp': pid(2212),
+        'piplus_ProbNNk': probnn(321),
+        'piplus_ProbNNp': probnn(2212),
+        'piplus_ProbNNpi': probnn(211),
+        # Zmienne jakości śladów (część cząstek jest odrzucana w preselekcji)
+        'piplus_TRACK_GhostProb': np.where(true_id == 0, rng.uniform(0, 1, n), rng.exponential(0.05, n)),
+        'piplus_TRACK_CHI2NDOF': rng.gamma(5, 0.25, n),
+        'piplus_IPCHI2_OWNPV': rng.exponential(1.5, n),
+    }
+
+
+def write_file(path: str, n_events: int, settings: dict = None, true_data: bool = False, first_event: int = 0,
+               seed: int = 0):
+    """
+    Funkcja zapisująca syntetyczne dane do pliku .root z drzewem minbias/DecayTree (jak w prawdziwych danych)
+
+    :param true_data: Jeśli True, zapisywane są tylko zmienne danych doświadczalnych (reader.branches_true_data)
+    """
+    arrays = generate_arrays(n_events, settings, first_event, seed)
+    branches = branches_true_data if true_data else branches_mc
+    with uproot.recreate(path) as file:
+        file['minbias/DecayTree'] = {branch: arrays[branch] for branch in branches}
+
+
+def generate_dataset(directory: str, n_files: int, events_per_file: int, settings: dict = None,
+                     true_data: bool = False, seed: int = 0) -> list[str]:
+    """
+    Funkcja tworząca katalog z syntetycznymi plikami .root (numery zdarzeń nie powtarzają się między plikami)
+
+    :return: Lista ścieżek do utworzonych plików
+    """
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    files = []
+    for number in range(n_files):
+        path = str(Path(directory) / f'synthetic_{number:04d}.root')
+        write_file(path, events_per_file, settings, true_data, number * events_per_file, seed + number)
+        files.append(path)
+    return files